@@ -26,6 +26,8 @@ Teknik Detaylar:
 * İptal edilmiş ve taslak faturalar hariç
 * Otomatik para birimi dönüştürme
 * Kategori hiyerarşisi desteği
+* Hesaplama, önbellek, arka plan işi ve Excel export
+  `monthly_sales_detail_report` modülündeki ortak rapor motorundan gelir
 
 Kullanım:
 * Accounting > Reporting > Kategori/Ürün Satış Raporu menüsüne gidin
@@ -46,10 +48,8 @@ Gereksinimler:
         'account', 
         'product',
         'sale',
+        'monthly_sales_detail_report',
     ],
-    'external_dependencies': {
-        'python': ['xlsxwriter'],
-    },
     'data': [
         'security/ir.model.access.csv',
         'views/medical_consumables_sales_report_views.xml',
@@ -1,3 +1,18 @@
 # -*- coding: utf-8 -*-
 
 from . import models
+
+from odoo import api, SUPERUSER_ID
+
+
+def post_init_hook(cr, registry):
+    """Kurulumda aylık satış özet tablosunu mevcut faturalardan doldurur."""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['monthly.sales.aggregate']._rebuild()
+
+
+def uninstall_hook(cr, registry):
+    """Modülün muhasebe tablolarına eklediği rapor indekslerini kaldırır."""
+    from .models.account_move import CUSTOMER_INVOICE_INDEX, SALES_LINE_INDEX
+    for index in (CUSTOMER_INVOICE_INDEX, SALES_LINE_INDEX):
+        cr.execute('DROP INDEX IF EXISTS "{}"'.format(index))
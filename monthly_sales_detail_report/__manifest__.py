@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Aylık Satış Detay Rapor',
-    'version': '16.0.2.0.0',
+    'version': '16.0.2.1.0',
     'category': 'Accounting/Reporting',
     'summary': 'Aylık Satış Detay Raporu - Kategori, Ürün, Günlük ve Fatura Detayları',
     'description': """
@@ -36,6 +36,7 @@ Teknik Detaylar:
 * Otomatik para birimi dönüştürme
 * Kategori hiyerarşisi desteği
 * Transient model tabanlı (geçici veri saklama)
+* Kalıcı aylık satış özet tablosu (fatura onayında artımlı güncellenir)
 
 Kullanım:
 * Accounting > Reporting > Aylık Satış Detay Rapor menüsüne gidin
@@ -60,13 +61,20 @@ Gereksinimler:
         'sale',
     ],
     'external_dependencies': {
-        'python': ['xlsxwriter'],
+        'python': ['xlsxwriter', 'numpy'],
     },
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/monthly_sales_detail_report_views.xml',
+        'views/monthly_sales_aggregate_views.xml',
+        'views/monthly_sales_report_run_views.xml',
+        'views/monthly_sales_report_job_views.xml',
+        'views/monthly_sales_report_cache_views.xml',
     ],
     'demo': [],
+    'post_init_hook': 'post_init_hook',
+    'uninstall_hook': 'uninstall_hook',
     'installable': True,
     'auto_install': False,
     'application': False,
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    """Güncellemede aylık satış özet tablosunu mevcut faturalardan doldurur."""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['monthly.sales.aggregate']._rebuild()
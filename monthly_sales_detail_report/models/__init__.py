@@ -1,4 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from . import monthly_sales_aggregate
+from . import account_move
+from . import product_template
+from . import report_run
+from . import report_job
+from . import report_cache
+from . import report_line
+from . import sales_report_engine
 from . import monthly_sales_detail_report
 from . import monthly_supplier_sales_report
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+# Rapor sorgularının kullandığı kısmi indeksler. Koşullar sorgulardaki filtrelerle
+# birebir aynıdır; PostgreSQL kısmi indeksi sadece sorgu koşulu indeks koşulunu
+# kapsıyorsa kullanır.
+CUSTOMER_INVOICE_INDEX = 'monthly_sales_report_customer_invoice_idx'
+SALES_LINE_INDEX = 'monthly_sales_report_sales_line_idx'
+
+# Onaylı faturada değiştiğinde sıralama önbelleğini bozan alanlar -> etkilenen sıralama modu
+RANKING_FIELDS = {
+    'partner_id': 'customer',
+    'commercial_partner_id': 'customer',
+    'invoice_user_id': 'salesperson',
+}
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def init(self):
+        super().init()
+        # Tedarikçi raporu: onaylı müşteri fatura/iadeleri fatura tarihine göre
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS {index}
+                ON account_move (invoice_date, company_id)
+             WHERE state = 'posted' AND move_type IN ('out_invoice', 'out_refund')
+        """.format(index=CUSTOMER_INVOICE_INDEX))
+
+    def write(self, vals):
+        ranking_modes = {mode for field_name, mode in RANKING_FIELDS.items() if field_name in vals}
+        if not ranking_modes:
+            return super().write(vals)
+        dates = set(self.filtered(
+            lambda m: m.state == 'posted' and m.move_type in ('out_invoice', 'out_refund')
+        ).mapped('date'))
+        res = super().write(vals)
+        # Müşteri ve temsilci sıralamaları fatura başlığından okunur; özet tablo değişmez
+        self.env['monthly.sales.report.cache']._invalidate_dates(dates, ranking_modes=ranking_modes)
+        return res
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        posted._refresh_monthly_sales_aggregate()
+        return posted
+
+    def button_draft(self):
+        res = super().button_draft()
+        self._refresh_monthly_sales_aggregate()
+        return res
+
+    def button_cancel(self):
+        res = super().button_cancel()
+        self._refresh_monthly_sales_aggregate()
+        return res
+
+    def _refresh_monthly_sales_aggregate(self):
+        """Müşteri fatura/iadelerinin aylık satış özet tablosundaki katkısını günceller."""
+        moves = self.filtered(lambda m: m.move_type in ('out_invoice', 'out_refund'))
+        if moves:
+            self.env['monthly.sales.aggregate'].sudo()._refresh_for_moves(moves)
+
+
+class AccountMoveLine(models.Model):
+    _inherit = 'account.move.line'
+
+    def init(self):
+        super().init()
+        # Özet tablo, drill-down özeti ve anahtar güncellemesi: onaylı ürün satırları
+        # gün, ürün ve şirkete göre. Toplanan sütunlar da indekste tutulur (covering),
+        # böylece tablo sayfalarına gitmeden index-only scan yapılabilir.
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS {index}
+                ON account_move_line (date, product_id, company_id)
+           INCLUDE (move_id, account_id, currency_id, company_currency_id, amount_currency, balance)
+             WHERE parent_state = 'posted' AND product_id IS NOT NULL
+        """.format(index=SALES_LINE_INDEX))
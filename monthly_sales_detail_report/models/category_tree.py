@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CategoryResolver:
+    """Rapor kategori kümesini `product.category.parent_path` üzerinden tek
+    sorguda genişleten ve sonucu sözlük olarak tutan yardımcı.
+
+    Her kategori için raporda bağlı olduğu en üstteki seçili ataya ait id
+    tutulur (`ancestors`); böylece kümeye üyelik ve "kategori -> seçili üst
+    kategori" sorusu sabit sürede cevaplanır. `parent_path` kökten başlayan
+    "1/5/12/" biçiminde olduğundan yoldaki ilk seçili id en üstteki atadır.
+    Hiç seçim yoksa tüm kategoriler kendilerine bağlıdır.
+
+    Sözlük JSON'a çevrilip sihirbazda saklanabilir (`to_json` / `from_json`);
+    drill-down tıklamalarında kategori ağacı yeniden taranmaz.
+    """
+
+    def __init__(self, ancestors):
+        # {kategori id: en üstteki seçili ata id}
+        self.ancestors = ancestors
+        self._members = None
+
+    @classmethod
+    def load(cls, env, selected_ids, include_subcategories=True):
+        """Seçili kategorileri (istenirse alt kategorileriyle) tek sorguda çözer."""
+        Category = env['product.category']
+        Category.flush_model(['parent_path'])
+        selected = set(selected_ids)
+        if not selected:
+            env.cr.execute("SELECT id FROM product_category")
+            return cls({categ_id: categ_id for categ_id, in env.cr.fetchall()})
+
+        if include_subcategories:
+            # `child_of` ile aynı koşul: seçili yolların altındaki tüm kategoriler
+            patterns = [path + '%' for path in Category.browse(selected).mapped('parent_path')]
+            env.cr.execute(
+                "SELECT id, parent_path FROM product_category WHERE parent_path LIKE ANY(%s)",
+                [patterns],
+            )
+        else:
+            env.cr.execute(
+                "SELECT id, parent_path FROM product_category WHERE id IN %s", [tuple(selected)],
+            )
+
+        ancestors = {}
+        for categ_id, parent_path in env.cr.fetchall():
+            ancestors[categ_id] = next(
+                int(path_id) for path_id in parent_path.rstrip('/').split('/') if int(path_id) in selected
+            )
+        _logger.debug("Kategori çözümleyici: %s seçim -> %s kategori", len(selected), len(ancestors))
+        return cls(ancestors)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls({int(categ_key): ancestor_id for categ_key, ancestor_id in data.items()})
+
+    def to_json(self):
+        return {str(categ_id): ancestor_id for categ_id, ancestor_id in self.ancestors.items()}
+
+    @property
+    def ids(self):
+        """Genişletilmiş kategori id'leri"""
+        return list(self.ancestors)
+
+    def __contains__(self, categ_id):
+        return categ_id in self.ancestors
+
+    def top(self, categ_id):
+        """Kategorinin bağlı olduğu en üstteki seçili kategori; küme dışındaki
+        kategoriler (ör. ayrıca seçilmiş ürünlerin kategorisi) kendisidir."""
+        return self.ancestors.get(categ_id, categ_id)
+
+    def members(self, ancestor_id):
+        """Verilen seçili kategoriye bağlanan tüm kategoriler"""
+        if self._members is None:
+            self._members = {}
+            for categ_id, top_id in self.ancestors.items():
+                self._members.setdefault(top_id, []).append(categ_id)
+        return self._members.get(ancestor_id, [])
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import logging
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+
+class ProductCostHistory:
+    """Ürünlerin tarihsel birim maliyetini toplu yükleyip tarih bazlı sorgulayan yardımcı.
+
+    Stok değerleme katmanları (`stock.valuation.layer`, stock_account modülü) rapor
+    bitiş tarihine kadar tek sorguda gün bazında okunur; her ürün × şirket için
+    kümülatif değer / kümülatif miktar ile günlük maliyet serisi oluşturulur.
+    "P ürününün D tarihindeki maliyeti" ikili arama ile bulunur. Standart maliyette
+    yeniden değerleme katmanları (miktar 0) da seriyi günceller.
+
+    Katman yoksa (modül kurulu değil ya da ürünün o tarihten önce katmanı yok)
+    şirketin güncel `standard_price` değeri kullanılır. Maliyetler şirket para
+    birimindedir.
+    """
+
+    def __init__(self, env, product_ids, company_ids, date_to):
+        self.env = env
+        self.product_ids = list(product_ids)
+        self.fallbacks = 0
+        # (product_id, company_id) -> ([tarihler], [maliyetler])
+        self._series = {}
+        # company_id -> {product_id: standard_price}
+        self._standard_prices = {}
+        if self.product_ids and 'stock.valuation.layer' in env:
+            self._load(set(company_ids), date_to)
+
+    def _load(self, company_ids, date_to):
+        """Değerleme katmanlarını ürün, şirket ve gün bazında toplu okur."""
+        self.env['stock.valuation.layer'].flush_model(['product_id', 'company_id', 'quantity', 'value', 'create_date'])
+        self.env.cr.execute("""
+            SELECT product_id, company_id, create_date::date, SUM(value), SUM(quantity)
+              FROM stock_valuation_layer
+             WHERE product_id IN %s
+               AND company_id IN %s
+               AND create_date < %s
+          GROUP BY 1, 2, 3
+          ORDER BY 1, 2, 3
+        """, [tuple(self.product_ids), tuple(company_ids) or (None,), date_to + timedelta(days=1)])
+
+        totals = {}
+        for product_id, company_id, day, value, quantity in self.env.cr.fetchall():
+            key = (product_id, company_id)
+            total = totals.setdefault(key, [0.0, 0.0])
+            # numeric sütunlar Decimal döner
+            total[0] += float(value or 0.0)
+            total[1] += float(quantity or 0.0)
+            if total[1] <= 0:
+                # Stok yokken ortalama anlamsız; önceki maliyet geçerli kalır
+                continue
+            dates, costs = self._series.setdefault(key, ([], []))
+            dates.append(day)
+            costs.append(total[0] / total[1])
+        _logger.debug("Maliyet geçmişi: %s ürün/şirket serisi yüklendi", len(self._series))
+
+    def _get_standard_price(self, product_id, company_id):
+        prices = self._standard_prices.get(company_id)
+        if prices is None:
+            products = self.env['product.product'].with_company(company_id).browse(self.product_ids)
+            prices = self._standard_prices[company_id] = {
+                product.id: product.standard_price or 0.0 for product in products
+            }
+        price = prices.get(product_id)
+        if price is None:
+            price = self.env['product.product'].with_company(company_id).browse(product_id).standard_price or 0.0
+        return price
+
+    def cost_at(self, product_id, company_id, date):
+        """Ürünün verilen şirket ve tarihteki birim maliyetini döndürür."""
+        if not product_id:
+            return 0.0
+        series = self._series.get((product_id, company_id))
+        if series:
+            dates, costs = series
+            index = bisect.bisect_right(dates, date) - 1
+            if index >= 0:
+                return costs[index]
+        self.fallbacks += 1
+        return self._get_standard_price(product_id, company_id)
+
+    def costs_at(self, keys):
+        """(ürün id, şirket id, tarih) demetleri için maliyetleri toplu döndürür."""
+        return [self.cost_at(*key) for key in keys]
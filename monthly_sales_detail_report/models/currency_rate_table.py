@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CurrencyRateTable:
+    """Rapor penceresi için gereken tüm kurları tek sorguda yükleyen ve çevrim
+    katsayılarını (kaynak, hedef, şirket, tarih) anahtarıyla önbellekleyen yardımcı.
+
+    `res.currency._convert` ile aynı kuralları izler:
+    * tarihteki ya da öncesindeki en güncel kur kullanılır,
+    * şirkete özel kur varsa genel kura tercih edilir,
+    * hiç kur yoksa oran 1.0 kabul edilir,
+    * sonuç hedef para biriminin hassasiyetine yuvarlanır.
+    """
+
+    def __init__(self, env, target_currency, currency_ids, company_ids, date_to):
+        self.env = env
+        self.target_currency = target_currency
+        self.hits = 0
+        self.misses = 0
+        self._factors = {}
+        # (currency_id, company_id | None) -> ([tarihler], [kurlar])
+        self._series = {}
+        self._load(set(currency_ids) | {target_currency.id}, set(company_ids), date_to)
+
+    def _load(self, currency_ids, company_ids, date_to):
+        """İlgili para birimlerinin `date_to` tarihine kadarki tüm kurlarını tek sorguda okur."""
+        if not currency_ids:
+            return
+        self.env['res.currency.rate'].flush_model(['rate', 'currency_id', 'company_id', 'name'])
+        self.env.cr.execute("""
+            SELECT currency_id, company_id, name, rate
+              FROM res_currency_rate
+             WHERE currency_id IN %s
+               AND name <= %s
+               AND (company_id IS NULL OR company_id IN %s)
+          ORDER BY currency_id, company_id, name
+        """, [tuple(currency_ids), date_to, tuple(company_ids) or (None,)])
+        for currency_id, company_id, rate_date, rate in self.env.cr.fetchall():
+            dates, rates = self._series.setdefault((currency_id, company_id), ([], []))
+            dates.append(rate_date)
+            rates.append(rate)
+
+    def _get_rate(self, currency_id, company_id, date):
+        """Para biriminin verilen şirket ve tarihteki kurunu döndürür."""
+        for key in ((currency_id, company_id), (currency_id, None)):
+            series = self._series.get(key)
+            if not series:
+                continue
+            dates, rates = series
+            index = bisect.bisect_right(dates, date) - 1
+            if index >= 0:
+                return rates[index]
+        return 1.0
+
+    def get_factor(self, src_currency_id, company_id, date):
+        """Kaynak para biriminden hedef para birimine çevrim katsayısını döndürür."""
+        key = (src_currency_id, self.target_currency.id, company_id, date)
+        factor = self._factors.get(key)
+        if factor is not None:
+            self.hits += 1
+            return factor
+        self.misses += 1
+        if src_currency_id == self.target_currency.id:
+            factor = 1.0
+        else:
+            factor = (
+                self._get_rate(self.target_currency.id, company_id, date)
+                / self._get_rate(src_currency_id, company_id, date)
+            )
+        self._factors[key] = factor
+        return factor
+
+    def convert(self, amount, src_currency_id, company_id, date):
+        """Tek bir tutarı hedef para birimine çevirir."""
+        if not amount:
+            return 0.0
+        factor = self.get_factor(src_currency_id, company_id, date)
+        return self.target_currency.round(amount * factor)
+
+    def convert_many(self, rows):
+        """(tutar, kaynak para birimi id, şirket id, tarih) demetlerini toplu çevirir."""
+        return [self.convert(*row) for row in rows]
+
+    def factor_arrays(self, keys):
+        """(kaynak para birimi id, şirket id, tarih) anahtarlarının katsayılarını SQL'de
+        `unnest` ile birleştirilebilecek dört dizi olarak döndürür:
+        [para birimi id'leri], [şirket id'leri], [tarihler], [katsayılar].
+        """
+        keys = list(keys)
+        return (
+            [currency_id for currency_id, _company_id, _date in keys],
+            [company_id for _currency_id, company_id, _date in keys],
+            [date for _currency_id, _company_id, date in keys],
+            [self.get_factor(*key) for key in keys],
+        )
+
+    def log_stats(self, label):
+        _logger.debug(
+            "%s kur önbelleği: %s isabet, %s ıskalama, %s farklı anahtar",
+            label, self.hits, self.misses, len(self._factors),
+        )
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import tempfile
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CHUNK_SIZE = 1024 * 1024
+
+
+def create_file_attachment(env, write, vals):
+    """`write(dosya_yolu)` ile diske yazılan dosyayı ek dosya olarak kaydeder.
+
+    Dosya filestore dizininde geçici bir ada yazılır, SHA-1 özeti parça parça
+    hesaplanır ve dosya Odoo'nun içerik adresli yoluna (`ab/abcdef...`) taşınır;
+    içerik hiçbir aşamada tamamen belleğe alınmaz veya base64'e çevrilmez.
+    Ekler veritabanında saklanıyorsa (`ir_attachment.location = db`) dosya
+    mecburen okunup `raw` ile kaydedilir.
+    """
+    Attachment = env['ir.attachment']
+    if Attachment._storage() != 'file':
+        fd, path = tempfile.mkstemp(suffix='.tmp')
+        os.close(fd)
+        try:
+            write(path)
+            with open(path, 'rb') as stored_file:
+                return Attachment.create(dict(vals, raw=stored_file.read()))
+        finally:
+            os.unlink(path)
+
+    # Taşıma (rename) aynı dosya sisteminde kalsın diye geçici dosya filestore içindedir
+    root = Attachment._filestore()
+    os.makedirs(root, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix='.tmp', dir=root)
+    os.close(fd)
+    try:
+        write(path)
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as stored_file:
+            for chunk in iter(lambda: stored_file.read(CHUNK_SIZE), b''):
+                sha1.update(chunk)
+        checksum = sha1.hexdigest()
+        file_size = os.path.getsize(path)
+        store_fname = checksum[:2] + '/' + checksum
+        full_path = Attachment._full_path(store_fname)
+        if not os.path.exists(full_path):
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(path, full_path)
+            # İşlem geri alınırsa dosya filestore temizliğinde silinir
+            Attachment._mark_for_gc(store_fname)
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+    return _link_stored_file(env, vals, store_fname, checksum, file_size)
+
+
+def share_file_attachment(env, source, vals):
+    """`source` ekinin içeriğiyle yeni bir ek oluşturur; filestore dosyası
+    kopyalanmaz, iki ek aynı dosyayı paylaşır (Odoo'nun içerik adresli saklaması
+    gibi). Veritabanında saklanan ekler için içerik okunur.
+    """
+    if not source.store_fname:
+        return env['ir.attachment'].create(dict(vals, raw=source.raw))
+    return _link_stored_file(env, vals, source.store_fname, source.checksum, source.file_size)
+
+
+def _link_stored_file(env, vals, store_fname, checksum, file_size):
+    """Filestore'daki dosyayı gösteren ek kaydı oluşturur.
+
+    `ir.attachment` create/write `store_fname`, `checksum` ve `file_size`
+    değerlerini içerikten hesaplamak için yok saydığından bu alanlar SQL ile yazılır.
+    """
+    attachment = env['ir.attachment'].create(dict(vals, type='binary'))
+    attachment.flush_recordset()
+    env.cr.execute("""
+        UPDATE ir_attachment SET store_fname = %s, checksum = %s, file_size = %s WHERE id = %s
+    """, [store_fname, checksum, file_size, attachment.id])
+    attachment.invalidate_recordset()
+    return attachment
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import numpy as np
+
+Margins = namedtuple('Margins', ['sales', 'cost', 'margin', 'margin_percent'])
+
+
+def _as_array(values, default=None, size=None):
+    if values is None:
+        return np.full(size, default, dtype=float)
+    return np.asarray(values, dtype=float)
+
+
+def round_half_up(values, precision_digits):
+    """Tutarları Odoo'nun `float_round` varsayılanı gibi (HALF-UP) yuvarlar."""
+    factor = 10.0 ** precision_digits
+    return np.sign(values) * np.floor(np.abs(values) * factor + 0.5) / factor
+
+
+def compute_margins(sales, cost):
+    """Satış ve maliyet dizilerinden kâr ve kâr yüzdesini hesaplar (satış 0 ise yüzde 0)."""
+    sales = np.asarray(sales, dtype=float)
+    margin = sales - np.asarray(cost, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margin_percent = np.where(sales != 0.0, margin / sales * 100.0, 0.0)
+    return margin, margin_percent
+
+
+def compute_line_margins(quantity, subtotal, unit_cost, sales_factor=None, cost_factor=None,
+                         precision_digits=None, absolute=False):
+    """Satır dizileri üzerinde satış, maliyet, kâr ve kâr yüzdesini tek geçişte hesaplar.
+
+    * satış = ara toplam × satış kur katsayısı
+    * maliyet = birim maliyet × miktar × maliyet kur katsayısı
+    Katsayılar verilmezse 1 kabul edilir. `precision_digits` verilirse çevrilen satış
+    ve maliyet hedef para biriminin hassasiyetine yuvarlanır (kur tablosundaki
+    `convert` ile aynı); `absolute` ile mutlak değerleri alınır.
+    """
+    subtotal = _as_array(subtotal)
+    size = subtotal.shape
+    sales = subtotal * _as_array(sales_factor, 1.0, size)
+    cost = _as_array(unit_cost) * _as_array(quantity) * _as_array(cost_factor, 1.0, size)
+    if precision_digits is not None:
+        sales = round_half_up(sales, precision_digits)
+        cost = round_half_up(cost, precision_digits)
+    if absolute:
+        sales, cost = np.abs(sales), np.abs(cost)
+    margin, margin_percent = compute_margins(sales, cost)
+    return Margins(sales, cost, margin, margin_percent)
+
+
+def group_sum(groups, values, size=None):
+    """`values` değerlerini `groups` grup indekslerine göre toplar (satır sırasıyla)."""
+    return np.bincount(np.asarray(groups, dtype=np.intp), weights=np.asarray(values, dtype=float), minlength=size or 0)
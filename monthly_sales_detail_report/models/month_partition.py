@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import logging
+
+from odoo import api
+
+_logger = logging.getLogger(__name__)
+
+PARALLEL_WORKERS_PARAM = 'monthly_sales_detail_report.parallel_workers'
+DEFAULT_PARALLEL_WORKERS = 4
+
+
+def split_months(date_from, date_to):
+    """Tarih aralığını ay parçalarına böler: [(ilk gün, son gün), ...]"""
+    partitions = []
+    start = date_from
+    while start <= date_to:
+        next_month_first = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = min(next_month_first - timedelta(days=1), date_to)
+        partitions.append((start, end))
+        start = next_month_first
+    return partitions
+
+
+def get_worker_count(env):
+    """Paralel hesaplamada kullanılacak en fazla iş parçacığı (ve veritabanı bağlantısı) sayısı"""
+    value = env['ir.config_parameter'].sudo().get_param(PARALLEL_WORKERS_PARAM)
+    return max(int(value or DEFAULT_PARALLEL_WORKERS), 1)
+
+
+def run_partitioned(env, date_from, date_to, func, max_workers, progress=None):
+    """`func(env, başlangıç, bitiş)` fonksiyonunu her ay parçası için ayrı iş
+    parçacığında ve ayrı veritabanı imlecinde çalıştırır; sonuç satırlarını ay
+    sırasıyla birleştirir.
+
+    Parçalar tarih bazında ayrık olduğundan ve sorgular tarihe göre sıralı satır
+    döndürdüğünden birleştirilmiş liste seri sorgunun sonucuyla aynıdır.
+    Ayrı imleçler sadece onaylanmış (commit edilmiş) veriyi görür; bu yüzden
+    fonksiyon sadece kalıcı tablolardan okumalıdır. Test modunda kayıt defteri tek
+    imleç paylaştığından parçalar sırayla mevcut imleçte çalıştırılır.
+    `progress(tamamlanan, toplam)` verilirse sıralı çalıştırmada her parçadan sonra çağrılır.
+    """
+    partitions = split_months(date_from, date_to)
+    workers = min(max_workers, len(partitions))
+    if workers <= 1 or progress or env.registry.in_test_mode():
+        env.flush_all()
+        rows = []
+        for index, (start, end) in enumerate(partitions, start=1):
+            rows.extend(func(env, start, end))
+            if progress:
+                progress(index, len(partitions))
+        return rows
+
+    def run(partition):
+        start, end = partition
+        with env.registry.cursor() as cr:
+            return func(api.Environment(cr, env.uid, env.context, su=env.su), start, end)
+
+    env.flush_all()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='msdr-month') as executor:
+        results = list(executor.map(run, partitions))
+    _logger.debug("%s ay parçası %s iş parçacığında hesaplandı", len(partitions), workers)
+    return [row for rows in results for row in rows]
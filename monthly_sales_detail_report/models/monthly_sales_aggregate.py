@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Karşılaştırma modları: karşılaştırma dönemini rapor dönemine taşıyan kayma.
+# PostgreSQL aralığı ile `relativedelta` ay sonlarını aynı şekilde kırpar (31 Oca + 1 ay = 28/29 Şub).
+COMPARISON_SHIFTS = {
+    'previous_year': ('1 year', relativedelta(years=1)),
+    'previous_month': ('1 month', relativedelta(months=1)),
+}
+
+
+def comparison_window(date_from, date_to, comparison_mode):
+    """Kaydırıldığında [date_from, date_to] aralığına düşen karşılaştırma günleri aralığı."""
+    shift = COMPARISON_SHIFTS[comparison_mode][1]
+    comparison_to = date_to - shift
+    # Kırpma nedeniyle sonraki günler de aralığa düşebilir (ör. 29 Şub + 1 yıl = 28 Şub, 31 Oca + 1 ay = 28 Şub)
+    while comparison_to + timedelta(days=1) + shift <= date_to:
+        comparison_to += timedelta(days=1)
+    return date_from - shift, comparison_to
+
+
+class MonthlySalesAggregate(models.Model):
+    """Onaylı müşteri fatura/iadelerinin gelir satırlarından türetilen kalıcı özet tablo.
+
+    Anahtar: gün × ürün × şirket × kaynak para birimi (ay ve kategori bu anahtardan türetilir).
+    Kur çevrimi satır tarihiyle yapıldığından gün seviyesinde tutulur; aylık rapor
+    ay bazında toplar. Fatura onaylandığında, taslağa çekildiğinde veya iptal
+    edildiğinde ilgili anahtarlar yeniden hesaplanır (bkz. `account.move`).
+    """
+    _name = 'monthly.sales.aggregate'
+    _description = 'Aylık Satış Özet Tablosu'
+    _order = 'date desc, categ_id, product_id'
+
+    month = fields.Char(string='Ay', required=True, index=True)  # YYYY-MM
+    date = fields.Date(string='Tarih', required=True, index=True)
+    categ_id = fields.Many2one('product.category', string='Kategori', index=True, ondelete='cascade')
+    product_id = fields.Many2one('product.product', string='Ürün', required=True, index=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Şirket', required=True, ondelete='cascade')
+    currency_id = fields.Many2one('res.currency', string='Para Birimi', required=True)
+    amount = fields.Monetary(string='Tutar', currency_field='currency_id')
+    line_count = fields.Integer(string='Satır Sayısı')
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(date, product_id, company_id, currency_id)',
+         'Aynı gün, ürün, şirket ve para birimi için tek özet satırı olabilir.'),
+    ]
+
+    # Ham fatura satırlarını özet anahtarına göre toplayan sorgu.
+    # `{where}` ek koşullar içindir; temel filtre raporun ORM domain'i ile aynıdır.
+    # `aml.parent_state` koşulu `am.state` ile aynıdır, satır indeksinin kullanılması içindir.
+    _RAW_TOTALS_QUERY = """
+        SELECT to_char(aml.date, 'YYYY-MM') AS month,
+               aml.date AS date,
+               pt.categ_id AS categ_id,
+               aml.product_id AS product_id,
+               aml.company_id AS company_id,
+               COALESCE(aml.currency_id, aml.company_currency_id) AS currency_id,
+               SUM(ABS(CASE WHEN aml.currency_id IS NOT NULL
+                            THEN aml.amount_currency
+                            ELSE aml.balance END)) AS amount,
+               COUNT(*) AS line_count
+          FROM account_move_line aml
+          JOIN account_move am ON am.id = aml.move_id
+          JOIN account_account aa ON aa.id = aml.account_id
+          JOIN product_product pp ON pp.id = aml.product_id
+          JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         WHERE am.move_type IN ('out_invoice', 'out_refund')
+           AND am.state = 'posted'
+           AND aml.parent_state = 'posted'
+           AND aa.account_type IN ('income', 'other_income')
+           AND {where}
+      GROUP BY 1, 2, 3, 4, 5, 6
+    """
+
+    # ---------------------------- Okuma ----------------------------
+    @api.model
+    def _product_scope_filter(self, product_ids, categ_ids, product_column, categ_column):
+        """Ürün havuzu koşulunu ve parametrelerini döndürür: (sql, params).
+
+        Seçili ürünler id listesiyle süzülür. Kategori havuzunda ürün id listesi
+        hiç oluşturulmaz: kategori sütunu ve aktif ürün alt sorgusu kullanılır,
+        böylece on binlerce ürünlük IN listesi sorguya gömülmez. `categ_ids`
+        None ise kategori koşulu eklenmez.
+        """
+        if product_ids is not None:
+            return '{} IN %s'.format(product_column), [tuple(product_ids) or (None,)]
+        conditions = ['{} IN (SELECT id FROM product_product WHERE active)'.format(product_column)]
+        params = []
+        if categ_ids is not None:
+            conditions.insert(0, '{} IN %s'.format(categ_column))
+            params.append(tuple(categ_ids) or (None,))
+        return ' AND '.join(conditions), params
+
+    @api.model
+    def _totals_query(self, date_from, date_to, company_ids, product_ids=None, categ_ids=None,
+                      group_by_product=False, comparison_mode=None):
+        """`_read_totals` sorgusu ve parametreleri: (sql, params)"""
+        product_col = 'a.product_id' if group_by_product else 'NULL::integer'
+        product_filter, filter_params = self._product_scope_filter(product_ids, categ_ids, 'a.product_id', 'a.categ_id')
+        if comparison_mode:
+            return self._comparison_totals_query(
+                date_from, date_to, company_ids, product_col, product_filter, filter_params, comparison_mode,
+            )
+        query = """
+            SELECT a.month AS month,
+                   a.date AS date,
+                   a.categ_id AS categ_id,
+                   {product_col} AS product_id,
+                   a.currency_id AS currency_id,
+                   a.company_id AS company_id,
+                   SUM(a.amount) AS amount,
+                   0 AS comparison_amount,
+                   SUM(a.line_count) AS line_count
+              FROM monthly_sales_aggregate a
+             WHERE a.date >= %s
+               AND a.date <= %s
+               AND a.company_id IN %s
+               AND {product_filter}
+          GROUP BY 1, 2, 3, 4, 5, 6
+          ORDER BY 2, 3, 4, 5, 6
+        """.format(product_col=product_col, product_filter=product_filter)
+        return query, [date_from, date_to, tuple(company_ids)] + filter_params
+
+    @api.model
+    def _comparison_totals_query(self, date_from, date_to, company_ids, product_col, product_filter,
+                                 filter_params, comparison_mode):
+        """Rapor ve karşılaştırma dönemini tek taramada okuyan sorgu: (sql, params).
+
+        Her özet satırı iki kez değerlendirilir: kendi tarihiyle (dönem 0) ve
+        karşılaştırma kaymasıyla ileri taşınmış tarihle (dönem 1). Rapor aralığına
+        düşen değerlendirmeler raporun ayına göre gruplanır; tutarlar dönem bazında
+        koşullu toplanır (`FILTER`). Kur çevrimi için satırın kendi tarihi korunur.
+        Önceki ay modunda iki dönem çakışabilir; bir gün hem kendi ayına hem
+        sonraki ayın karşılaştırmasına katkı verir.
+        """
+        interval = COMPARISON_SHIFTS[comparison_mode][0]
+        comparison_from, comparison_to = comparison_window(date_from, date_to, comparison_mode)
+        query = """
+            SELECT to_char(p.report_date, 'YYYY-MM') AS month,
+                   a.date AS date,
+                   a.categ_id AS categ_id,
+                   {product_col} AS product_id,
+                   a.currency_id AS currency_id,
+                   a.company_id AS company_id,
+                   COALESCE(SUM(a.amount) FILTER (WHERE p.period = 0), 0) AS amount,
+                   COALESCE(SUM(a.amount) FILTER (WHERE p.period = 1), 0) AS comparison_amount,
+                   COALESCE(SUM(a.line_count) FILTER (WHERE p.period = 0), 0) AS line_count
+              FROM monthly_sales_aggregate a
+              CROSS JOIN LATERAL (VALUES (0, a.date), (1, (a.date + %s::interval)::date)) p(period, report_date)
+             WHERE (a.date BETWEEN %s AND %s OR a.date BETWEEN %s AND %s)
+               AND p.report_date BETWEEN %s AND %s
+               AND a.company_id IN %s
+               AND {product_filter}
+          GROUP BY 1, 2, 3, 4, 5, 6
+          ORDER BY 2, 3, 4, 5, 6
+        """.format(product_col=product_col, product_filter=product_filter)
+        return query, [
+            interval, comparison_from, comparison_to, date_from, date_to, date_from, date_to, tuple(company_ids),
+        ] + filter_params
+
+    @api.model
+    def _read_totals(self, date_from, date_to, company_ids, product_ids=None, categ_ids=None,
+                     group_by_product=False, comparison_mode=None):
+        """Özet tablodan gün, kategori, (isteğe bağlı) ürün, para birimi ve şirket
+        bazında toplamları okur. Sonuç satırları ham sorguyla aynı anahtarları taşır
+        ve tarihe göre sıralıdır (ay parçalarına bölünmüş okumalar aynı sırayı verir).
+        Ürün havuzu `_product_scope_filter` ile süzülür. `comparison_mode` verilirse
+        (`COMPARISON_SHIFTS`) her satır karşılaştırma dönemi tutarını da taşır.
+        """
+        self.flush_model()
+        self.env.cr.execute(*self._totals_query(
+            date_from, date_to, company_ids, product_ids, categ_ids,
+            group_by_product=group_by_product, comparison_mode=comparison_mode,
+        ))
+        return self.env.cr.dictfetchall()
+
+    # ---------------------------- Güncelleme ----------------------------
+    @api.model
+    def _insert_from_move_lines(self, where, params):
+        """Ham satırlardan hesaplanan toplamları özet tabloya yazar (upsert)."""
+        query = """
+            INSERT INTO monthly_sales_aggregate
+                   (month, date, categ_id, product_id, company_id, currency_id, amount, line_count,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT t.month, t.date, t.categ_id, t.product_id, t.company_id, t.currency_id,
+                   t.amount, t.line_count,
+                   %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM ({raw}) t
+            ON CONFLICT (date, product_id, company_id, currency_id) DO UPDATE
+               SET month = EXCLUDED.month,
+                   categ_id = EXCLUDED.categ_id,
+                   amount = EXCLUDED.amount,
+                   line_count = EXCLUDED.line_count,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """.format(raw=self._RAW_TOTALS_QUERY.format(where=where))
+        self.env.cr.execute(query, [self.env.uid, self.env.uid] + list(params))
+        return self.env.cr.rowcount
+
+    @api.model
+    def _refresh_keys(self, keys):
+        """Verilen (tarih, ürün, şirket) anahtarlarını ham satırlardan yeniden hesaplar."""
+        if not keys:
+            return
+        dates, product_ids, company_ids = (list(values) for values in zip(*keys))
+        key_filter = "(%s) IN (SELECT * FROM unnest(%%s::date[], %%s::int[], %%s::int[]))"
+        params = [dates, product_ids, company_ids]
+
+        self.env.cr.execute(
+            "DELETE FROM monthly_sales_aggregate a WHERE " + key_filter % 'a.date, a.product_id, a.company_id',
+            params,
+        )
+        self._insert_from_move_lines(key_filter % 'aml.date, aml.product_id, aml.company_id', params)
+        self.invalidate_model()
+        self.env['monthly.sales.report.cache']._invalidate_dates(set(dates))
+
+    @api.model
+    def _refresh_for_moves(self, moves):
+        """Faturaların katkıda bulunduğu tüm anahtarları yeniden hesaplar."""
+        if not moves:
+            return
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT DISTINCT date, product_id, company_id
+              FROM account_move_line
+             WHERE move_id IN %s
+               AND product_id IS NOT NULL
+        """, [tuple(moves.ids)])
+        keys = self.env.cr.fetchall()
+        self._refresh_keys(keys)
+        _logger.debug("Özet tablo %s fatura için %s anahtarda güncellendi", len(moves), len(keys))
+
+    @api.model
+    def _rebuild(self):
+        """Özet tabloyu tamamen silip ham satırlardan yeniden oluşturur."""
+        self.env.flush_all()
+        self.env.cr.execute("DELETE FROM monthly_sales_aggregate")
+        count = self._insert_from_move_lines('aml.product_id IS NOT NULL', [])
+        self.invalidate_model()
+        self.env['monthly.sales.report.cache']._invalidate_all()
+        _logger.debug("Özet tablo yeniden oluşturuldu: %s satır", count)
+        return count
+
+    @api.model
+    def _update_product_categories(self, products):
+        """Kategorisi değişen ürünlerin özet satırlarını güncel kategoriye taşır."""
+        if not products:
+            return
+        self.env.flush_all()
+        self.env.cr.execute("""
+            UPDATE monthly_sales_aggregate a
+               SET categ_id = pt.categ_id
+              FROM product_product pp
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id
+             WHERE pp.id = a.product_id
+               AND a.product_id IN %s
+               AND a.categ_id IS DISTINCT FROM pt.categ_id
+        """, [tuple(products.ids)])
+        self.invalidate_model(['categ_id'])
+        self.env['monthly.sales.report.cache']._invalidate_all()
+
+    # ---------------------------- Tutarlılık ----------------------------
+    @api.model
+    def _check_consistency(self, date_from=None, date_to=None):
+        """Özet tabloyu ham satırlarla karşılaştırır; uyuşmayan anahtarları döndürür.
+
+        Dönen liste elemanları: (tarih, ürün id, şirket id, para birimi id, özet tutar, ham tutar)
+        """
+        self.env.flush_all()
+        where = ['aml.product_id IS NOT NULL']
+        agg_where = ['TRUE']
+        if date_from:
+            where.append('aml.date >= %s')
+            agg_where.append('a.date >= %s')
+        if date_to:
+            where.append('aml.date <= %s')
+            agg_where.append('a.date <= %s')
+        params = [d for d in (date_from, date_to) if d]
+        self.env.cr.execute("""
+            SELECT COALESCE(a.date, r.date),
+                   COALESCE(a.product_id, r.product_id),
+                   COALESCE(a.company_id, r.company_id),
+                   COALESCE(a.currency_id, r.currency_id),
+                   a.amount,
+                   r.amount
+              FROM (SELECT * FROM monthly_sales_aggregate a WHERE {agg_where}) a
+         FULL JOIN ({raw}) r
+                ON r.date = a.date
+               AND r.product_id = a.product_id
+               AND r.company_id = a.company_id
+               AND r.currency_id = a.currency_id
+             WHERE a.id IS NULL
+                OR r.product_id IS NULL
+                OR ROUND(a.amount::numeric, 6) != ROUND(r.amount::numeric, 6)
+                OR a.line_count != r.line_count
+                OR a.categ_id IS DISTINCT FROM r.categ_id
+        """.format(agg_where=' AND '.join(agg_where),
+                   raw=self._RAW_TOTALS_QUERY.format(where=' AND '.join(where))),
+            params + params)
+        mismatches = self.env.cr.fetchall()
+        if mismatches:
+            _logger.warning("Özet tabloda %s tutarsız anahtar bulundu", len(mismatches))
+        return mismatches
+
+    @api.model
+    def _repair(self, date_from=None, date_to=None):
+        """Tutarsız anahtarları ham satırlardan yeniden hesaplar."""
+        mismatches = self._check_consistency(date_from, date_to)
+        self._refresh_keys({(date, product_id, company_id) for date, product_id, company_id, *_rest in mismatches})
+        return mismatches
+
+    @api.model
+    def _cron_repair_recent(self):
+        """Son iki ayı kontrol edip eşzamanlı güncellemelerden kalan farkları düzeltir."""
+        today = fields.Date.context_today(self)
+        date_from = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+        self._repair(date_from=date_from)
+
+    # ---------------------------- Aksiyonlar ----------------------------
+    def action_rebuild(self):
+        count = self.sudo()._rebuild()
+        return self._notify(_('Özet tablo yeniden oluşturuldu: %s satır.') % count, 'success')
+
+    def action_check_consistency(self):
+        mismatches = self.sudo()._check_consistency()
+        if mismatches:
+            return self._notify(_('%s tutarsız anahtar bulundu. Yeniden oluşturma önerilir.') % len(mismatches), 'warning')
+        return self._notify(_('Özet tablo fatura satırlarıyla tutarlı.'), 'success')
+
+    def _notify(self, message, notification_type):
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Aylık Satış Özet Tablosu'),
+                'message': message,
+                'type': notification_type,
+                'sticky': False,
+            },
+        }
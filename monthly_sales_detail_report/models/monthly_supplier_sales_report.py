@@ -2,12 +2,19 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 import logging
+import xlsxwriter
+
+from .cost_history import ProductCostHistory
+from .currency_rate_table import CurrencyRateTable
+from .file_attachment import XLSX_MIMETYPE, create_file_attachment
+from .margin import compute_line_margins, compute_margins, group_sum
 
 _logger = logging.getLogger(__name__)
 
 
 class MonthlySupplierSalesReport(models.TransientModel):
     _name = 'monthly.supplier.sales.report'
+    _inherit = ['monthly.sales.report.instrumentation', 'monthly.sales.report.job.mixin']
     _description = 'Tedarikçi Aylık Satış Raporu'
 
     # Filters
@@ -15,6 +22,7 @@ class MonthlySupplierSalesReport(models.TransientModel):
     date_to = fields.Date(string='Bitiş', required=True, default=lambda self: fields.Date.context_today(self))
     supplier_ids = fields.Many2many('res.partner', string='Tedarikçiler', domain=[('supplier_rank', '>', 0)])
     currency_id = fields.Many2one('res.currency', string='Para Birimi', required=True, default=lambda self: self.env.company.currency_id)
+    parallel_months = fields.Boolean(string='Aylara Bölerek Paralel Hesapla', help="Split the range into months and aggregate them in parallel database connections")
 
     # Navigation
     detail_level = fields.Selection([('main', 'Aylık Özet'), ('supplier_month', 'Tedarikçi Ay Detayı'), ('invoice', 'Fatura Detayı'), ('invoice_line', 'Fatura Satırları')], default='main')
@@ -34,24 +42,91 @@ class MonthlySupplierSalesReport(models.TransientModel):
             return self.supplier_ids
         return self.env['res.partner'].search([('supplier_rank', '>', 0), ('active', '=', True)])
 
-    def _compute_cost_price(self, move_line):
-        product = move_line.product_id
-        if not product:
-            return 0.0
-        # Prefer standard_price as last cost; for avg cost environments, this may differ
-        return product.standard_price or 0.0
-
-    def _get_product_vendor_partner(self, product):
-        if not product:
-            return False
-        seller = product.seller_ids[:1]
-        if not seller:
-            return False
-        # Odoo versions differ: vendor field can be `partner_id` or `name`
-        return getattr(seller, 'partner_id', False) or getattr(seller, 'name', False)
-
-    def _convert_amount(self, amount, src_currency, company, date):
-        return src_currency._convert(amount, self.currency_id, company, date)
+    def _get_cost_history(self, product_ids, company_ids, date_to=None):
+        # Cost at invoice date from valuation layers, loaded once for all products;
+        # falls back to the current standard_price where no history exists
+        return ProductCostHistory(self.env, product_ids, company_ids, date_to or self.date_to)
+
+    def _primary_vendor_query(self, vendor_ids):
+        """Return (sql, params) selecting (product_tmpl_id, partner_id) pairs.
+
+        Each template gets the vendor `seller_ids[:1]` would return (sequence, min_qty desc,
+        price, id). Only templates with a supplierinfo line for one of `vendor_ids` are
+        considered, so the cost follows the selected suppliers, not the whole catalogue.
+        """
+        query = """
+            SELECT product_tmpl_id, partner_id
+              FROM (SELECT DISTINCT ON (si.product_tmpl_id) si.product_tmpl_id, si.partner_id
+                      FROM product_supplierinfo si
+                     WHERE si.product_tmpl_id IN (SELECT product_tmpl_id
+                                                    FROM product_supplierinfo
+                                                   WHERE partner_id IN %s)
+                       AND (si.company_id IS NULL OR si.company_id IN %s)
+                  ORDER BY si.product_tmpl_id, si.sequence, si.min_qty DESC, si.price, si.id
+                   ) first_seller
+             WHERE partner_id IN %s
+        """
+        vendor_ids = tuple(vendor_ids) or (None,)
+        return query, [vendor_ids, tuple(self.env.companies.ids), vendor_ids]
+
+    def _get_vendor_map(self, vendor_ids):
+        """Return {product_id: primary vendor partner_id} for products of `vendor_ids`."""
+        self.env['product.supplierinfo'].flush_model()
+        self.env['product.product'].flush_model(['product_tmpl_id'])
+        vendor_query, params = self._primary_vendor_query(vendor_ids)
+        self.env.cr.execute("""
+            SELECT pp.id, pv.partner_id
+              FROM product_product pp
+              JOIN ({vendor_query}) pv ON pv.product_tmpl_id = pp.product_tmpl_id
+        """.format(vendor_query=vendor_query), params)
+        return dict(self.env.cr.fetchall())
+
+    def _supplier_sales_query(self, vendor_ids, date_from=None, date_to=None):
+        """Return (sql, params) aggregating invoice lines of the selected vendors' products.
+
+        Joins account.move.line -> product.product -> product.supplierinfo, so only lines
+        whose product's primary vendor is selected are read. Rows are grouped per vendor,
+        invoice date, product, invoice currency and company; the product is kept so the
+        unit cost can be applied and the date so amounts convert at the invoice date.
+        Rows are ordered by invoice date so month partitions merge in serial order.
+        The move filters match the partial customer invoice index on account_move.
+        """
+        vendor_query, params = self._primary_vendor_query(vendor_ids)
+        query = """
+            SELECT pv.partner_id AS vendor_id,
+                   to_char(am.invoice_date, 'YYYY-MM') AS month,
+                   am.invoice_date AS invoice_date,
+                   aml.product_id AS product_id,
+                   am.currency_id AS currency_id,
+                   am.company_id AS company_id,
+                   SUM(ABS(aml.price_subtotal)) AS sales,
+                   SUM(ABS(aml.quantity)) AS quantity
+              FROM account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+              JOIN product_product pp ON pp.id = aml.product_id
+              JOIN ({vendor_query}) pv ON pv.product_tmpl_id = pp.product_tmpl_id
+             WHERE am.move_type IN ('out_invoice', 'out_refund')
+               AND am.state = 'posted'
+               AND am.invoice_date >= %s
+               AND am.invoice_date <= %s
+               AND am.company_id IN %s
+               AND aml.display_type = 'product'
+          GROUP BY 1, 2, 3, 4, 5, 6
+          ORDER BY 3, 1, 4, 5, 6
+        """.format(vendor_query=vendor_query)
+        return query, params + [date_from or self.date_from, date_to or self.date_to, tuple(self.env.companies.ids)]
+
+    def _query_supplier_sales(self, vendor_ids, date_from=None, date_to=None):
+        """Aggregate invoice lines of the selected vendors' products in the database."""
+        self.env.flush_all()
+        self.env.cr.execute(*self._supplier_sales_query(vendor_ids, date_from, date_to))
+        return self.env.cr.dictfetchall()
+
+    def _get_rate_table(self, currency_ids, company_ids, date_to=None):
+        """Kurları toplu yükleyen çevrim tablosu."""
+        return CurrencyRateTable(
+            self.env, self.currency_id, currency_ids, company_ids, date_to or self.date_to,
+        )
 
     def _prepare_invoice_domain(self):
         return [
@@ -65,70 +140,67 @@ class MonthlySupplierSalesReport(models.TransientModel):
     def _build_main_data(self):
         self.ensure_one()
         suppliers = self._get_suppliers()
-        supplier_ids_filter = set(suppliers.ids)
-        invoices = self.env['account.move'].search(self._prepare_invoice_domain())
+        vendor_names = {partner.id: partner.name for partner in suppliers}
+        rows = self._read_partitioned(
+            self.date_from, self.date_to,
+            lambda env, start, end: env[self._name]._query_supplier_sales(suppliers.ids, start, end),
+        )
+
+        companies = self.env['res.company'].browse({row['company_id'] for row in rows})
+        company_currency = {company.id: company.currency_id.id for company in companies}
+        rate_table = self._get_rate_table(
+            {row['currency_id'] for row in rows} | set(company_currency.values()), companies.ids,
+        )
+        cost_history = self._get_cost_history({row['product_id'] for row in rows}, companies.ids)
+
+        # Sales and cost of every row converted in one vectorized pass
+        margins = compute_line_margins(
+            quantity=[row['quantity'] for row in rows],
+            subtotal=[row['sales'] for row in rows],
+            unit_cost=cost_history.costs_at(
+                (row['product_id'], row['company_id'], row['invoice_date']) for row in rows
+            ),
+            sales_factor=[
+                rate_table.get_factor(row['currency_id'], row['company_id'], row['invoice_date']) for row in rows
+            ],
+            cost_factor=[
+                rate_table.get_factor(company_currency[row['company_id']], row['company_id'], row['invoice_date'])
+                for row in rows
+            ],
+            precision_digits=self.currency_id.decimal_places,
+            absolute=True,
+        )
 
         # Map supplier by month aggregates
+        buckets = {}
+        groups = [buckets.setdefault((row['vendor_id'], row['month']), len(buckets)) for row in rows]
+        total_sales = group_sum(groups, margins.sales, len(buckets))
+        total_cost = group_sum(groups, margins.cost, len(buckets))
         data = {}
-        for inv in invoices:
-            month_key = fields.Date.to_date(inv.invoice_date).strftime('%Y-%m')
-            company_currency = inv.company_id.currency_id
-
-            for line in inv.invoice_line_ids:
-                if not line.product_id:
-                    continue
-                vendor_partner = self._get_product_vendor_partner(line.product_id)
-                if not vendor_partner:
-                    continue
-                if supplier_ids_filter and vendor_partner.id not in supplier_ids_filter:
-                    continue
-
-                line_sales = line.price_subtotal or 0.0
-                unit_cost = self._compute_cost_price(line)
-                line_cost = unit_cost * (line.quantity or 0.0)
-
-                sales_conv = self._convert_amount(line_sales, inv.currency_id, inv.company_id, inv.invoice_date)
-                cost_conv = self._convert_amount(line_cost, company_currency, inv.company_id, inv.invoice_date)
-
-                supplier_bucket = data.setdefault(vendor_partner.id, {})
-                month_bucket = supplier_bucket.setdefault(month_key, {
-                    'supplier_name': vendor_partner.name,
-                    'total_sales': 0.0,
-                    'total_cost': 0.0,
-                })
-                month_bucket['total_sales'] += abs(sales_conv)
-                month_bucket['total_cost'] += abs(cost_conv)
-
+        for (vendor_id, month), index in buckets.items():
+            data.setdefault(vendor_id, {})[month] = {
+                'supplier_name': vendor_names[vendor_id],
+                'total_sales': float(total_sales[index]),
+                'total_cost': float(total_cost[index]),
+            }
+
+        rate_table.log_stats('Tedarikçi raporu')
         return data
 
     def generate_report(self):
         self.ensure_one()
-        self.main_lines.unlink()
-        self.supplier_month_lines.unlink()
-        self.invoice_lines.unlink()
-        self.invoice_line_lines.unlink()
+        with self._report_probe('generate_report') as probe:
+            with probe.phase('cleanup'):
+                self.env['monthly.supplier.sales.main.line']._bulk_unlink_reports(self.ids)
+                self.env['monthly.supplier.sales.supplier.month.line']._bulk_unlink_reports(self.ids)
+                self.env['monthly.supplier.sales.invoice.line']._bulk_unlink_reports(self.ids)
+                self.env['monthly.supplier.sales.invoice.line.line']._bulk_unlink_reports(self.ids)
 
-        data = self._build_main_data()
+            with probe.phase('aggregate'):
+                data = self._build_main_data()
 
-        line_vals = []
-        for supplier_id, months in data.items():
-            for month_key, vals in months.items():
-                sales = vals['total_sales']
-                cost = vals['total_cost']
-                margin = sales - cost
-                margin_pct = (margin / sales * 100.0) if sales else 0.0
-                line_vals.append({
-                    'report_id': self.id,
-                    'supplier_id': supplier_id,
-                    'supplier_name': vals['supplier_name'],
-                    'month': month_key,
-                    'total_sales': sales,
-                    'total_cost': cost,
-                    'margin': margin,
-                    'margin_percent': margin_pct,
-                })
-        if line_vals:
-            self.env['monthly.supplier.sales.main.line'].create(line_vals)
+            with probe.phase('lines'):
+                self._create_main_lines(data)
 
         self.detail_level = 'main'
         return {
@@ -140,6 +212,58 @@ class MonthlySupplierSalesReport(models.TransientModel):
             'target': 'new',
         }
 
+    def _create_main_lines(self, data):
+        buckets = [(supplier_id, month_key, vals) for supplier_id, months in data.items() for month_key, vals in months.items()]
+        margins, margin_pcts = compute_margins(
+            [vals['total_sales'] for _supplier_id, _month_key, vals in buckets],
+            [vals['total_cost'] for _supplier_id, _month_key, vals in buckets],
+        )
+        line_vals = []
+        for (supplier_id, month_key, vals), margin, margin_pct in zip(buckets, margins.tolist(), margin_pcts.tolist()):
+            line_vals.append({
+                'report_id': self.id,
+                'supplier_id': supplier_id,
+                'supplier_name': vals['supplier_name'],
+                'month': month_key,
+                'total_sales': vals['total_sales'],
+                'total_cost': vals['total_cost'],
+                'margin': margin,
+                'margin_percent': margin_pct,
+            })
+        if line_vals:
+            self.env['monthly.supplier.sales.main.line']._bulk_create(line_vals)
+
+    # Background job
+    def _run_report_job(self):
+        self.generate_report()
+        return self._generate_excel_attachment()
+
+    def _generate_excel_attachment(self):
+        """Write the monthly summary to a constant_memory workbook and move it into the filestore as an attachment."""
+        def write(path):
+            workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            worksheet = workbook.add_worksheet('Tedarikci Aylik Satis')
+            header_format = workbook.add_format({'bold': True, 'bg_color': '#D7E4BC', 'border': 1})
+            amount_format = workbook.add_format({'num_format': '#,##0.00', 'border': 1})
+            headers = ['Supplier', 'Month', 'Sales ({})'.format(self.currency_id.name), 'Cost', 'Margin', 'Margin %']
+            for col, header in enumerate(headers):
+                worksheet.write(0, col, header, header_format)
+            worksheet.set_column('A:A', 35)
+            worksheet.set_column('B:F', 15)
+            for row, line in enumerate(self.main_lines, start=1):
+                worksheet.write(row, 0, line.supplier_name)
+                worksheet.write(row, 1, line.month)
+                for col, value in enumerate((line.total_sales, line.total_cost, line.margin, line.margin_percent), start=2):
+                    worksheet.write_number(row, col, value, amount_format)
+            workbook.close()
+
+        return create_file_attachment(self.env, write, {
+            'name': 'tedarikci_aylik_satis_{}_{}.xlsx'.format(self.date_from, self.date_to),
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': XLSX_MIMETYPE,
+        })
+
     # Drilldowns
     def open_supplier_month(self):
         self.ensure_one()
@@ -148,59 +272,83 @@ class MonthlySupplierSalesReport(models.TransientModel):
         if not supplier or not month_key:
             raise UserError(_('Seçim bilgileri eksik'))
 
-        self.supplier_month_lines.unlink()
-
-        # Find invoices for supplier and month
-        year, month = month_key.split('-')
-        date_start = fields.Date.from_string(f'{year}-{month}-01')
-        if int(month) == 12:
-            next_month_first = fields.Date.from_string(f'{int(year)+1}-01-01')
-        else:
-            next_month_first = fields.Date.from_string(f'{year}-{int(month)+1:02d}-01')
-        from datetime import timedelta
-        date_end = next_month_first - timedelta(days=1)
-
-        invoices = self.env['account.move'].search(self._prepare_invoice_domain() + [
-            ('invoice_date', '>=', date_start), ('invoice_date', '<=', date_end),
-        ])
-
-        line_vals = []
-        for inv in invoices:
-            # Determine if invoice contains products linked to supplier
-            has_supplier = False
-            invoice_sales = 0.0  # in invoice currency
-            invoice_cost = 0.0   # in company currency
-            for line in inv.invoice_line_ids:
-                prod_supplier = self._get_product_vendor_partner(line.product_id) if line.product_id else False
-                if prod_supplier and prod_supplier.id == supplier:
-                    has_supplier = True
-                    unit_cost = self._compute_cost_price(line)
-                    invoice_sales += line.price_subtotal
-                    invoice_cost += unit_cost * line.quantity
-            if not has_supplier:
-                continue
-
-            # Convert to target currency consistently
-            sales_conv = self._convert_amount(invoice_sales, inv.currency_id, inv.company_id, inv.invoice_date)
-            cost_conv = self._convert_amount(invoice_cost, inv.company_id.currency_id, inv.company_id, inv.invoice_date)
-            sales_conv = abs(sales_conv)
-            cost_conv = abs(cost_conv)
-            margin_conv = sales_conv - cost_conv
-            margin_pct = (margin_conv / sales_conv * 100.0) if sales_conv else 0.0
-            line_vals.append({
-                'report_id': self.id,
-                'invoice_id': inv.id,
-                'invoice_name': inv.name,
-                'invoice_date': inv.invoice_date,
-                'supplier_id': supplier,
-                'total_sales': sales_conv,
-                'total_cost': cost_conv,
-                'margin': margin_conv,
-                'margin_percent': margin_pct,
-            })
+        with self._report_probe('open_supplier_month'):
+            self.env['monthly.supplier.sales.supplier.month.line']._bulk_unlink_reports(self.ids)
+
+            # Find invoices for supplier and month
+            year, month = month_key.split('-')
+            date_start = fields.Date.from_string(f'{year}-{month}-01')
+            if int(month) == 12:
+                next_month_first = fields.Date.from_string(f'{int(year)+1}-01-01')
+            else:
+                next_month_first = fields.Date.from_string(f'{year}-{int(month)+1:02d}-01')
+            from datetime import timedelta
+            date_end = next_month_first - timedelta(days=1)
+
+            vendor_map = self._get_vendor_map([supplier])
+            invoices = self.env['account.move'].search(self._prepare_invoice_domain() + [
+                ('invoice_date', '>=', date_start), ('invoice_date', '<=', date_end),
+                ('invoice_line_ids.product_id', 'in', list(vendor_map)),
+            ])
+            rate_table = self._get_rate_table(
+                (invoices.currency_id | invoices.company_id.currency_id).ids, invoices.company_id.ids, date_end,
+            )
+
+            # Collect the supplier's lines per invoice (sales in invoice currency, cost in company currency)
+            cost_history = self._get_cost_history(list(vendor_map), invoices.company_id.ids, date_end)
+            supplier_invoices, groups, subtotals, quantities, line_unit_costs = [], [], [], [], []
+            for inv in invoices:
+                index = None
+                for line in inv.invoice_line_ids:
+                    if line.product_id.id in vendor_map:
+                        if index is None:
+                            index = len(supplier_invoices)
+                            supplier_invoices.append(inv)
+                        groups.append(index)
+                        subtotals.append(line.price_subtotal)
+                        quantities.append(line.quantity)
+                        line_unit_costs.append(
+                            cost_history.cost_at(line.product_id.id, inv.company_id.id, inv.invoice_date)
+                        )
+
+            line_costs = compute_line_margins(quantities, subtotals, line_unit_costs).cost
+            # Convert to target currency consistently, one vectorized pass for all invoices
+            margins = compute_line_margins(
+                quantity=[1.0] * len(supplier_invoices),
+                subtotal=group_sum(groups, subtotals, len(supplier_invoices)),
+                unit_cost=group_sum(groups, line_costs, len(supplier_invoices)),
+                sales_factor=[
+                    rate_table.get_factor(inv.currency_id.id, inv.company_id.id, inv.invoice_date)
+                    for inv in supplier_invoices
+                ],
+                cost_factor=[
+                    rate_table.get_factor(inv.company_id.currency_id.id, inv.company_id.id, inv.invoice_date)
+                    for inv in supplier_invoices
+                ],
+                precision_digits=self.currency_id.decimal_places,
+                absolute=True,
+            )
+
+            line_vals = []
+            for inv, sales_conv, cost_conv, margin_conv, margin_pct in zip(
+                supplier_invoices, margins.sales.tolist(), margins.cost.tolist(),
+                margins.margin.tolist(), margins.margin_percent.tolist(),
+            ):
+                line_vals.append({
+                    'report_id': self.id,
+                    'invoice_id': inv.id,
+                    'invoice_name': inv.name,
+                    'invoice_date': inv.invoice_date,
+                    'supplier_id': supplier,
+                    'total_sales': sales_conv,
+                    'total_cost': cost_conv,
+                    'margin': margin_conv,
+                    'margin_percent': margin_pct,
+                })
 
-        if line_vals:
-            self.env['monthly.supplier.sales.supplier.month.line'].create(line_vals)
+            rate_table.log_stats('Tedarikçi ay detayı')
+            if line_vals:
+                self.env['monthly.supplier.sales.supplier.month.line']._bulk_create(line_vals)
 
         self.detail_level = 'supplier_month'
         self.selected_supplier_id = supplier
@@ -220,28 +368,34 @@ class MonthlySupplierSalesReport(models.TransientModel):
         if not invoice_id:
             raise UserError(_('Fatura bilgisi eksik'))
 
-        # Populate invoice line lines
-        self.invoice_line_lines.unlink()
-        inv = self.env['account.move'].browse(invoice_id)
-        rows = []
-        for line in inv.invoice_line_ids:
-            unit_cost = self._compute_cost_price(line)
-            line_cost = unit_cost * line.quantity
-            margin = line.price_subtotal - line_cost
-            margin_pct = (margin / line.price_subtotal * 100.0) if line.price_subtotal else 0.0
-            rows.append({
-                'report_id': self.id,
-                'invoice_id': inv.id,
-                'product_name': line.product_id.display_name or line.name,
-                'quantity': line.quantity,
-                'unit_cost': unit_cost,
-                'price_unit': line.price_unit,
-                'price_subtotal': line.price_subtotal,
-                'margin': margin,
-                'margin_percent': margin_pct,
-            })
-        if rows:
-            self.env['monthly.supplier.sales.invoice.line.line'].create(rows)
+        with self._report_probe('open_invoices'):
+            # Populate invoice line lines
+            self.env['monthly.supplier.sales.invoice.line.line']._bulk_unlink_reports(self.ids)
+            inv = self.env['account.move'].browse(invoice_id)
+            lines = inv.invoice_line_ids
+            cost_date = inv.invoice_date or inv.date
+            cost_history = self._get_cost_history(lines.product_id.ids, inv.company_id.ids, cost_date)
+            line_unit_costs = cost_history.costs_at(
+                (line.product_id.id, inv.company_id.id, cost_date) for line in lines
+            )
+            margins = compute_line_margins(lines.mapped('quantity'), lines.mapped('price_subtotal'), line_unit_costs)
+            rows = []
+            for line, unit_cost, margin, margin_pct in zip(
+                lines, line_unit_costs, margins.margin.tolist(), margins.margin_percent.tolist(),
+            ):
+                rows.append({
+                    'report_id': self.id,
+                    'invoice_id': inv.id,
+                    'product_name': line.product_id.display_name or line.name,
+                    'quantity': line.quantity,
+                    'unit_cost': unit_cost,
+                    'price_unit': line.price_unit,
+                    'price_subtotal': line.price_subtotal,
+                    'margin': margin,
+                    'margin_percent': margin_pct,
+                })
+            if rows:
+                self.env['monthly.supplier.sales.invoice.line.line']._bulk_create(rows)
 
         self.detail_level = 'invoice_line'
         self.selected_invoice_id = invoice_id
@@ -257,6 +411,7 @@ class MonthlySupplierSalesReport(models.TransientModel):
 
 class MonthlySupplierSalesMainLine(models.TransientModel):
     _name = 'monthly.supplier.sales.main.line'
+    _inherit = 'monthly.sales.report.line.mixin'
     _description = 'Tedarikçi Aylık Özet Satırı'
 
     report_id = fields.Many2one('monthly.supplier.sales.report', ondelete='cascade')
@@ -274,6 +429,7 @@ class MonthlySupplierSalesMainLine(models.TransientModel):
 
 class MonthlySupplierSalesSupplierMonthLine(models.TransientModel):
     _name = 'monthly.supplier.sales.supplier.month.line'
+    _inherit = 'monthly.sales.report.line.mixin'
     _description = 'Tedarikçi Ay Detay Satırı'
 
     report_id = fields.Many2one('monthly.supplier.sales.report', ondelete='cascade')
@@ -292,6 +448,7 @@ class MonthlySupplierSalesSupplierMonthLine(models.TransientModel):
 
 class MonthlySupplierSalesInvoiceLine(models.TransientModel):
     _name = 'monthly.supplier.sales.invoice.line'
+    _inherit = 'monthly.sales.report.line.mixin'
     _description = 'Tedarikçi Fatura Özet Satırı'
 
     report_id = fields.Many2one('monthly.supplier.sales.report', ondelete='cascade')
@@ -310,6 +467,7 @@ class MonthlySupplierSalesInvoiceLine(models.TransientModel):
 
 class MonthlySupplierSalesInvoiceLineLine(models.TransientModel):
     _name = 'monthly.supplier.sales.invoice.line.line'
+    _inherit = 'monthly.sales.report.line.mixin'
     _description = 'Tedarikçi Fatura Kalemi'
 
     report_id = fields.Many2one('monthly.supplier.sales.report', ondelete='cascade')
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'categ_id' in vals:
+            self.env['monthly.sales.aggregate'].sudo()._update_product_categories(
+                self.with_context(active_test=False).product_variant_ids
+            )
+        return res
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from datetime import timedelta
+import hashlib
+import json
+import logging
+
+import psycopg2
+
+from .file_attachment import XLSX_MIMETYPE, share_file_attachment
+from .monthly_sales_aggregate import comparison_window
+from .report_columns import ReportColumns
+
+_logger = logging.getLogger(__name__)
+
+CACHE_TTL_PARAM = 'monthly_sales_detail_report.cache_ttl_minutes'
+CACHE_SIZE_PARAM = 'monthly_sales_detail_report.cache_size'
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_SIZE = 100
+
+
+class MonthlySalesReportCache(models.Model):
+    """Aynı filtrelerle üretilen raporların sonuç önbelleği.
+
+    Anahtar normalize edilmiş filtre kümesidir (tarihler, genişletilmiş kategori
+    id'leri, ürün id'leri, alt kategori seçimi, hedef para birimi, şirketler, dil).
+    Rapor verisi JSON, Excel dosyası ek olarak saklanır. Kayıtlar veritabanında
+    tutulduğundan tüm Odoo worker'ları aynı önbelleği görür.
+
+    Geçersiz kılma: özet tablo bir tarih için yeniden hesaplandığında (fatura onay,
+    taslağa çekme, iptal, onarım) o tarihi kapsayan girdiler silinir. Kapsanan
+    aralık (`covered_from` - `covered_to`) rapor penceresi ile karşılaştırma
+    modunda okunan kaydırılmış pencerenin birleşimidir. Müşteri ve temsilci
+    sıralamaları fatura başlığından okunduğundan onaylı faturada müşteri veya
+    satış temsilcisi değiştiğinde o sıralama modundaki girdiler de silinir. Süresi
+    (`cache_ttl_minutes`) dolan girdiler kullanılmaz; girdi sayısı `cache_size`
+    sınırını aşınca en uzun süredir kullanılmayanlar silinir.
+    """
+    _name = 'monthly.sales.report.cache'
+    _description = 'Aylık Satış Rapor Önbelleği'
+    _order = 'last_used desc'
+
+    key = fields.Char(string='Anahtar', required=True, index=True)
+    date_from = fields.Date(string='Başlangıç', required=True)
+    date_to = fields.Date(string='Bitiş', required=True)
+    covered_from = fields.Date(string='Kapsanan Başlangıç', required=True, index=True)
+    covered_to = fields.Date(string='Kapsanan Bitiş', required=True, index=True)
+    parameters_json = fields.Text(string='Parametreler (JSON)')
+    report_data = fields.Text(string='Rapor Verisi (JSON)')  # ReportColumns.to_dict()
+    attachment_id = fields.Many2one('ir.attachment', string='Excel Dosyası')
+    last_used = fields.Datetime(string='Son Kullanım', default=fields.Datetime.now)
+    hit_count = fields.Integer(string='Kullanım Sayısı')
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'Aynı parametreler için tek önbellek girdisi olabilir.'),
+    ]
+
+    @api.model
+    def _make_key(self, params):
+        return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+    @api.model
+    def _get_ttl(self):
+        value = self.env['ir.config_parameter'].sudo().get_param(CACHE_TTL_PARAM)
+        return timedelta(minutes=int(value or DEFAULT_CACHE_TTL))
+
+    @api.model
+    def _get_size(self):
+        value = self.env['ir.config_parameter'].sudo().get_param(CACHE_SIZE_PARAM)
+        return int(value or DEFAULT_CACHE_SIZE)
+
+    @api.model
+    def _covered_range(self, params):
+        """Raporun okuduğu tarih aralığı: karşılaştırma dönemi rapor penceresinden önce başlar."""
+        date_from = fields.Date.to_date(params['date_from'])
+        date_to = fields.Date.to_date(params['date_to'])
+        comparison_mode = params.get('comparison_mode')
+        if comparison_mode and comparison_mode != 'none':
+            date_from = comparison_window(date_from, date_to, comparison_mode)[0]
+        return date_from, date_to
+
+    # ---------------------------- Okuma / Yazma ----------------------------
+    @api.model
+    def _lookup(self, key):
+        """Geçerli girdiyi döndürür ve kullanım bilgisini günceller; yoksa boş kayıt."""
+        entry = self.sudo().search([('key', '=', key)], limit=1)
+        if not entry:
+            return entry
+        if entry.create_date < fields.Datetime.now() - self._get_ttl():
+            entry.unlink()
+            return self.sudo().browse()
+        entry.write({'last_used': fields.Datetime.now(), 'hit_count': entry.hit_count + 1})
+        _logger.debug("Rapor önbelleği isabeti (%s)", key)
+        return entry
+
+    @api.model
+    def _store(self, key, params, report_data, excel_filename, excel_raw=None, excel_attachment=None):
+        """Rapor verisini ve Excel dosyasını saklar; sınırı aşan eski girdileri siler.
+
+        Excel ek dosya olarak üretildiyse (`excel_attachment`) girdi aynı filestore
+        dosyasını paylaşır; aksi halde `excel_raw` içeriği yeni ek olarak yazılır.
+        """
+        self = self.sudo()
+        self.search([('key', '=', key)]).unlink()
+        vals = {'name': excel_filename, 'res_model': self._name, 'mimetype': XLSX_MIMETYPE}
+        if excel_attachment:
+            attachment = share_file_attachment(self.env, excel_attachment, vals)
+        else:
+            attachment = self.env['ir.attachment'].create(dict(vals, raw=excel_raw))
+        covered_from, covered_to = self._covered_range(params)
+        try:
+            # Aynı raporu eşzamanlı üreten başka bir istek girdiyi önce yazmış olabilir
+            with self.env.cr.savepoint():
+                entry = self.create({
+                    'key': key,
+                    'date_from': params['date_from'],
+                    'date_to': params['date_to'],
+                    'covered_from': covered_from,
+                    'covered_to': covered_to,
+                    'parameters_json': json.dumps(params, default=str),
+                    'report_data': json.dumps(report_data.to_dict()),
+                    'attachment_id': attachment.id,
+                })
+        except psycopg2.IntegrityError:
+            attachment.unlink()
+            return self.browse()
+        attachment.res_id = entry.id
+        self._evict()
+        return entry
+
+    @api.model
+    def _evict(self):
+        """En uzun süredir kullanılmayan girdileri `cache_size` sınırına kadar siler."""
+        stale = self.sudo().search([], order='last_used desc, id desc', offset=self._get_size())
+        if stale:
+            stale.unlink()
+
+    def _load_report_data(self):
+        """Saklanan rapor verisini `ReportColumns` olarak döndürür."""
+        self.ensure_one()
+        return ReportColumns.from_dict(json.loads(self.report_data))
+
+    # ---------------------------- Geçersiz kılma ----------------------------
+    @api.model
+    def _invalidate_dates(self, dates, ranking_modes=None):
+        """Verilen tarihlerden herhangi birini kapsayan girdileri siler. `ranking_modes`
+        verilirse sadece bu sıralama modlarıyla üretilmiş girdiler silinir."""
+        if not dates:
+            return
+        entries = self.sudo().search([('covered_from', '<=', max(dates)), ('covered_to', '>=', min(dates))])
+        entries = entries.filtered(lambda entry: any(entry.covered_from <= date <= entry.covered_to for date in dates))
+        if ranking_modes:
+            entries = entries.filtered(
+                lambda entry: json.loads(entry.parameters_json or '{}').get('ranking_mode') in ranking_modes
+            )
+        if entries:
+            _logger.debug("%s rapor önbelleği girdisi geçersiz kılındı", len(entries))
+            entries.unlink()
+
+    @api.model
+    def _invalidate_all(self):
+        self.sudo().search([]).unlink()
+
+    @api.autovacuum
+    def _gc_expired_entries(self):
+        self.sudo().search([('create_date', '<', fields.Datetime.now() - self._get_ttl())]).unlink()
+
+    def unlink(self):
+        attachments = self.attachment_id
+        res = super().unlink()
+        attachments.unlink()
+        return res
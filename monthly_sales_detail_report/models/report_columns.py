@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+
+class ReportColumns:
+    """Aylık rapor sonucunu sütun bazlı tutan kompakt yapı.
+
+    Ay, kategori ve ürün değerleri boyut tablolarında bir kez saklanır (interning);
+    her satır bu tablolara işaret eden tamsayı indekslerden ve bir tutardan oluşur.
+    Sütunlar `array` ile tutulduğundan satır başına Python nesnesi oluşmaz.
+    `product` sütunundaki -1 kategori toplam satırını gösterir. `comparison`
+    sütunu karşılaştırma dönemi (geçen yıl / önceki ay) tutarını taşır;
+    karşılaştırma yoksa sıfırdır.
+
+    Satırlar `add` ile biriktirilir, `finalize` raporun satır sırasını kurar:
+    aylar sıralı, ay içinde kategoriler ilk görüldükleri sırada, her kategori
+    toplamının ardından ürün satırları.
+    """
+
+    TOTAL = -1
+    _COLUMNS = (('month', 'i'), ('category', 'i'), ('product', 'i'), ('amount', 'd'), ('comparison', 'd'))
+
+    def __init__(self):
+        # Boyut tabloları
+        self.months = []
+        self.category_ids = []
+        self.category_names = []
+        self.product_ids = []
+        self.product_names = []
+        self._month_index = {}
+        self._category_index = {}
+        self._product_index = {}
+        # Sütunlar
+        self.month = array('i')
+        self.category = array('i')
+        self.product = array('i')
+        self.amount = array('d')
+        self.comparison = array('d')
+        # Sadece biriktirme sırasında: (ay, kategori, ürün) anahtarı -> satır ve
+        # her satırın bağlı olduğu kategori toplam satırı
+        self._rows = {}
+        self._group = array('i')
+
+    def __len__(self):
+        return len(self.amount)
+
+    @property
+    def month_count(self):
+        return len(self.months)
+
+    @staticmethod
+    def _intern(index, values, value, names=None, name=None):
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(values)
+            values.append(value)
+            if names is not None:
+                names.append(name)
+        return position
+
+    @staticmethod
+    def _row_key(month_pos, category_pos, product_pos):
+        # Demet yerine tek tamsayı anahtar: biriktirme indeksinin bellek kullanımı düşer
+        return (((month_pos << 24) | category_pos) << 32) | (product_pos + 1)
+
+    def _accumulate(self, month_pos, category_pos, product_pos, amount, comparison, group=-1):
+        key = self._row_key(month_pos, category_pos, product_pos)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self.amount)
+            self._group.append(row if group < 0 else group)
+            self.month.append(month_pos)
+            self.category.append(category_pos)
+            self.product.append(product_pos)
+            self.amount.append(amount)
+            self.comparison.append(comparison)
+        else:
+            self.amount[row] += amount
+            self.comparison[row] += comparison
+        return row
+
+    def add(self, month, category_id, category_name, amount, product_id=None, product_name=None, comparison=0.0):
+        """Tutarı (ve karşılaştırma tutarını) kategori toplamına ve (verilmişse)
+        ürün satırına ekler."""
+        month_pos = self._intern(self._month_index, self.months, month)
+        category_pos = self._intern(
+            self._category_index, self.category_ids, category_id, self.category_names, category_name,
+        )
+        total_row = self._accumulate(month_pos, category_pos, self.TOTAL, amount, comparison)
+        if product_id:
+            product_pos = self._intern(
+                self._product_index, self.product_ids, product_id, self.product_names, product_name,
+            )
+            self._accumulate(month_pos, category_pos, product_pos, amount, comparison, total_row)
+
+    def add_ranked(self, month, category_id, category_name, amount, key_id, key_name):
+        """Kategori toplamının altına sıralama satırı ekler; toplam değişmez.
+        Satırlar sıralama sırasıyla eklenmelidir (bkz. `iter_ranks`)."""
+        month_pos = self._intern(self._month_index, self.months, month)
+        category_pos = self._intern(
+            self._category_index, self.category_ids, category_id, self.category_names, category_name,
+        )
+        total_row = self._accumulate(month_pos, category_pos, self.TOTAL, 0.0, 0.0)
+        key_pos = self._intern(self._product_index, self.product_ids, key_id, self.product_names, key_name)
+        self._accumulate(month_pos, category_pos, key_pos, amount, 0.0, total_row)
+
+    def finalize(self):
+        """Satırları rapor sırasına dizer ve biriktirme indeksini bırakır."""
+        self._rows = {}
+        # Satırlar eklenme sırasında olduğundan gruplar kendiliğinden sıralı dolar
+        month_totals = {month_pos: array('i') for month_pos in range(len(self.months))}
+        children = {}
+        for row, (product_pos, group) in enumerate(zip(self.product, self._group)):
+            if product_pos == self.TOTAL:
+                month_totals[self.month[row]].append(row)
+            else:
+                children.setdefault(group, array('i')).append(row)
+        order = array('i')
+        for month_pos in sorted(month_totals, key=self.months.__getitem__):
+            for total_row in month_totals[month_pos]:
+                order.append(total_row)
+                order.extend(children.get(total_row, ()))
+        for name, typecode in self._COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(typecode, (column[row] for row in order)))
+        self._group = array('i')
+        return self
+
+    def iter_rows(self):
+        """(ay, kategori id, kategori adı, ürün id, ürün adı, tutar, toplam mı) üretir."""
+        for month_pos, category_pos, product_pos, amount in zip(self.month, self.category, self.product, self.amount):
+            if product_pos == self.TOTAL:
+                product_id = product_name = None
+            else:
+                product_id, product_name = self.product_ids[product_pos], self.product_names[product_pos]
+            yield (
+                self.months[month_pos],
+                self.category_ids[category_pos], self.category_names[category_pos],
+                product_id, product_name,
+                amount, product_pos == self.TOTAL,
+            )
+
+    def iter_ranks(self):
+        """`iter_rows` sırasıyla satırın grup içindeki sırasını üretir (toplam satırında 0)."""
+        rank = 0
+        for product_pos in self.product:
+            rank = 0 if product_pos == self.TOTAL else rank + 1
+            yield rank
+
+    @staticmethod
+    def delta(amount, comparison):
+        """(fark, yüzde fark); karşılaştırma tutarı sıfırsa yüzde None"""
+        difference = amount - comparison
+        return difference, (difference / abs(comparison) * 100.0 if comparison else None)
+
+    def iter_comparisons(self):
+        """`iter_rows` sırasıyla (karşılaştırma tutarı, fark, yüzde fark) üretir."""
+        for amount, comparison in zip(self.amount, self.comparison):
+            yield (comparison,) + self.delta(amount, comparison)
+
+    def to_dict(self):
+        """JSON ile saklanabilir sütun bazlı gösterim"""
+        return {
+            'months': self.months,
+            'category_ids': self.category_ids,
+            'category_names': self.category_names,
+            'product_ids': self.product_ids,
+            'product_names': self.product_names,
+            'month': self.month.tolist(),
+            'category': self.category.tolist(),
+            'product': self.product.tolist(),
+            'amount': self.amount.tolist(),
+            'comparison': self.comparison.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        columns = cls()
+        for name in ('months', 'category_ids', 'category_names', 'product_ids', 'product_names'):
+            setattr(columns, name, values[name])
+        values.setdefault('comparison', [0.0] * len(values['amount']))
+        for name, typecode in cls._COLUMNS:
+            setattr(columns, name, array(typecode, values[name]))
+        return columns
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.modules import module as odoo_module
+import logging
+
+from .month_partition import get_worker_count, run_partitioned, split_months
+
+_logger = logging.getLogger(__name__)
+
+
+class MonthlySalesReportJob(models.Model):
+    """Arka planda çalışan rapor işi.
+
+    Büyük raporlar HTTP isteği içinde `limit_time_real` sınırına takılmasın diye
+    sihirbaz işi kuyruğa alır; `ir_cron_report_jobs` zamanlanmış eylemi işi
+    sihirbazı oluşturan kullanıcı adına çalıştırır. İlerleme (tamamlanan ay / toplam
+    ay) her ay parçasından sonra ayrı bir imleçle sadece iş kaydına yazılır; rapor
+    işlemi (eski satırların silinmesi, yeni satırlar) iş bitene kadar onaylanmaz.
+    Bitince Excel dosyası işe eklenir.
+    """
+    _name = 'monthly.sales.report.job'
+    _description = 'Arka Plan Rapor İşi'
+    _order = 'id desc'
+
+    name = fields.Char(string='Rapor', required=True)
+    report_model = fields.Char(string='Rapor Modeli', required=True)
+    report_res_id = fields.Integer(string='Rapor ID', required=True)
+    user_id = fields.Many2one('res.users', string='Kullanıcı', required=True, default=lambda self: self.env.user)
+    company_ids = fields.Many2many('res.company', string='Şirketler')
+    state = fields.Selection([
+        ('queued', 'Kuyrukta'),
+        ('running', 'Çalışıyor'),
+        ('done', 'Tamamlandı'),
+        ('failed', 'Hata'),
+    ], string='Durum', default='queued', required=True)
+    progress_done = fields.Integer(string='Tamamlanan Ay')
+    progress_total = fields.Integer(string='Toplam Ay')
+    progress = fields.Float(string='İlerleme (%)', compute='_compute_progress')
+    date_start = fields.Datetime(string='Başlangıç')
+    date_end = fields.Datetime(string='Bitiş')
+    error = fields.Text(string='Hata')
+    attachment_id = fields.Many2one('ir.attachment', string='Excel Dosyası', readonly=True)
+
+    @api.depends('progress_done', 'progress_total')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = (job.progress_done * 100.0 / job.progress_total) if job.progress_total else 0.0
+
+    def _commit(self):
+        """İş durumunun sihirbazdan görülebilmesi için işlemi onaylar (testlerde onaylamaz)."""
+        if not odoo_module.current_test:
+            self.env.cr.commit()
+
+    def _update_progress(self, done, total):
+        """İlerlemeyi ayrı imleçte yazıp onaylar; çalışan rapor işlemine dokunmaz."""
+        with self.env.registry.cursor() as cr:
+            self.with_env(self.env(cr=cr)).write({'progress_done': done, 'progress_total': total})
+        self.invalidate_recordset(['progress_done', 'progress_total'])
+
+    def _trigger_cron(self):
+        self.env.ref('monthly_sales_detail_report.ir_cron_report_jobs').sudo()._trigger()
+
+    @api.model
+    def _cron_process_jobs(self, limit=10):
+        """Kuyruktaki işleri sırayla çalıştırır"""
+        for job in self.search([('state', '=', 'queued')], order='id', limit=limit):
+            job._process()
+
+    def _process(self):
+        self.ensure_one()
+        self.write({'state': 'running', 'date_start': fields.Datetime.now(), 'progress_done': 0, 'error': False})
+        self._commit()
+        try:
+            attachment = self._run()
+            # Rapor tamamlandı; iş kaydı ilerleme yazan imleçle çakışmasın diye yeni işlemde güncellenir
+            self._commit()
+            self._finish(attachment)
+        except Exception as error:
+            _logger.exception("Rapor işi %s başarısız oldu", self.id)
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error': str(error), 'date_end': fields.Datetime.now()})
+        self._commit()
+
+    def _run(self):
+        """Sihirbazı kullanıcı ve şirket bağlamıyla çalıştırır; üretilen dosyayı (ek) döndürür."""
+        wizard = self.env[self.report_model].browse(self.report_res_id).exists()
+        if not wizard:
+            raise UserError(_("Rapor sihirbazı bulunamadı; süresi dolmuş olabilir."))
+        wizard = wizard.with_user(self.user_id).with_context(
+            allowed_company_ids=self.company_ids.ids or None, report_job_id=self.id,
+        )
+        return wizard._run_report_job()
+
+    def _finish(self, attachment):
+        """İşi tamamlandı olarak işaretler ve dosyayı işe bağlar."""
+        vals = {'state': 'done', 'date_end': fields.Datetime.now(), 'progress_done': self.progress_total}
+        if attachment:
+            # Dosya işe bağlanır; geçici sihirbaz temizlendiğinde silinmez
+            attachment.sudo().write({'res_model': self._name, 'res_id': self.id})
+            vals['attachment_id'] = attachment.id
+        self.write(vals)
+        _logger.debug("Rapor işi %s tamamlandı (%s)", self.id, self.report_model)
+
+
+class MonthlySalesReportJobMixin(models.AbstractModel):
+    """Rapor sihirbazlarına arka plan çalıştırma ve ay parçalı okuma ekleyen mixin."""
+    _name = 'monthly.sales.report.job.mixin'
+    _description = 'Arka Plan Rapor Mixin'
+
+    job_id = fields.Many2one('monthly.sales.report.job', string='Arka Plan İşi', readonly=True)
+    job_state = fields.Selection(related='job_id.state', string='İş Durumu')
+    job_progress = fields.Float(related='job_id.progress', string='İlerleme')
+    job_error = fields.Text(related='job_id.error', string='İş Hatası')
+
+    def _read_partitioned(self, date_from, date_to, func):
+        """`func(env, başlangıç, bitiş)` ile okunan satırları döndürür.
+
+        Arka plan işinde aylar sırayla okunur ve her aydan sonra ilerleme kaydedilir;
+        `parallel_months` açıksa aylar paralel okunur; aksi halde tek sorgu çalışır.
+        """
+        job = self.env['monthly.sales.report.job'].browse(self.env.context.get('report_job_id'))
+        if job:
+            return run_partitioned(self.env, date_from, date_to, func, 1, progress=job.sudo()._update_progress)
+        if self.parallel_months:
+            return run_partitioned(self.env, date_from, date_to, func, get_worker_count(self.env))
+        return func(self.env, date_from, date_to)
+
+    def _run_report_job(self):
+        """Arka plan işinde raporu üretir; işe eklenecek dosyayı (ek) döndürür."""
+        self.generate_report()
+        return self.env['ir.attachment']
+
+    def _get_report_title(self):
+        """Rapor penceresi ve arka plan işi başlığı"""
+        return self._description
+
+    def _reopen_job_form(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self._get_report_title(),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_generate_report_async(self):
+        """Raporu arka plan işi olarak kuyruğa alır"""
+        self.ensure_one()
+        if self.job_id.state in ('queued', 'running'):
+            raise UserError(_("Bu rapor için çalışan bir arka plan işi zaten var."))
+        self.job_id = self.env['monthly.sales.report.job'].sudo().create({
+            'name': self._get_report_title(),
+            'report_model': self._name,
+            'report_res_id': self.id,
+            'user_id': self.env.uid,
+            'company_ids': [(6, 0, self.env.companies.ids)],
+            'progress_total': len(split_months(self.date_from, self.date_to)),
+        })
+        self.job_id._trigger_cron()
+        return self._reopen_job_form()
+
+    def action_refresh_job(self):
+        """Sihirbazı yeniden açarak iş durumunu günceller"""
+        self.ensure_one()
+        return self._reopen_job_form()
+
+    def action_download_job_file(self):
+        self.ensure_one()
+        if not self.job_id.attachment_id:
+            raise UserError(_("İş henüz tamamlanmadı."))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.job_id.attachment_id.id,
+            'target': 'self',
+        }
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+from odoo.models import MAGIC_COLUMNS
+from odoo.tools import split_every
+import logging
+
+_logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 1000
+
+
+class MonthlySalesReportLineMixin(models.AbstractModel):
+    """Rapor sihirbazlarının geçici satır modelleri için toplu yazma/silme.
+
+    Rapor satırları sadece sihirbazın kendi verisidir: hesaplanan alan, bağımlılık,
+    kural veya ek dosya içermez. Bu yüzden ORM'in kayıt başına `create`/`unlink`
+    mantığı yerine satırlar çok satırlı INSERT ile yazılır, `report_id` ile tek
+    DELETE sorgusunda silinir; ardından model ve sihirbazın One2many önbelleği
+    geçersiz kılınır. Satır modelinde `report_id` alanı bulunmalıdır.
+    """
+    _name = 'monthly.sales.report.line.mixin'
+    _description = 'Rapor Satırı Toplu Yazma Mixin'
+
+    def _invalidate_report_lines(self):
+        """Satır modelinin ve sihirbazdaki bu modele bağlı One2many alanlarının önbelleğini temizler."""
+        self.invalidate_model()
+        report_model = self.env[self._fields['report_id'].comodel_name]
+        report_model.invalidate_model([
+            name for name, field in report_model._fields.items()
+            if field.type == 'one2many' and field.comodel_name == self._name
+        ])
+
+    @api.model
+    def _bulk_create(self, vals_list):
+        """Satırları çok satırlı INSERT ile yazar ve oluşturulan kayıtları döndürür.
+
+        Değerler ORM ile aynı şekilde `convert_to_column` ile sütun biçimine
+        çevrilir. Verilmeyen saklı alanlar ORM `create` gibi `default_get` ile
+        (alan varsayılanları ve bağlamdaki `default_*` değerleri) doldurulur.
+        """
+        if not vals_list:
+            return self.browse()
+        self.check_access_rights('create')
+        self.flush_model()
+
+        column_names = [
+            name for name, field in self._fields.items()
+            if field.store and field.column_type and name not in MAGIC_COLUMNS
+        ]
+        # Varsayılanlar bir kez hesaplanır; satırda verilen değer varsayılanı ezer
+        defaults = self.default_get(column_names)
+        names = sorted({name for vals in vals_list for name in vals if name in column_names} | set(defaults))
+        fields_ = [self._fields[name] for name in names]
+        now = self.env.cr.now()
+        columns = ', '.join('"%s"' % name for name in names + ['create_uid', 'create_date', 'write_uid', 'write_date'])
+        magic = (self.env.uid, now, self.env.uid, now)
+
+        ids = []
+        for batch in split_every(INSERT_BATCH_SIZE, vals_list):
+            rows = [
+                tuple(
+                    field.convert_to_column(vals.get(field.name, defaults.get(field.name)), self, vals)
+                    for field in fields_
+                ) + magic
+                for vals in batch
+            ]
+            self.env.cr.execute(
+                'INSERT INTO "{}" ({}) VALUES {} RETURNING id'.format(self._table, columns, ', '.join(['%s'] * len(rows))),
+                rows,
+            )
+            ids.extend(row[0] for row in self.env.cr.fetchall())
+
+        self._invalidate_report_lines()
+        _logger.debug("%s tablosuna %s satır toplu yazıldı", self._table, len(ids))
+        return self.browse(ids)
+
+    @api.model
+    def _bulk_unlink_reports(self, report_ids):
+        """Verilen sihirbazlara ait tüm satırları tek DELETE sorgusuyla siler."""
+        if not report_ids:
+            return
+        self.check_access_rights('unlink')
+        self.flush_model()
+        self.env.cr.execute(
+            'DELETE FROM "{}" WHERE report_id IN %s'.format(self._table), [tuple(report_ids)],
+        )
+        self._invalidate_report_lines()
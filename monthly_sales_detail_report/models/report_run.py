@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from contextlib import contextmanager
+import json
+import logging
+import re
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+STORE_RUNS_PARAM = 'monthly_sales_detail_report.store_runs'
+
+INSERT_TABLE_RE = re.compile(r'^\s*INSERT\s+INTO\s+"?(\w+)"?', re.IGNORECASE)
+
+
+class ReportProbe:
+    """Bir rapor çalıştırmasının ölçüm verilerini toplar.
+
+    SQL sorguları Odoo'nun thread bazlı `query_hooks` kancasıyla sayılır; böylece
+    sorgu sayısı, SQL süresi ve SELECT sorgularının döndürdüğü satır sayısı
+    ORM'in kendi sorguları dahil ölçülür. `line_tables` tablolarına yapılan
+    INSERT'ler geçici satır sayısına eklenir. Fazlar (`phase`) için duvar saati,
+    SQL süresi ve aradaki fark olarak Python süresi tutulur.
+    """
+
+    def __init__(self, cr, line_tables=()):
+        self.cr = cr
+        self.line_tables = set(line_tables)
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.rows_fetched = 0
+        self.rows_created = {}
+        self.phases = []
+        self._hooked = False
+        self._sql_log_start = cr.sql_log_count
+
+    # Odoo her sorgudan sonra kancayı (cr, query, params, start, delay) ile çağırır
+    def _query_hook(self, cr, query, params, start, delay, *args):
+        self.query_count += 1
+        self.sql_time += delay
+        if cr.rowcount <= 0:
+            return
+        if cr.description is not None and not str(query).lstrip().upper().startswith('INSERT'):
+            self.rows_fetched += cr.rowcount
+            return
+        match = INSERT_TABLE_RE.match(str(query))
+        if match and match.group(1) in self.line_tables:
+            self.count_created(match.group(1), cr.rowcount)
+
+    def start(self):
+        thread = threading.current_thread()
+        if not hasattr(thread, 'query_hooks'):
+            thread.query_hooks = []
+        thread.query_hooks.append(self._query_hook)
+        self._hooked = True
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.wall_time = time.perf_counter() - self._start
+        if self._hooked:
+            threading.current_thread().query_hooks.remove(self._query_hook)
+            self._hooked = False
+        if not self.query_count:
+            # Kanca desteklenmiyorsa en azından imleç sayacını kullan
+            self.query_count = self.cr.sql_log_count - self._sql_log_start
+
+    @contextmanager
+    def phase(self, name):
+        """Bir fazın süresini, sorgu sayısını ve getirilen satırlarını ölçer."""
+        start, queries, sql_time, rows = time.perf_counter(), self.query_count, self.sql_time, self.rows_fetched
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - start
+            phase_sql = self.sql_time - sql_time
+            self.phases.append({
+                'name': name,
+                'wall_time': round(wall, 4),
+                'sql_time': round(phase_sql, 4),
+                'python_time': round(max(wall - phase_sql, 0.0), 4),
+                'queries': self.query_count - queries,
+                'rows_fetched': self.rows_fetched - rows,
+            })
+
+    def count_created(self, table, count):
+        """Geçici satır tablolarına yazılan kayıt sayısını ekler."""
+        self.rows_created[table] = self.rows_created.get(table, 0) + count
+
+    def to_dict(self):
+        return {
+            'wall_time': round(self.wall_time, 4),
+            'sql_time': round(self.sql_time, 4),
+            'python_time': round(max(self.wall_time - self.sql_time, 0.0), 4),
+            'query_count': self.query_count,
+            'rows_fetched': self.rows_fetched,
+            'rows_created': sum(self.rows_created.values()),
+            'rows_created_by_table': self.rows_created,
+            'phases': self.phases,
+        }
+
+
+class MonthlySalesReportRun(models.Model):
+    """Rapor çalıştırma ölçümleri. Sadece `monthly_sales_detail_report.store_runs`
+    sistem parametresi açıkken kaydedilir; her durumda yapılandırılmış log yazılır.
+    """
+    _name = 'monthly.sales.report.run'
+    _description = 'Rapor Çalıştırma Ölçümü'
+    _order = 'id desc'
+
+    name = fields.Char(string='Giriş Noktası', required=True)
+    report_model = fields.Char(string='Rapor Modeli', required=True)
+    report_res_id = fields.Integer(string='Rapor ID')
+    user_id = fields.Many2one('res.users', string='Kullanıcı', default=lambda self: self.env.user)
+    date_start = fields.Datetime(string='Başlangıç', default=fields.Datetime.now)
+    wall_time = fields.Float(string='Süre (sn)', digits=(16, 4))
+    sql_time = fields.Float(string='SQL Süresi (sn)', digits=(16, 4))
+    python_time = fields.Float(string='Python Süresi (sn)', digits=(16, 4))
+    query_count = fields.Integer(string='Sorgu Sayısı')
+    rows_fetched = fields.Integer(string='Okunan Satır')
+    rows_created = fields.Integer(string='Yazılan Geçici Satır')
+    phases_json = fields.Text(string='Fazlar (JSON)')
+    parameters_json = fields.Text(string='Parametreler (JSON)')
+
+    @api.model
+    def _store_enabled(self):
+        return self.env['ir.config_parameter'].sudo().get_param(STORE_RUNS_PARAM) in ('1', 'True', 'true')
+
+
+class MonthlySalesReportInstrumentation(models.AbstractModel):
+    """Rapor sihirbazlarının giriş noktalarını ölçen mixin."""
+    _name = 'monthly.sales.report.instrumentation'
+    _description = 'Rapor Ölçüm Mixin'
+
+    def _get_probe_line_tables(self):
+        """Sihirbazın One2many ile bağlı geçici satır tabloları"""
+        return {
+            self.env[field.comodel_name]._table
+            for field in self._fields.values()
+            if field.type == 'one2many' and self.env[field.comodel_name]._transient
+        }
+
+    def _get_probe_parameters(self):
+        """Ölçüm kaydına eklenecek filtre parametreleri"""
+        return {
+            'date_from': fields.Date.to_string(self.date_from),
+            'date_to': fields.Date.to_string(self.date_to),
+            'currency': self.currency_id.name,
+        }
+
+    @contextmanager
+    def _report_probe(self, entry_point):
+        """Giriş noktasını ölçer; bitince yapılandırılmış log yazar ve
+        açıksa `monthly.sales.report.run` kaydı oluşturur."""
+        self.ensure_one()
+        probe = ReportProbe(self.env.cr, self._get_probe_line_tables())
+        probe.start()
+        try:
+            yield probe
+        finally:
+            probe.stop()
+            payload = dict(probe.to_dict(), entry_point=entry_point, report_model=self._name, report_id=self.id)
+            _logger.info("REPORT_RUN %s", json.dumps(payload), extra={'report_run': payload})
+
+        Run = self.env['monthly.sales.report.run'].sudo()
+        if Run._store_enabled():
+            Run.create({
+                'name': entry_point,
+                'report_model': self._name,
+                'report_res_id': self.id,
+                'wall_time': payload['wall_time'],
+                'sql_time': payload['sql_time'],
+                'python_time': payload['python_time'],
+                'query_count': payload['query_count'],
+                'rows_fetched': payload['rows_fetched'],
+                'rows_created': payload['rows_created'],
+                'phases_json': json.dumps(payload['phases'], indent=2),
+                'parameters_json': json.dumps(self._get_probe_parameters(), indent=2),
+            })
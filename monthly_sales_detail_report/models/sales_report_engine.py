@@ -0,0 +1,1269 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+import io
+import json
+import xlsxwriter
+import base64
+import logging
+
+from .category_tree import CategoryResolver
+from .cost_history import ProductCostHistory
+from .currency_rate_table import CurrencyRateTable
+from .file_attachment import XLSX_MIMETYPE, create_file_attachment, share_file_attachment
+from .margin import compute_line_margins
+from .report_columns import ReportColumns
+
+_logger = logging.getLogger(__name__)
+
+
+class MonthlySalesReportEngine(models.AbstractModel):
+    """Kategori/ürün bazlı satış rapor sihirbazlarının ortak motoru.
+
+    Veri erişimi (özet tablo, drill-down özeti), kur çevrimi, toplama, sayfalama,
+    sonuç önbelleği, arka plan işi ve Excel export burada bir kez tanımlıdır.
+    Sihirbazlar sadece yapılandırmadır: `_name`, `_description` ve `report_lines`,
+    `daily_lines`, `invoice_lines` One2many alanlarını tanımlarlar; satır modelleri
+    aşağıdaki satır mixin'lerinden türer. Pencere başlığı `_get_report_title`
+    (varsayılan `_description`), Excel sayfa ve dosya adı `_excel_sheet_name` /
+    `_excel_filename_prefix` ile değiştirilebilir.
+    """
+    _name = 'monthly.sales.report.engine'
+    _inherit = ['monthly.sales.report.instrumentation', 'monthly.sales.report.job.mixin']
+    _description = 'Satış Rapor Motoru'
+
+    _excel_sheet_name = 'Kategori Urun Satis Raporu'
+    _excel_filename_prefix = 'kategori_urun_satis_raporu'
+
+    # === Filtre alanları ===
+    date_from = fields.Date(
+        string='Start Date',
+        required=True,
+        default=lambda self: fields.Date.context_today(self).replace(day=1)
+    )
+    date_to = fields.Date(
+        string='End Date',
+        required=True,
+        default=lambda self: fields.Date.context_today(self)
+    )
+    category_ids = fields.Many2many(
+        'product.category',
+        string='Product Categories',
+        help="Boş bırakırsanız tüm kategoriler dahil edilir"
+    )
+    product_ids = fields.Many2many(
+        'product.product',
+        string='Specific Products',
+        help="Opsiyonel: Belirli ürünleri ayrıca analiz etmek için seçin"
+    )
+    include_subcategories = fields.Boolean(
+        string='Include Subcategories',
+        default=True,
+        help="Seçilen kategorilerin alt kategorilerini de dahil et"
+    )
+    rollup_subcategories = fields.Boolean(
+        string='Alt Kategorileri Üst Kategoride Topla',
+        help="Alt kategori satışları ayrı satır yerine seçilen üst kategorinin "
+             "toplamına eklenir"
+    )
+    comparison_mode = fields.Selection([
+        ('none', 'Karşılaştırma Yok'),
+        ('previous_year', 'Geçen Yıl (YoY)'),
+        ('previous_month', 'Önceki Ay (MoM)'),
+    ], string='Karşılaştırma', default='none', required=True,
+        help="Her ay/kategori/ürün satırı geçen yılın aynı ayı veya önceki ay ile "
+             "karşılaştırılır; iki dönem tek sorguda okunur.")
+    ranking_mode = fields.Selection([
+        ('none', 'Sıralama Yok'),
+        ('product', 'En Çok Satan Ürünler'),
+        ('customer', 'En Çok Alan Müşteriler'),
+        ('salesperson', 'En Çok Satan Temsilciler'),
+    ], string='Sıralama', default='none', required=True,
+        help="Her ay ve kategori için ilk N ürün, müşteri veya satış temsilcisi "
+             "kategori toplamının altında listelenir. Sıralama veritabanında yapılır.")
+    ranking_limit = fields.Integer(string='Sıralama Sayısı (N)', default=10)
+    currency_id = fields.Many2one(
+        'res.currency',
+        string='Target Currency',
+        required=True,
+        default=lambda self: (
+            self.env.ref('base.USD', raise_if_not_found=False)
+            or self.env.company.currency_id
+        )
+    )
+
+    # === Navigation ve Drill-Down ===
+    detail_level = fields.Selection([
+        ('monthly', 'Aylık Özet'),
+        ('daily', 'Günlük Detay'),
+        ('invoice', 'Fatura Detayı')
+    ], string='Detay Seviyesi', default='monthly')
+    
+    selected_month = fields.Char(string='Seçilen Ay', help="Drill-down için seçilen ay (YYYY-MM)")
+    selected_date = fields.Date(string='Seçilen Gün', help="Drill-down için seçilen tarih")
+    selected_category_id = fields.Many2one('product.category', string='Seçilen Kategori')
+    
+    # Navigation breadcrumb için
+    breadcrumb_text = fields.Char(string='Breadcrumb', compute='_compute_breadcrumb')
+
+    # === Sayfalama ===
+    # Drill-down seviyelerinde sadece görünen sayfa hesaplanır ve satır olarak yazılır.
+    # Anahtar listeleri (gün/kategori çiftleri, fatura id'leri) bir kez hesaplanıp saklanır;
+    # aynı seçime geri dönüldüğünde yeniden hesaplanmaz.
+    page_size = fields.Integer(string='Sayfa Boyutu', default=80)
+    daily_keys = fields.Text(string='Günlük Anahtarlar')  # JSON: [["YYYY-MM-DD", categ_id], ...]
+    daily_keys_scope = fields.Char(string='Günlük Kapsam')  # "YYYY-MM|categ_id"
+    daily_page = fields.Integer(string='Günlük Sayfa', default=0)
+    daily_page_info = fields.Char(string='Günlük Sayfa Bilgisi', compute='_compute_page_info')
+    invoice_keys = fields.Text(string='Fatura Anahtarları')  # JSON: [invoice_id, ...]
+    invoice_keys_scope = fields.Char(string='Fatura Kapsamı')  # "YYYY-MM-DD|categ_id"
+    invoice_page = fields.Integer(string='Fatura Sayfası', default=0)
+    invoice_page_info = fields.Char(string='Fatura Sayfa Bilgisi', compute='_compute_page_info')
+    # Gün × kategori × fatura kırılımı; ilk drill-down'da rapor penceresi tek geçişte
+    # taranarak oluşturulur, sonraki tüm drill-down'lar buradan beslenir.
+    rollup_data = fields.Text(string='Drill-down Özeti')  # JSON: {"YYYY-MM-DD": {categ_id: {invoice_id: tutar}}}
+    # Genişletilmiş kategori kümesi; rapor üretiminde bir kez çözülür, drill-down'larda yeniden kullanılır
+    category_map = fields.Text(string='Kategori Eşlemesi')  # JSON: {categ_id: seçili üst kategori id}
+
+    # === Rapor sonucu ===
+    excel_file = fields.Binary(string='Excel File')
+    excel_filename = fields.Char(string='Excel Filename')
+    excel_export_mode = fields.Selection([
+        ('binary', 'Sihirbaz Alanı'),
+        ('attachment', 'Ek Dosya (Düşük Bellek)'),
+    ], string='Excel Modu', default='binary', required=True,
+        help="Ek Dosya modu büyük raporlar için dosyayı satır satır diske yazar ve "
+             "belleğe okumadan, base64'e çevirmeden filestore'a ek dosya olarak taşır.")
+    excel_attachment_id = fields.Many2one('ir.attachment', string='Excel Ek Dosyası', readonly=True)
+    use_cache = fields.Boolean(
+        string='Önbelleği Kullan',
+        default=True,
+        help="Aynı filtrelerle kısa süre önce üretilmiş rapor ve Excel dosyası yeniden "
+             "hesaplanmadan önbellekten getirilir. Kapsanan tarihlerde fatura değişirse "
+             "önbellek otomatik geçersiz olur."
+    )
+    parallel_months = fields.Boolean(
+        string='Aylara Bölerek Paralel Hesapla',
+        help="Uzun tarih aralıklarında toplamlar her ay için ayrı veritabanı bağlantısında "
+             "paralel okunur ve birleştirilir. Sonuç seri hesaplamayla aynıdır."
+    )
+    # === Computed Fields ===
+    @api.depends('detail_level', 'selected_month', 'selected_date', 'selected_category_id')
+    def _compute_breadcrumb(self):
+        """Navigasyon için breadcrumb hesaplar"""
+        for record in self:
+            breadcrumb = "Ana Rapor"
+            if record.detail_level == 'daily' and record.selected_month:
+                breadcrumb += f" > {record.selected_month} Detayları"
+                if record.selected_category_id:
+                    breadcrumb += f" > {record.selected_category_id.name}"
+            elif record.detail_level == 'invoice' and record.selected_date:
+                breadcrumb += f" > {record.selected_month} > {record.selected_date.strftime('%d.%m.%Y')} Faturaları"
+                if record.selected_category_id:
+                    breadcrumb += f" > {record.selected_category_id.name}"
+            record.breadcrumb_text = breadcrumb
+
+    @api.depends('daily_keys', 'daily_page', 'invoice_keys', 'invoice_page', 'page_size')
+    def _compute_page_info(self):
+        """Sayfalama için 'sayfa / toplam sayfa (kayıt)' bilgisini hesaplar"""
+        for record in self:
+            record.daily_page_info = record._format_page_info(record._load_keys('daily_keys'), record.daily_page)
+            record.invoice_page_info = record._format_page_info(record._load_keys('invoice_keys'), record.invoice_page)
+
+    def _format_page_info(self, keys, page):
+        page_count = self._get_page_count(keys)
+        return f"{min(page + 1, page_count)} / {page_count} ({len(keys)} kayıt)"
+
+    def _get_line_model(self, field_name):
+        """Sihirbazın One2many alanına bağlı satır modeli"""
+        return self.env[self._fields[field_name].comodel_name]
+
+    def _get_probe_parameters(self):
+        params = super()._get_probe_parameters()
+        params.update({
+            'category_ids': self.category_ids.ids,
+            'product_count': len(self.product_ids),
+            'include_subcategories': self.include_subcategories,
+            'excel_export_mode': self.excel_export_mode,
+            'parallel_months': self.parallel_months,
+            'use_cache': self.use_cache,
+        })
+        return params
+
+    # ---------------------------- Helpers ----------------------------
+    def _get_category_resolver(self):
+        """Seçilen kategorilerin (alt kategoriler açıksa `parent_path` ile
+        genişletilmiş) çözümleyicisini döndürür. Sonuç sihirbazda saklanır;
+        drill-down'larda kategori ağacı yeniden taranmaz. Hiç seçim yoksa tüm
+        kategoriler döner.
+        """
+        self.ensure_one()
+        if self.category_map:
+            return CategoryResolver.from_json(json.loads(self.category_map))
+        resolver = CategoryResolver.load(self.env, self.category_ids.ids, self.include_subcategories)
+        self.category_map = json.dumps(resolver.to_json())
+        return resolver
+
+    def _get_selected_categories(self):
+        """Seçilen kategorileri (alt kategoriler açıksa genişletilmiş) döndürür."""
+        return self.env['product.category'].browse(self._get_category_resolver().ids)
+
+    def _get_report_category(self, resolver, categ_id):
+        """Satırın raporda gösterileceği kategori: toplama açıksa seçili üst kategori"""
+        return resolver.top(categ_id) if self.rollup_subcategories else categ_id
+
+    def _get_product_scope(self, selected_category_id=None):
+        """Ürün havuzunu ürün id listesi oluşturmadan tarif eder: (ürün id'leri, kategori id'leri).
+
+        Belirli ürünler seçildiyse sadece onların id'leri döner. Aksi halde kategori
+        id'leri döner (kategori seçilmediyse None: kategori koşulu yok); sorgular
+        ürünleri `product_template.categ_id` ve aktif ürün alt sorgusuyla süzer.
+        """
+        if self.product_ids:
+            return self.product_ids.ids, None
+        resolver = self._get_category_resolver()
+        if selected_category_id:
+            if self.rollup_subcategories:
+                return None, resolver.members(selected_category_id)
+            return None, [selected_category_id] if selected_category_id in resolver else []
+        return None, resolver.ids if self.category_ids else None
+
+    def _get_cache_parameters(self):
+        """Sonuç önbelleği anahtarı için normalize edilmiş filtre kümesi"""
+        return {
+            'report': self._name,
+            'date_from': fields.Date.to_string(self.date_from),
+            'date_to': fields.Date.to_string(self.date_to),
+            'category_ids': sorted(self._get_category_resolver().ids),
+            'product_ids': sorted(self.product_ids.ids),
+            'include_subcategories': self.include_subcategories,
+            'rollup_subcategories': self.rollup_subcategories,
+            'comparison_mode': self.comparison_mode,
+            'ranking_mode': self.ranking_mode,
+            'ranking_limit': self.ranking_limit,
+            'currency_id': self.currency_id.id,
+            'company_ids': sorted(self.env.companies.ids),
+            'lang': self.env.lang,
+            'format': 'columns',
+        }
+
+    def _get_rate_table(self, currency_ids, company_ids, date_to=None):
+        """Rapor penceresindeki kurları toplu yükleyen çevrim tablosunu döndürür."""
+        return CurrencyRateTable(
+            self.env, self.currency_id, currency_ids, company_ids, date_to or self.date_to,
+        )
+
+    def _query_sales_totals(self, date_from, date_to, product_ids, categ_ids, group_by_product=False,
+                            comparison_mode=None):
+        """Gün, kategori, (isteğe bağlı) ürün, kaynak para birimi ve şirket bazında
+        satış toplamlarını döndürür. Fatura satırları yeniden taranmaz; veriler
+        onaylamada güncellenen `monthly.sales.aggregate` tablosundan okunur.
+        Ürün havuzu `_get_product_scope` ile verilir. `comparison_mode` verilirse
+        karşılaştırma dönemi aynı taramada `comparison_amount` olarak okunur.
+        Kur çevrimi gün bazında yapılabilsin diye gruplama gün seviyesindedir.
+        Arka plan işinde veya `parallel_months` açıkken aralık aylara bölünerek okunur.
+        """
+        company_ids = self.env.companies.ids
+
+        def read_totals(env, start, end):
+            return env['monthly.sales.aggregate'].sudo()._read_totals(
+                start, end, company_ids, product_ids=product_ids, categ_ids=categ_ids,
+                group_by_product=group_by_product, comparison_mode=comparison_mode,
+            )
+
+        return self._read_partitioned(date_from, date_to, read_totals)
+
+    # Rapor penceresindeki gelir satırlarını gün, kategori, fatura, şirket ve kaynak
+    # para birimi bazında tek geçişte toplayan sorgu (filtreler özet tabloyla aynıdır)
+    _ROLLUP_QUERY = """
+        SELECT aml.date AS date,
+               pt.categ_id AS categ_id,
+               aml.move_id AS move_id,
+               aml.company_id AS company_id,
+               COALESCE(aml.currency_id, aml.company_currency_id) AS currency_id,
+               SUM(ABS(CASE WHEN aml.currency_id IS NOT NULL
+                            THEN aml.amount_currency
+                            ELSE aml.balance END)) AS amount
+          FROM account_move_line aml
+          JOIN account_move am ON am.id = aml.move_id
+          JOIN account_account aa ON aa.id = aml.account_id
+          JOIN product_product pp ON pp.id = aml.product_id
+          JOIN product_template pt ON pt.id = pp.product_tmpl_id
+         WHERE am.move_type IN ('out_invoice', 'out_refund')
+           AND am.state = 'posted'
+           AND aml.parent_state = 'posted'
+           AND aa.account_type IN ('income', 'other_income')
+           AND aml.date >= %s
+           AND aml.date <= %s
+           AND aml.company_id IN %s
+           AND {product_filter}
+      GROUP BY 1, 2, 3, 4, 5
+    """
+
+    def _rollup_query(self):
+        """Drill-down özeti sorgusu ve parametreleri: (sql, params)"""
+        product_ids, categ_ids = self._get_product_scope()
+        product_filter, filter_params = self.env['monthly.sales.aggregate']._product_scope_filter(
+            product_ids, categ_ids, 'aml.product_id', 'pt.categ_id',
+        )
+        params = [self.date_from, self.date_to, tuple(self.env.companies.ids)] + filter_params
+        return self._ROLLUP_QUERY.format(product_filter=product_filter), params
+
+    def _build_rollups(self):
+        """Rapor penceresini tek sorguda tarayıp gün × kategori × fatura kırılımını üretir.
+        Günlük toplamlar ve fatura sayıları, fatura listeleri ve ay bazlı gün anahtarları
+        bu tek yapıdan türetilir; kur çevrimi her grup için bir kez yapılır.
+        """
+        self.env.flush_all()
+        self.env.cr.execute(*self._rollup_query())
+        rows = self.env.cr.dictfetchall()
+        resolver = self._get_category_resolver()
+
+        rate_table = self._get_rate_table(
+            {row['currency_id'] for row in rows}, {row['company_id'] for row in rows},
+        )
+        amounts = rate_table.convert_many(
+            (row['amount'], row['currency_id'], row['company_id'], row['date']) for row in rows
+        )
+
+        rollups = {}
+        for row, amount in zip(rows, amounts):
+            categ_key = str(self._get_report_category(resolver, row['categ_id']))
+            invoices = rollups.setdefault(fields.Date.to_string(row['date']), {}).setdefault(categ_key, {})
+            invoices[str(row['move_id'])] = invoices.get(str(row['move_id']), 0.0) + amount
+
+        rate_table.log_stats('Drill-down özeti')
+        _logger.debug("Drill-down özeti tek geçişte oluşturuldu: %s grup, %s gün", len(rows), len(rollups))
+        return rollups
+
+    def _get_rollups(self):
+        """Saklanan drill-down özetini döndürür; yoksa bir kez oluşturup saklar."""
+        self.ensure_one()
+        if self.rollup_data:
+            return json.loads(self.rollup_data)
+        rollups = self._build_rollups()
+        self.rollup_data = json.dumps(rollups)
+        return rollups
+
+    # ---------------------------- Sıralama (Top-N) ----------------------------
+    # Ürün sıralaması özet tablodan, müşteri ve temsilci sıralaması fatura satırlarından
+    # okunur. Gün × para birimi × şirket grupları katsayı tablosuyla (`unnest`) SQL'de
+    # hedef para birimine çevrilip diğer yollar gibi grup bazında yuvarlanır, ay ×
+    # kategori grupları içinde ROW_NUMBER ile sıralanır; sadece ilk N satır döner.
+    _RANKING_QUERY = """
+        WITH groups AS (
+            SELECT {month} AS month,
+                   COALESCE(rc.report_categ_id, {categ}) AS categ_id,
+                   {key} AS key_id,
+                   {date} AS date,
+                   {currency} AS currency_id,
+                   {company} AS company_id,
+                   SUM({amount}) AS amount
+              FROM {source}
+         LEFT JOIN unnest(%s::int[], %s::int[]) AS rc(categ_id, report_categ_id)
+                ON rc.categ_id = {categ}
+             WHERE {where}
+          GROUP BY 1, 2, 3, 4, 5, 6
+        ), totals AS (
+            SELECT g.month, g.categ_id, g.key_id,
+                   SUM(ROUND((g.amount::float8 * f.factor)::numeric, %s)) AS amount
+              FROM groups g
+              JOIN unnest(%s::int[], %s::int[], %s::date[], %s::float8[]) AS f(currency_id, company_id, date, factor)
+                ON f.currency_id = g.currency_id AND f.company_id = g.company_id AND f.date = g.date
+          GROUP BY 1, 2, 3
+        ), ranked AS (
+            SELECT month, categ_id, key_id, amount,
+                   ROW_NUMBER() OVER (PARTITION BY month, categ_id ORDER BY amount DESC, key_id) AS rank
+              FROM totals
+        )
+        SELECT month, categ_id, key_id, amount::float8
+          FROM ranked
+         WHERE rank <= %s
+      ORDER BY month, categ_id, rank
+    """
+
+    # Sıralama kaynağındaki (para birimi, şirket, gün) anahtarları: katsayılar bunlar için hesaplanır
+    _RANKING_CURRENCY_KEYS_QUERY = """
+        SELECT DISTINCT {currency}, {company}, {date}
+          FROM {source}
+         WHERE {where}
+    """
+
+    _RANKING_SOURCES = {
+        'aggregate': {
+            'source': 'monthly_sales_aggregate a',
+            'month': 'a.month',
+            'date': 'a.date',
+            'categ': 'a.categ_id',
+            'company': 'a.company_id',
+            'currency': 'a.currency_id',
+            'amount': 'a.amount',
+            'product': 'a.product_id',
+        },
+        'move_lines': {
+            'source': """account_move_line aml
+              JOIN account_move am ON am.id = aml.move_id
+              JOIN account_account aa ON aa.id = aml.account_id
+              JOIN product_product pp ON pp.id = aml.product_id
+              JOIN product_template pt ON pt.id = pp.product_tmpl_id""",
+            'month': "to_char(aml.date, 'YYYY-MM')",
+            'date': 'aml.date',
+            'categ': 'pt.categ_id',
+            'company': 'aml.company_id',
+            'currency': 'COALESCE(aml.currency_id, aml.company_currency_id)',
+            'amount': 'ABS(CASE WHEN aml.currency_id IS NOT NULL THEN aml.amount_currency ELSE aml.balance END)',
+            'product': 'aml.product_id',
+        },
+    }
+
+    # Sıralama modu -> (kaynak, sıralanan anahtar sütunu)
+    _RANKING_KEYS = {
+        'product': ('aggregate', 'a.product_id'),
+        'customer': ('move_lines', 'am.commercial_partner_id'),
+        'salesperson': ('move_lines', 'am.invoice_user_id'),
+    }
+
+    def _ranking_source(self):
+        """Sıralama kaynağı, WHERE koşulu ve parametreleri: (kaynak, koşul, parametreler)"""
+        source_name = self._RANKING_KEYS[self.ranking_mode][0]
+        source = self._RANKING_SOURCES[source_name]
+        product_ids, categ_ids = self._get_product_scope()
+        product_filter, filter_params = self.env['monthly.sales.aggregate']._product_scope_filter(
+            product_ids, categ_ids, source['product'], source['categ'],
+        )
+        where = """{date} >= %s
+               AND {date} <= %s
+               AND {company} IN %s
+               AND """.format(**source) + product_filter
+        if source_name == 'move_lines':
+            # Fatura satırı filtreleri özet tablonun kaynağıyla aynıdır
+            where = """am.move_type IN ('out_invoice', 'out_refund')
+               AND am.state = 'posted'
+               AND aml.parent_state = 'posted'
+               AND aa.account_type IN ('income', 'other_income')
+               AND """ + where
+        params = [self.date_from, self.date_to, tuple(self.env.companies.ids)] + filter_params
+        return source, where, params
+
+    def _ranking_currency_keys(self):
+        """Sıralama kaynağının (para birimi, şirket, gün) anahtarları"""
+        source, where, params = self._ranking_source()
+        self.env.cr.execute(self._RANKING_CURRENCY_KEYS_QUERY.format(where=where, **source), params)
+        return set(self.env.cr.fetchall())
+
+    def _ranking_query(self, rate_table, currency_keys):
+        """Sıralama sorgusu ve parametreleri: (sql, params)"""
+        key = self._RANKING_KEYS[self.ranking_mode][1]
+        source, where, where_params = self._ranking_source()
+
+        # Alt kategoriler toplanıyorsa kategori -> seçili üst kategori eşlemesi
+        category_map = {}
+        if self.rollup_subcategories:
+            category_map = self._get_category_resolver().ancestors
+
+        query = self._RANKING_QUERY.format(key=key, where=where, **source)
+        params = [list(category_map), list(category_map.values())] + where_params + [
+            self.currency_id.decimal_places,
+        ] + list(rate_table.factor_arrays(currency_keys)) + [max(self.ranking_limit, 1)]
+        return query, params
+
+    def _get_ranking_names(self, key_ids):
+        """Sıralanan kayıtların rapor satırında gösterilecek adları"""
+        if self.ranking_mode == 'product':
+            return {
+                product.id: '[{}] {}'.format(product.default_code or 'NO-CODE', product.name)
+                for product in self.env['product.product'].browse(key_ids)
+            }
+        model_name = 'res.partner' if self.ranking_mode == 'customer' else 'res.users'
+        names = self._read_names(model_name, key_ids)
+        names[None] = 'Belirtilmemiş'
+        return names
+
+    def _add_rankings(self, report_data, rate_table, currency_keys, category_names):
+        """Her ay × kategori için ilk N satırı SQL'de seçip kategori toplamlarının altına ekler.
+        `currency_keys` özet tablo satırlarının anahtarlarıdır; fatura satırlarından okunan
+        sıralamalarda anahtarlar ve kurlar aynı kaynaktan yeniden okunur.
+        """
+        self.env.flush_all()
+        if self._RANKING_KEYS[self.ranking_mode][0] == 'move_lines':
+            currency_keys = self._ranking_currency_keys()
+            rate_table = self._get_rate_table(
+                {currency_id for currency_id, _company_id, _date in currency_keys},
+                {company_id for _currency_id, company_id, _date in currency_keys},
+            )
+        self.env.cr.execute(*self._ranking_query(rate_table, currency_keys))
+        rows = self.env.cr.fetchall()
+        key_names = self._get_ranking_names({key_id for _month, _categ_id, key_id, _amount in rows})
+        missing = {categ_id for _month, categ_id, _key_id, _amount in rows} - set(category_names)
+        for category in self.env['product.category'].browse(missing):
+            category_names[category.id] = category.name
+
+        for month, categ_id, key_id, amount in rows:
+            report_data.add_ranked(
+                month, categ_id, category_names[categ_id], amount, key_id, key_names.get(key_id),
+            )
+        _logger.debug("Sıralama (%s, ilk %s): %s satır", self.ranking_mode, self.ranking_limit, len(rows))
+
+    def _get_report_data(self):
+        """Rapor verilerini hesaplar ve sütun bazlı `ReportColumns` olarak döner:
+        her ay için kategori toplam satırı ve (ürün seçildiyse) ürün satırları,
+        rapor sırasında. Toplamlar özet tablodan okunur (bkz. `_query_sales_totals`).
+        Karşılaştırma modunda karşılaştırma dönemi aynı sorguda okunur ve her
+        satırın `comparison` sütununa yazılır.
+        """
+        self.ensure_one()
+
+        resolver = self._get_category_resolver()
+        if not resolver.ids:
+            raise UserError(_("No categories found matching your criteria."))
+        ranking = self.ranking_mode != 'none'
+        if ranking and self.comparison_mode != 'none':
+            raise UserError(_("Sıralama ve karşılaştırma aynı raporda birlikte kullanılamaz."))
+
+        # Ürün havuzu: id listesi oluşturulmaz, sadece boş olmadığı kontrol edilir
+        product_ids, categ_ids = self._get_product_scope()
+        category_domain = [('categ_id', 'in', categ_ids)] if categ_ids is not None else []
+        if not product_ids and not self.env['product.product'].search(category_domain, limit=1):
+            raise UserError(_("No products found in the selected categories."))
+
+        # Belirli ürünler seçildiyse ürün kırılımı da SQL'de yapılır (sıralama modunda
+        # ürün satırları yerine sıralama satırları gelir)
+        group_by_product = bool(self.product_ids) and not ranking
+        comparison_mode = self.comparison_mode if self.comparison_mode != 'none' else None
+        rows = self._query_sales_totals(
+            self.date_from, self.date_to, product_ids, categ_ids,
+            group_by_product=group_by_product, comparison_mode=comparison_mode,
+        )
+        _logger.debug("Özet satır sayısı: %s (fatura satırı: %s)",
+                      len(rows), sum(row['line_count'] for row in rows))
+
+        # Kurlar tek sorguda yüklenir, özet satırlar toplu çevrilir
+        rate_table = self._get_rate_table(
+            {row['currency_id'] for row in rows}, {row['company_id'] for row in rows},
+        )
+        amounts = rate_table.convert_many(
+            (row['amount'], row['currency_id'], row['company_id'], row['date']) for row in rows
+        )
+        # Karşılaştırma tutarları kendi (geçmiş) tarihlerinin kuruyla çevrilir
+        comparisons = rate_table.convert_many(
+            (row['comparison_amount'], row['currency_id'], row['company_id'], row['date']) for row in rows
+        ) if comparison_mode else [0.0] * len(rows)
+
+        # Alt kategoriler toplanıyorsa satırlar seçili üst kategoriye bağlanır
+        report_categories = [self._get_report_category(resolver, row['categ_id']) for row in rows]
+
+        # İsimler tek seferde okunsun diye kayıtlar toplu browse edilir (prefetch)
+        category_names = {
+            category.id: category.name
+            for category in self.env['product.category'].browse(set(report_categories))
+        }
+        product_names = {}
+        if group_by_product:
+            for product in self.env['product.product'].browse({row['product_id'] for row in rows}):
+                product_code = product.default_code or 'NO-CODE'
+                product_names[product.id] = '[{}] {}'.format(product_code, product.name)
+
+        report_data = ReportColumns()
+        for row, category_id, amount, comparison in zip(rows, report_categories, amounts, comparisons):
+            product_id = row['product_id']
+            report_data.add(
+                row['month'], category_id, category_names[category_id], amount,
+                product_id, product_names.get(product_id), comparison,
+            )
+        if ranking:
+            # Çevrim katsayıları toplam satırlarının (para birimi, şirket, gün) anahtarları için zaten hesaplı
+            currency_keys = {(row['currency_id'], row['company_id'], row['date']) for row in rows}
+            self._add_rankings(report_data, rate_table, currency_keys, category_names)
+        report_data.finalize()
+
+        rate_table.log_stats('Aylık rapor')
+        _logger.debug("Rapor ay sayısı: %s, satır sayısı: %s", report_data.month_count, len(report_data))
+        return report_data
+
+    def _get_daily_data(self, selected_month, selected_category_id=None, dates=None):
+        """Seçilen ay için günlük satış verilerini drill-down özetinden döndürür.
+        `dates` verilirse sadece bu günler hesaplanır (sayfalama için).
+        """
+        self.ensure_one()
+        rollups = self._get_rollups()
+        if dates:
+            day_keys = [fields.Date.to_string(date) for date in dates]
+        else:
+            day_keys = [day for day in rollups if day.startswith(selected_month)]
+
+        daily_data = {}
+        for day in day_keys:
+            for categ_key, invoices in rollups.get(day, {}).items():
+                if selected_category_id and int(categ_key) != selected_category_id:
+                    continue
+                daily_data.setdefault(fields.Date.to_date(day), {})[int(categ_key)] = {
+                    'total_amount': sum(invoices.values()),
+                    'invoice_count': len(invoices),
+                }
+
+        # Kategori isimleri tek seferde okunur (prefetch)
+        categories = self.env['product.category'].browse({
+            categ_id for categories in daily_data.values() for categ_id in categories
+        })
+        category_names = {category.id: category.name for category in categories}
+        for categories in daily_data.values():
+            for categ_id, categ_data in categories.items():
+                categ_data['category_name'] = category_names[categ_id]
+
+        _logger.debug("%s ayı için %s gün özetten okundu", selected_month, len(daily_data))
+        return daily_data
+
+    def _get_invoice_data(self, selected_date, selected_category_id=None, invoice_ids=None):
+        """Seçilen tarih için fatura detaylarını döndürür.
+        `invoice_ids` verilirse sadece bu faturalar hesaplanır (sayfalama için).
+        """
+        self.ensure_one()
+        
+        product_ids, categ_ids = self._get_product_scope(selected_category_id)
+        
+        # Satır bazlı domain: sadece ilgili ürünleri içeren faturaların ilgili satırları gelir.
+        # Gün, özet tablo ve drill-down özeti gibi muhasebe tarihidir (`date`)
+        line_domain = [
+            ('move_id.move_type', 'in', ['out_invoice', 'out_refund']),
+            ('move_id.state', '=', 'posted'),
+            ('date', '=', selected_date),
+            ('display_type', '=', 'product'),
+        ]
+        if product_ids is not None:
+            line_domain.append(('product_id', 'in', product_ids))
+        else:
+            # Alt arama (active_test) sadece aktif ürünleri verir; ürün id'leri sorguya gömülür
+            line_domain.append(('product_id.active', '=', True))
+            if categ_ids is not None:
+                line_domain.append(('product_id.categ_id', 'in', categ_ids))
+        if invoice_ids is not None:
+            line_domain.append(('move_id', 'in', list(invoice_ids)))
+        lines = self.env['account.move.line'].search(line_domain)
+        
+        lines_by_invoice = {}
+        for line in lines:
+            lines_by_invoice.setdefault(line.move_id.id, []).append(line)
+        
+        if invoice_ids is not None:
+            invoices = self.env['account.move'].browse([inv_id for inv_id in invoice_ids if inv_id in lines_by_invoice])
+        else:
+            invoices = lines.move_id.sorted()
+        
+        # Fatura başlıkları tek `read` ile, ilişkili isimler model başına tek sorguyla okunur
+        headers = invoices.read([
+            'name', 'invoice_date', 'partner_id', 'user_id', 'currency_id',
+            'amount_total', 'amount_tax', 'amount_untaxed', 'payment_state',
+        ], load=None)
+        partner_names = self._read_names('res.partner', {header['partner_id'] for header in headers})
+        user_names = self._read_names('res.users', {header['user_id'] for header in headers})
+        currency_names = self._read_names('res.currency', {header['currency_id'] for header in headers})
+        payment_state_labels = dict(
+            self.env['account.move']._fields['payment_state']._description_selection(self.env)
+        )
+
+        # Maliyet fatura tarihindeki değerleme maliyetidir; kâr hesabı tüm satırlar için tek geçişte yapılır
+        margin_by_line = {}
+        if lines:
+            cost_history = ProductCostHistory(self.env, lines.product_id.ids, lines.company_id.ids, selected_date)
+            unit_costs = cost_history.costs_at(
+                (line.product_id.id, line.company_id.id, selected_date) for line in lines
+            )
+            margins = compute_line_margins(lines.mapped('quantity'), lines.mapped('price_subtotal'), unit_costs)
+            margin_by_line = dict(zip(lines.ids, zip(
+                unit_costs, margins.cost.tolist(), margins.margin.tolist(), margins.margin_percent.tolist(),
+            )))
+        
+        invoice_data = []
+        
+        for header in headers:
+            # Bu faturanın ilgili kategorilerdeki ürün satırları
+            relevant_lines = lines_by_invoice[header['id']]
+            
+            # Fatura seviyesinde bilgiler
+            invoice_info = {
+                'invoice_id': header['id'],
+                'invoice_name': header['name'],
+                'invoice_date': header['invoice_date'],
+                'partner_name': partner_names.get(header['partner_id']),
+                'salesman_name': user_names.get(header['user_id']) or 'Belirtilmemiş',
+                'amount_total': header['amount_total'],
+                'amount_tax': header['amount_tax'],
+                'amount_untaxed': header['amount_untaxed'],
+                'payment_state': payment_state_labels.get(header['payment_state'], header['payment_state']),
+                'currency_name': currency_names.get(header['currency_id']),
+                'lines': []
+            }
+            
+            # Fatura satırları detayı
+            for line in relevant_lines:
+                cost_price, total_cost, margin, margin_percent = margin_by_line[line.id]
+                
+                line_info = {
+                    'product_name': line.product_id.name,
+                    'product_code': line.product_id.default_code or '',
+                    'category_name': line.product_id.categ_id.name,
+                    'quantity': line.quantity,
+                    'price_unit': line.price_unit,
+                    'price_subtotal': line.price_subtotal,
+                    'cost_price': cost_price,
+                    'total_cost': total_cost,
+                    'margin': margin,
+                    'margin_percent': margin_percent,
+                }
+                
+                invoice_info['lines'].append(line_info)
+            
+            invoice_data.append(invoice_info)
+        
+        return invoice_data
+
+    def _read_names(self, model_name, ids):
+        """Verilen kayıtların isimlerini tek sorguyla {id: isim} olarak döndürür"""
+        ids = [record_id for record_id in ids if record_id]
+        if not ids:
+            return {}
+        return {
+            record['id']: record['name']
+            for record in self.env[model_name].browse(ids).read(['name'])
+        }
+
+    def _get_invoice_domain(self, selected_date):
+        """Fatura bazlı domain (muhasebe tarihine göre, satır domain'iyle aynı gün)"""
+        return [
+            ('move_type', 'in', ['out_invoice', 'out_refund']),
+            ('state', '=', 'posted'),
+            ('date', '=', selected_date),
+        ]
+
+    # ---------------------------- Pagination ----------------------------
+    def _load_keys(self, field_name):
+        return json.loads(self[field_name] or '[]')
+
+    def _get_page_count(self, keys):
+        return max(1, -(-len(keys) // max(self.page_size, 1)))
+
+    def _get_page_keys(self, keys, page):
+        start = page * max(self.page_size, 1)
+        return keys[start:start + max(self.page_size, 1)]
+
+    def _compute_daily_keys(self, month, category_id):
+        """Ayın (gün, kategori) çiftlerini drill-down özetinden sıralı döndürür."""
+        return sorted(
+            (day, int(categ_key))
+            for day, categories in self._get_rollups().items() if day.startswith(month)
+            for categ_key in categories
+            if not category_id or int(categ_key) == category_id
+        )
+
+    def _compute_invoice_keys(self, date, category_id):
+        """Günün ilgili ürünleri içeren faturalarının id'lerini drill-down özetinden
+        (yeniden eskiye) döndürür."""
+        categories = self._get_rollups().get(fields.Date.to_string(fields.Date.to_date(date)), {})
+        invoice_ids = {
+            int(invoice_key)
+            for categ_key, invoices in categories.items()
+            if not category_id or int(categ_key) == category_id
+            for invoice_key in invoices
+        }
+        return sorted(invoice_ids, reverse=True)
+
+    def _materialize_daily_page(self):
+        """Sadece görünen günlük sayfanın satırlarını hesaplayıp yazar"""
+        self.ensure_one()
+        self._get_line_model('daily_lines')._bulk_unlink_reports(self.ids)
+
+        page_keys = {tuple(key) for key in self._get_page_keys(self._load_keys('daily_keys'), self.daily_page)}
+        if not page_keys:
+            return
+        dates = sorted({fields.Date.to_date(date) for date, _categ_id in page_keys})
+        daily_data = self._get_daily_data(self.selected_month, self.selected_category_id.id, dates=dates)
+
+        line_vals = []
+        for date, categories in sorted(daily_data.items()):
+            for cat_id, cat_data in sorted(categories.items()):
+                if (fields.Date.to_string(date), cat_id) not in page_keys:
+                    continue
+                line_vals.append({
+                    'report_id': self.id,
+                    'date': date,
+                    'category_id': cat_id,
+                    'category_name': cat_data['category_name'],
+                    'total_amount': cat_data['total_amount'],
+                    'invoice_count': cat_data['invoice_count'],
+                })
+        
+        if line_vals:
+            self._get_line_model('daily_lines')._bulk_create(line_vals)
+
+    def _materialize_invoice_page(self):
+        """Sadece görünen fatura sayfasının satırlarını hesaplayıp yazar"""
+        self.ensure_one()
+        self._get_line_model('invoice_lines')._bulk_unlink_reports(self.ids)
+
+        page_ids = self._get_page_keys(self._load_keys('invoice_keys'), self.invoice_page)
+        if not page_ids:
+            return
+        invoice_data = self._get_invoice_data(self.selected_date, self.selected_category_id.id, invoice_ids=page_ids)
+
+        line_vals = []
+        for invoice_info in invoice_data:
+            line_vals.append({
+                'report_id': self.id,
+                'invoice_id': invoice_info['invoice_id'],
+                'invoice_name': invoice_info['invoice_name'],
+                'invoice_date': invoice_info['invoice_date'],
+                'partner_name': invoice_info['partner_name'],
+                'salesman_name': invoice_info['salesman_name'],
+                'amount_total': invoice_info['amount_total'],
+                'amount_tax': invoice_info['amount_tax'],
+                'amount_untaxed': invoice_info['amount_untaxed'],
+                'payment_state': invoice_info['payment_state'],
+                'currency_name': invoice_info['currency_name'],
+                'product_lines_json': str(invoice_info['lines']),  # JSON string olarak sakla
+            })
+        
+        if line_vals:
+            self._get_line_model('invoice_lines')._bulk_create(line_vals)
+
+    def _reset_drilldown_cache(self):
+        """Filtreler değiştiğinde saklanan drill-down sonuçlarını temizler"""
+        self._get_line_model('daily_lines')._bulk_unlink_reports(self.ids)
+        self._get_line_model('invoice_lines')._bulk_unlink_reports(self.ids)
+        self.write({
+            'rollup_data': False,
+            'category_map': False,
+            'daily_keys': False,
+            'daily_keys_scope': False,
+            'daily_page': 0,
+            'invoice_keys': False,
+            'invoice_keys_scope': False,
+            'invoice_page': 0,
+        })
+
+    def _change_page(self, level, step):
+        self.ensure_one()
+        page_field, keys_field = f'{level}_page', f'{level}_keys'
+        page_count = self._get_page_count(self._load_keys(keys_field))
+        page = min(max(self[page_field] + step, 0), page_count - 1)
+        if page != self[page_field]:
+            self[page_field] = page
+            with self._report_probe(f'{level}_page'):
+                if level == 'daily':
+                    self._materialize_daily_page()
+                else:
+                    self._materialize_invoice_page()
+        return self._reopen_form(self._get_level_title())
+
+    def action_daily_next_page(self):
+        return self._change_page('daily', 1)
+
+    def action_daily_previous_page(self):
+        return self._change_page('daily', -1)
+
+    def action_invoice_next_page(self):
+        return self._change_page('invoice', 1)
+
+    def action_invoice_previous_page(self):
+        return self._change_page('invoice', -1)
+
+    def _get_level_title(self):
+        if self.detail_level == 'daily':
+            return f'Günlük Detaylar - {self.selected_month}'
+        if self.detail_level == 'invoice':
+            return f'Fatura Detayları - {self.selected_date}'
+        return 'Ana Rapor'
+
+    def _reopen_form(self, name):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': name,
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    # ---------------------------- Navigation Actions ----------------------------
+    def drill_down_to_daily(self):
+        """Aylık raporu günlük detaya açar"""
+        self.ensure_one()
+        
+        # Context'ten parametreleri al
+        month = self.env.context.get('default_month')
+        category_id = self.env.context.get('default_category_id')
+        
+        if not month:
+            raise UserError("Ay bilgisi eksik!")
+        
+        # Navigation state'i güncelle
+        self.detail_level = 'daily'
+        self.selected_month = month
+        self.selected_category_id = category_id
+        
+        # Aynı seçim daha önce açıldıysa saklanan sayfa kullanılır
+        scope = f'{month}|{category_id or ""}'
+        if self.daily_keys_scope != scope or not self.daily_lines:
+            with self._report_probe('drill_down_to_daily') as probe:
+                with probe.phase('keys'):
+                    self._get_line_model('invoice_lines')._bulk_unlink_reports(self.ids)
+                    self.write({
+                        'daily_keys': json.dumps(self._compute_daily_keys(month, category_id)),
+                        'daily_keys_scope': scope,
+                        'daily_page': 0,
+                        'invoice_keys': False,
+                        'invoice_keys_scope': False,
+                        'invoice_page': 0,
+                    })
+                with probe.phase('page'):
+                    self._materialize_daily_page()
+        
+        return self._reopen_form(f'Günlük Detaylar - {month}')
+
+    def drill_down_to_invoices(self):
+        """Günlük raporu fatura detaya açar"""
+        self.ensure_one()
+        
+        # Context'ten parametreleri al
+        date = self.env.context.get('default_date')
+        category_id = self.env.context.get('default_category_id')
+        
+        if not date:
+            raise UserError("Tarih bilgisi eksik!")
+        
+        # Navigation state'i güncelle
+        self.detail_level = 'invoice'
+        self.selected_date = date
+        self.selected_category_id = category_id
+        
+        # Aynı seçim daha önce açıldıysa saklanan sayfa kullanılır
+        scope = f'{date}|{category_id or ""}'
+        if self.invoice_keys_scope != scope:
+            with self._report_probe('drill_down_to_invoices') as probe:
+                with probe.phase('keys'):
+                    self.write({
+                        'invoice_keys': json.dumps(self._compute_invoice_keys(date, category_id)),
+                        'invoice_keys_scope': scope,
+                        'invoice_page': 0,
+                    })
+                with probe.phase('page'):
+                    self._materialize_invoice_page()
+        
+        return self._reopen_form(f'Fatura Detayları - {date}')
+
+    def back_to_monthly(self):
+        """Ana aylık rapora geri dön. Drill-down satırları saklanır; aynı ay
+        yeniden açıldığında tekrar hesaplanmaz."""
+        self.ensure_one()
+        self.detail_level = 'monthly'
+        self.selected_month = False
+        self.selected_date = False
+        self.selected_category_id = False
+        
+        return self._reopen_form('Ana Rapor')
+
+    def back_to_daily(self):
+        """Fatura detayından günlük detaya geri dön"""
+        self.ensure_one()
+        self.detail_level = 'daily'
+        # Günlük satırlar hep aylık kategori seçimine göre tutulur
+        self.selected_category_id = int(self.daily_keys_scope.split('|')[1] or 0) if self.daily_keys_scope else False
+        
+        return self._reopen_form(f'Günlük Detaylar - {self.selected_month}')
+
+    def open_invoice(self):
+        """Seçilen faturayı Odoo'da açar"""
+        invoice_id = self.env.context.get('default_invoice_id')
+        
+        if not invoice_id:
+            raise UserError("Fatura ID eksik!")
+        
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Fatura Detayı',
+            'res_model': 'account.move',
+            'res_id': invoice_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    # ---------------------------- Actions ----------------------------
+    def generate_report(self):
+        """Raporu oluşturur, satırları yazar, Excel üretir ve wizard'ı açık tutar."""
+        self.ensure_one()
+        with self._report_probe('generate_report') as probe:
+            with probe.phase('cleanup'):
+                if self.report_lines:
+                    self._get_line_model('report_lines')._bulk_unlink_reports(self.ids)  # Eski satırları temizle
+                self._reset_drilldown_cache()
+
+            Cache = self.env['monthly.sales.report.cache']
+            with probe.phase('cache'):
+                cache_params = self._get_cache_parameters()
+                cache_key = Cache._make_key(cache_params)
+                cache_entry = Cache._lookup(cache_key) if self.use_cache else Cache.browse()
+
+            with probe.phase('aggregate'):
+                report_data = cache_entry._load_report_data() if cache_entry else self._get_report_data()
+
+            # Report lines oluştur
+            with probe.phase('lines'):
+                line_vals = [{
+                    'report_id': self.id,
+                    'month': month,
+                    'category_name': category_name,
+                    'product_name': product_name or False,
+                    'amount': amount,
+                    'is_category_total': is_total,
+                } for month, _category_id, category_name, _product_id, product_name, amount, is_total
+                    in report_data.iter_rows()]
+                if self.ranking_mode != 'none':
+                    for vals, rank in zip(line_vals, report_data.iter_ranks()):
+                        vals['rank'] = rank
+                if self.comparison_mode != 'none':
+                    for vals, (comparison, delta, delta_percent) in zip(line_vals, report_data.iter_comparisons()):
+                        vals.update({
+                            'comparison_amount': comparison,
+                            'delta_amount': delta,
+                            'delta_percent': delta_percent or 0.0,
+                        })
+
+                if line_vals:
+                    self._get_line_model('report_lines')._bulk_create(line_vals)
+
+            # Excel oluştur (önbellekte varsa oradan alınır)
+            with probe.phase('excel'):
+                if cache_entry:
+                    self._load_cached_excel(cache_entry.attachment_id)
+                else:
+                    self._generate_excel_report(report_data)
+                    if self.use_cache and self._get_excel_export_mode() == 'attachment':
+                        Cache._store(cache_key, cache_params, report_data, self.excel_filename,
+                                     excel_attachment=self.excel_attachment_id)
+                    elif self.use_cache:
+                        Cache._store(cache_key, cache_params, report_data, self.excel_filename,
+                                     excel_raw=self._get_excel_content())
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self._get_report_title(),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def _run_report_job(self):
+        """Arka plan işinde Excel her zaman ek dosya olarak üretilir ve işe devredilir;
+        sihirbazın seçili export modu değişmez."""
+        self.with_context(excel_export_mode='attachment').generate_report()
+        attachment = self.excel_attachment_id
+        self.excel_attachment_id = False
+        return attachment
+
+    # ---------------------------- Export ----------------------------
+    def _get_excel_filename(self):
+        df = self.date_from.strftime('%Y-%m-%d') if self.date_from else ''
+        dt = self.date_to.strftime('%Y-%m-%d') if self.date_to else ''
+        return "{}_{}_{}.xlsx".format(self._excel_filename_prefix, df, dt)
+
+    def _iter_excel_rows(self, report_data):
+        """Excel satırlarını sırayla üretir: (ay, kategori, ürün, tutar, kategori toplamı mı,
+        karşılaştırma, sıra). Karşılaştırma (tutar, fark, yüzde fark) ya da None'dır;
+        sıra sıralama modunda satırın grup içindeki sırasıdır, aksi halde None."""
+        comparisons = report_data.iter_comparisons() if self.comparison_mode != 'none' else None
+        ranks = report_data.iter_ranks() if self.ranking_mode != 'none' else None
+        for month, _category_id, category_name, _product_id, product_name, amount, is_total in report_data.iter_rows():
+            comparison = next(comparisons) if comparisons else None
+            rank = next(ranks) if ranks else None
+            yield month, category_name, 'TOTAL' if is_total else product_name, amount, is_total, comparison, rank
+
+    def _write_excel_sheet(self, workbook, rows):
+        """Çalışma sayfasını satır sırasıyla yazar (constant_memory modu ile uyumlu)."""
+        worksheet = workbook.add_worksheet(self._excel_sheet_name)
+
+        # Formatlar
+        header_format = workbook.add_format({'bold': True, 'bg_color': '#D7E4BC', 'border': 1})
+        category_format = workbook.add_format({'bold': True, 'bg_color': '#F2F2F2', 'border': 1})
+        product_format = workbook.add_format({'border': 1, 'indent': 1})
+        amount_format = workbook.add_format({'num_format': '#,##0.00', 'border': 1})
+        percent_format = workbook.add_format({'num_format': '0.00"%"', 'border': 1})
+
+        # Sütun genişlikleri
+        worksheet.set_column('A:A', 12)
+        worksheet.set_column('B:B', 25)
+        worksheet.set_column('C:C', 40)
+        worksheet.set_column('D:G', 18)
+
+        # Başlıklar
+        headers = ['Month', 'Category', 'Product', 'Total Sales ({})'.format(self.currency_id.name)]
+        if self.ranking_mode != 'none':
+            headers[2] = dict(self._fields['ranking_mode'].selection)[self.ranking_mode]
+            headers.append('Rank')
+        if self.comparison_mode != 'none':
+            headers += [
+                '{} ({})'.format(dict(self._fields['comparison_mode'].selection)[self.comparison_mode],
+                                 self.currency_id.name),
+                'Delta', 'Delta %',
+            ]
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+
+        # Veri satırları
+        for row, (month, category_name, product_name, amount, is_total, comparison, rank) in enumerate(rows, start=1):
+            text_format = category_format if is_total else product_format
+            worksheet.write(row, 0, month, text_format)
+            worksheet.write(row, 1, category_name, text_format)
+            worksheet.write(row, 2, product_name, text_format)
+            worksheet.write_number(row, 3, amount, category_format if is_total else amount_format)
+            if comparison:
+                comparison_amount, delta, delta_percent = comparison
+                worksheet.write_number(row, 4, comparison_amount, amount_format)
+                worksheet.write_number(row, 5, delta, amount_format)
+                if delta_percent is None:
+                    worksheet.write_blank(row, 6, None, percent_format)
+                else:
+                    worksheet.write_number(row, 6, delta_percent, percent_format)
+            if rank:
+                worksheet.write_number(row, 4, rank, product_format)
+
+    def _get_excel_export_mode(self):
+        """Export modu: bağlamdaki `excel_export_mode` (arka plan işi) sihirbaz seçimini ezer."""
+        return self.env.context.get('excel_export_mode') or self.excel_export_mode
+
+    def _generate_excel_report(self, report_data):
+        """Excel raporunu seçili moda göre oluşturur."""
+        if self._get_excel_export_mode() == 'attachment':
+            return self._generate_excel_attachment(report_data)
+
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output)
+        self._write_excel_sheet(workbook, self._iter_excel_rows(report_data))
+        workbook.close()
+        output.seek(0)
+
+        self.excel_file = base64.b64encode(output.read())
+        self.excel_filename = self._get_excel_filename()
+
+    def _generate_excel_attachment(self, report_data):
+        """Excel dosyasını `constant_memory` ile satır satır diske yazar; dosya
+        belleğe okunmadan ve base64'e çevrilmeden filestore'a ek dosya olarak taşınır.
+        """
+        def write(path):
+            workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            self._write_excel_sheet(workbook, self._iter_excel_rows(report_data))
+            workbook.close()
+
+        self._unlink_excel_attachment()
+        self._set_excel_attachment(create_file_attachment(self.env, write, self._get_excel_attachment_vals()))
+
+    def _get_excel_attachment_vals(self):
+        return {
+            'name': self._get_excel_filename(),
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': XLSX_MIMETYPE,
+        }
+
+    def _set_excel_attachment(self, attachment):
+        """Excel ek dosyasını sihirbaza bağlar."""
+        self.excel_attachment_id = attachment
+        self.excel_file = False
+        self.excel_filename = attachment.name
+
+    def _get_excel_content(self):
+        """Üretilmiş Excel dosyasının ham içeriği (seçili moda göre)"""
+        if self._get_excel_export_mode() == 'attachment':
+            return self.excel_attachment_id.raw
+        return base64.b64decode(self.excel_file)
+
+    def _load_cached_excel(self, attachment):
+        """Önbellekteki Excel dosyasını seçili moda göre sihirbaza yazar; ek dosya
+        modunda filestore dosyası paylaşılır, içerik okunmaz."""
+        if self._get_excel_export_mode() == 'attachment':
+            self._unlink_excel_attachment()
+            return self._set_excel_attachment(
+                share_file_attachment(self.env, attachment, self._get_excel_attachment_vals())
+            )
+        self.excel_file = base64.b64encode(attachment.raw)
+        self.excel_filename = self._get_excel_filename()
+
+    def _unlink_excel_attachment(self):
+        attachments = self.excel_attachment_id
+        self.excel_attachment_id = False
+        attachments.unlink()
+
+    def action_download_excel(self):
+        """Ek dosya olarak saklanan Excel'i doğrudan indirir."""
+        self.ensure_one()
+        if not self.excel_attachment_id:
+            raise UserError(_("Önce raporu oluşturun."))
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.excel_attachment_id.id,
+            'target': 'self',
+        }
+
+    def unlink(self):
+        # Geçici sihirbazla birlikte Excel ek dosyalarını da temizle
+        self.excel_attachment_id.unlink()
+        return super().unlink()
+
+
+class MonthlySalesReportEngineLine(models.AbstractModel):
+    """Aylık özet satırı: kategori toplamı veya (seçilmişse) ürün satırı"""
+    _name = 'monthly.sales.report.engine.line'
+    _inherit = 'monthly.sales.report.line.mixin'
+    _description = 'Satış Rapor Motoru - Aylık Satır'
+
+    month = fields.Char(string='Month')
+    category_name = fields.Char(string='Category')
+    product_name = fields.Char(string='Product')
+    amount = fields.Float(string='Amount')
+    comparison_amount = fields.Float(string='Karşılaştırma Tutarı')
+    delta_amount = fields.Float(string='Fark')
+    delta_percent = fields.Float(string='Fark %')
+    rank = fields.Integer(string='Sıra')
+    is_category_total = fields.Boolean(string='Is Category Total')
+
+    def drill_down_to_daily(self):
+        """Report line'dan ana report metodunu çağır"""
+        return self.report_id.drill_down_to_daily()
+
+
+class MonthlySalesReportEngineDailyLine(models.AbstractModel):
+    _name = 'monthly.sales.report.engine.daily.line'
+    _inherit = 'monthly.sales.report.line.mixin'
+    _description = 'Satış Rapor Motoru - Günlük Satır'
+
+    date = fields.Date(string='Tarih')
+    category_id = fields.Many2one('product.category', string='Kategori ID')
+    category_name = fields.Char(string='Kategori')
+    total_amount = fields.Float(string='Toplam Tutar')
+    invoice_count = fields.Integer(string='Fatura Sayısı')
+
+    def drill_down_to_invoices(self):
+        """Bu günün faturalarını göster"""
+        return self.report_id.drill_down_to_invoices()
+
+
+class MonthlySalesReportEngineInvoiceLine(models.AbstractModel):
+    _name = 'monthly.sales.report.engine.invoice.line'
+    _inherit = 'monthly.sales.report.line.mixin'
+    _description = 'Satış Rapor Motoru - Fatura Satırı'
+
+    invoice_id = fields.Many2one('account.move', string='Fatura ID')
+    invoice_name = fields.Char(string='Fatura No')
+    invoice_date = fields.Date(string='Fatura Tarihi')
+    partner_name = fields.Char(string='Müşteri')
+    salesman_name = fields.Char(string='Satış Temsilcisi')
+    amount_total = fields.Float(string='Toplam Tutar')
+    amount_tax = fields.Float(string='Vergi')
+    amount_untaxed = fields.Float(string='Vergi Hariç')
+    payment_state = fields.Char(string='Ödeme Durumu')
+    currency_name = fields.Char(string='Para Birimi')
+    product_lines_json = fields.Text(string='Ürün Satırları (JSON)')
+
+    def open_invoice(self):
+        """Faturayı Odoo'da aç"""
+        return self.report_id.open_invoice()
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from . import test_report_benchmark
+from . import test_report_helpers
+from . import test_report_queries
+from . import test_sales_report
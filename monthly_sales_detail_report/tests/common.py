@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from odoo import fields, release
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+_logger = logging.getLogger(__name__)
+
+# Medikal sarf sihirbazının bulunduğu modülün teknik adı (dizin adı)
+MEDICAL_MODULE = 'medical-consumables-report-main'
+
+
+class SalesReportTestCommon(AccountTestInvoicingCommon):
+    """Rapor sihirbazlarının testleri için sentetik veri üreten ortak sınıf.
+
+    Veri seti boyutları sınıf özellikleriyle verilir; varsayılanlar standart test
+    çalıştırmasında hızlı kalacak kadar küçüktür.
+    """
+
+    CATEGORY_COUNT = 3
+    PRODUCT_COUNT = 30
+    VENDOR_COUNT = 3
+    CURRENCY_COUNT = 2
+    INVOICE_COUNT = 40
+    LINES_PER_INVOICE = 3
+    REFUND_RATIO = 0.1
+    DATE_FROM = '2024-01-01'
+    DAYS = 90
+    SEED = 42
+
+    @classmethod
+    def _dataset_param(cls, name):
+        return getattr(cls, name)
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.rng = random.Random(cls._dataset_param('SEED'))
+        cls._generate_dataset()
+
+    # ---------------------------- Veri üretimi ----------------------------
+    @classmethod
+    def _generate_dataset(cls):
+        cls.date_from = fields.Date.from_string(cls._dataset_param('DATE_FROM'))
+        cls.date_to = cls.date_from + timedelta(days=cls._dataset_param('DAYS') - 1)
+        cls.currencies = cls._generate_currencies(cls._dataset_param('CURRENCY_COUNT'))
+        cls.categories = cls.env['product.category'].create([
+            {'name': f'Test Kategori {index}'} for index in range(cls._dataset_param('CATEGORY_COUNT'))
+        ])
+        cls.vendors = cls.env['res.partner'].create([
+            {'name': f'Test Tedarikçi {index}', 'supplier_rank': 1}
+            for index in range(cls._dataset_param('VENDOR_COUNT'))
+        ])
+        cls.products = cls._generate_products(cls._dataset_param('PRODUCT_COUNT'))
+        cls.invoices = cls._generate_invoices(cls._dataset_param('INVOICE_COUNT'))
+
+    @classmethod
+    def _generate_currencies(cls, count):
+        """Şirket para birimi + (count - 1) yabancı para birimi, her biri için aylık kurlar."""
+        company_currency = cls.env.company.currency_id
+        foreign = cls.env['res.currency'].with_context(active_test=False).search(
+            [('id', '!=', company_currency.id)], limit=max(count - 1, 0), order='id',
+        )
+        foreign.active = True
+        rate_vals = []
+        for currency in foreign:
+            day = cls.date_from.replace(day=1)
+            while day <= cls.date_to:
+                rate_vals.append({
+                    'currency_id': currency.id,
+                    'company_id': cls.env.company.id,
+                    'name': day,
+                    'rate': round(cls.rng.uniform(0.5, 2.0), 6),
+                })
+                day = (day + timedelta(days=32)).replace(day=1)
+        cls.env['res.currency.rate'].create(rate_vals)
+        return company_currency | foreign
+
+    @classmethod
+    def _generate_products(cls, count, categories=None):
+        categories = categories or cls.categories
+        return cls.env['product.product'].create([{
+            'name': f'Test Ürün {index}',
+            'default_code': f'TP{index:06d}',
+            'categ_id': categories[index % len(categories)].id,
+            'standard_price': round(cls.rng.uniform(1.0, 50.0), 2),
+            'lst_price': round(cls.rng.uniform(60.0, 120.0), 2),
+            'seller_ids': [(0, 0, {
+                'partner_id': cls.vendors[index % len(cls.vendors)].id,
+                'price': 1.0,
+            })] if cls.vendors else [],
+        } for index in range(count)])
+
+    @classmethod
+    def _generate_invoices(cls, count, invoice_date=None, date_from=None, date_to=None):
+        """Dönem içine dağılmış onaylı müşteri fatura ve iadeleri üretir."""
+        date_from = date_from or cls.date_from
+        days = ((date_to or cls.date_to) - date_from).days + 1
+        refund_ratio = cls._dataset_param('REFUND_RATIO')
+        lines_per_invoice = cls._dataset_param('LINES_PER_INVOICE')
+        vals_list = []
+        for index in range(count):
+            vals_list.append({
+                'move_type': 'out_refund' if cls.rng.random() < refund_ratio else 'out_invoice',
+                'partner_id': (cls.partner_a if index % 2 else cls.partner_b).id,
+                'invoice_date': invoice_date or date_from + timedelta(days=cls.rng.randrange(days)),
+                'currency_id': cls.currencies[index % len(cls.currencies)].id,
+                'invoice_line_ids': [(0, 0, {
+                    'product_id': cls.rng.choice(cls.products).id,
+                    'quantity': cls.rng.randint(1, 10),
+                    'price_unit': round(cls.rng.uniform(60.0, 120.0), 2),
+                    'tax_ids': [(6, 0, [])],
+                }) for _line in range(lines_per_invoice)],
+            })
+        invoices = cls.env['account.move'].create(vals_list)
+        invoices.action_post()
+        return invoices
+
+    # ---------------------------- Yardımcılar ----------------------------
+    def _create_sales_report(self, model='monthly.sales.detail.report', **vals):
+        return self.env[model].create(dict({
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'category_ids': [(6, 0, self.categories.ids)],
+            'currency_id': self.env.company.currency_id.id,
+        }, **vals))
+
+    def _create_supplier_report(self, **vals):
+        return self.env['monthly.supplier.sales.report'].create(dict({
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'currency_id': self.env.company.currency_id.id,
+        }, **vals))
+
+    def _skip_without_medical_module(self):
+        module = self.env['ir.module.module'].search([('name', '=', MEDICAL_MODULE)])
+        if module.state != 'installed':
+            self.skipTest(f"{MEDICAL_MODULE} modülü kurulu değil")
+
+    @staticmethod
+    def _line_values(report):
+        return report.report_lines.mapped(
+            lambda line: (line.month, line.category_name, line.product_name, line.amount)
+        )
+
+
+class SalesReportBenchmarkCommon(SalesReportTestCommon):
+    """Rapor sihirbazlarının ölçümü için büyük veri seti ve ölçüm yardımcıları.
+
+    Boyutlar `MSDR_BENCH_<AD>` ortam değişkenleriyle ezilebilir
+    (ör. `MSDR_BENCH_INVOICE_COUNT=20000`). Ölçümler JSON olarak loglanır;
+    `MSDR_BENCH_OUTPUT` verilirse dosyaya da yazılır.
+    """
+
+    CATEGORY_COUNT = 5
+    PRODUCT_COUNT = 2000
+    VENDOR_COUNT = 10
+    INVOICE_COUNT = 1000
+    LINES_PER_INVOICE = 5
+    DATE_FROM = '2023-01-01'
+    DAYS = 731
+
+    @classmethod
+    def _dataset_param(cls, name):
+        value = os.environ.get(f'MSDR_BENCH_{name}')
+        if value is None:
+            return getattr(cls, name)
+        return type(getattr(cls, name))(value)
+
+    @classmethod
+    def setUpClass(cls, chart_template_ref=None):
+        cls.benchmark_results = []
+        start = time.perf_counter()
+        super().setUpClass(chart_template_ref=chart_template_ref)
+        cls.dataset_seconds = time.perf_counter() - start
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._emit_benchmark_results()
+        super().tearDownClass()
+
+    # ---------------------------- Ölçüm ----------------------------
+    def _measure(self, name, func):
+        """Fonksiyonu ölçer: süre, SQL sorgu sayısı ve en yüksek Python bellek kullanımı."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries_before = self.env.cr.sql_log_count
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            result = func()
+            self.env.flush_all()
+        finally:
+            elapsed = time.perf_counter() - start
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        type(self).benchmark_results.append({
+            'name': name,
+            'seconds': round(elapsed, 4),
+            'queries': self.env.cr.sql_log_count - queries_before,
+            'peak_memory_kb': round(peak / 1024.0, 1),
+        })
+        return result
+
+    def _explain(self, name, query, params):
+        """Sorguyu `EXPLAIN (ANALYZE, BUFFERS)` ile çalıştırıp planı ve süreleri kaydeder."""
+        self.env.flush_all()
+        for table in ('account_move', 'account_move_line', 'monthly_sales_aggregate'):
+            self.env.cr.execute(f'ANALYZE {table}')
+        self.env.cr.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + query, params)
+        plan = self.env.cr.fetchone()[0][0]
+        type(self).benchmark_results.append({
+            'name': name,
+            'seconds': round((plan['Planning Time'] + plan['Execution Time']) / 1000.0, 4),
+            'planning_ms': plan['Planning Time'],
+            'execution_ms': plan['Execution Time'],
+            'query_bytes': len(self.env.cr.mogrify(query, params)),
+            'plan': plan['Plan'],
+        })
+        return plan
+
+    @classmethod
+    def _emit_benchmark_results(cls):
+        payload = {
+            'suite': cls.__name__,
+            'odoo_version': release.version,
+            'timestamp': fields.Datetime.to_string(fields.Datetime.now()),
+            'dataset': {
+                'categories': len(cls.categories),
+                'products': len(cls.products),
+                'vendors': len(cls.vendors),
+                'currencies': len(cls.currencies),
+                'invoices': len(cls.invoices),
+                'lines_per_invoice': cls._dataset_param('LINES_PER_INVOICE'),
+                'date_from': fields.Date.to_string(cls.date_from),
+                'date_to': fields.Date.to_string(cls.date_to),
+                'generation_seconds': round(cls.dataset_seconds, 2),
+            },
+            'results': cls.benchmark_results,
+        }
+        _logger.info("BENCHMARK_JSON %s", json.dumps(payload, ensure_ascii=False))
+        output = os.environ.get('MSDR_BENCH_OUTPUT')
+        if output:
+            with open(output, 'a', encoding='utf-8') as output_file:
+                output_file.write(json.dumps(payload, ensure_ascii=False) + '\n')
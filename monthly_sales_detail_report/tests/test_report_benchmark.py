@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from odoo.tests import tagged
+
+from odoo.addons.monthly_sales_detail_report.models.account_move import CUSTOMER_INVOICE_INDEX, SALES_LINE_INDEX
+from odoo.addons.monthly_sales_detail_report.models.category_tree import CategoryResolver
+from odoo.addons.monthly_sales_detail_report.models.cost_history import ProductCostHistory
+from odoo.addons.monthly_sales_detail_report.models.margin import compute_line_margins
+from .common import SalesReportBenchmarkCommon
+from .test_report_helpers import build_nested_report_data, build_report_columns, loop_margins, naive_cost
+
+
+@tagged('post_install', '-at_install', 'benchmark', '-standard')
+class TestReportBenchmark(SalesReportBenchmarkCommon):
+    """Rapor sihirbazlarının ve yardımcılarının süre ölçümleri. Doğruluk kontrolleri
+    standart testlerdedir (`test_sales_report`, `test_report_helpers`,
+    `test_report_queries`); burada sadece eski ve yeni yollar ölçülür.
+
+    Çalıştırma: `odoo-bin -d <db> -i monthly_sales_detail_report --test-tags benchmark`
+    """
+
+    DAY_INVOICE_COUNT = 1000
+    LAYERS_PER_PRODUCT = 20
+    LOOKUP_COUNT = 2000
+    MARGIN_LINE_COUNT = 200000
+    COLUMN_MONTHS = 36
+    COLUMN_CATEGORIES = 50
+    COLUMN_PRODUCTS_PER_CATEGORY = 200
+    LINE_COUNTS = '10000,100000,1000000'
+    ORM_MAX_LINES = 100000
+    SUBCATEGORY_COUNT = 20
+    DRILLDOWN_CALLS = 50
+    RANKING_LIMIT = 5
+
+    # ---------------------------- Sihirbazlar ----------------------------
+    def _benchmark_sales_wizard(self, model, prefix):
+        report = self._create_sales_report(model)
+        self._measure(f'{prefix}.generate_report', report.generate_report)
+        month = report.report_lines[0].month
+        self._measure(
+            f'{prefix}.drill_down_to_daily',
+            report.with_context(default_month=month, default_category_id=False).drill_down_to_daily,
+        )
+        daily_line = report.daily_lines[0]
+        self._measure(
+            f'{prefix}.drill_down_to_invoices',
+            report.with_context(
+                default_date=daily_line.date, default_category_id=daily_line.category_id.id,
+            ).drill_down_to_invoices,
+        )
+
+    def test_monthly_sales_detail_report(self):
+        self._benchmark_sales_wizard('monthly.sales.detail.report', 'monthly')
+
+    def test_medical_consumables_report(self):
+        self._skip_without_medical_module()
+        self._benchmark_sales_wizard('medical.consumables.sales.report', 'medical')
+
+    def test_monthly_sales_drilldown_rollups(self):
+        report = self._create_sales_report()
+        report.generate_report()
+        months = sorted(set(report.report_lines.mapped('month')))
+        self._measure(
+            'monthly.drill_down_to_daily[rollup build]',
+            report.with_context(default_month=months[0], default_category_id=False).drill_down_to_daily,
+        )
+        for month in months[1:]:
+            report.back_to_monthly()
+            self._measure(
+                f'monthly.drill_down_to_daily[{month} cached]',
+                report.with_context(default_month=month, default_category_id=False).drill_down_to_daily,
+            )
+
+    def test_monthly_sales_detail_report_products(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        self._measure('monthly.generate_report[products]', report.generate_report)
+
+    def test_monthly_sales_excel_export(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        report_data = report._get_report_data()
+        self._measure('monthly.excel[binary]', lambda: report._generate_excel_report(report_data))
+        report.excel_export_mode = 'attachment'
+        self._measure('monthly.excel[attachment]', lambda: report._generate_excel_report(report_data))
+
+    def test_parallel_months(self):
+        for parallel_months in (False, True):
+            label = 'parallel months' if parallel_months else 'serial'
+            report = self._create_sales_report(
+                product_ids=[(6, 0, self.products.ids)], use_cache=False, parallel_months=parallel_months,
+            )
+            self._measure(f'monthly.generate_report[{label}]', report.generate_report)
+            supplier = self._create_supplier_report(parallel_months=parallel_months)
+            self._measure(f'supplier.generate_report[{label}]', supplier.generate_report)
+
+    def test_background_job(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        report.action_generate_report_async()
+        self._measure('monthly.generate_report[background job]', report.job_id._process)
+        supplier = self._create_supplier_report()
+        supplier.action_generate_report_async()
+        self._measure('supplier.generate_report[background job]', supplier.job_id._process)
+
+    def test_result_cache(self):
+        first = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        self._measure('monthly.generate_report[cache miss]', first.generate_report)
+        second = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        self._measure('monthly.generate_report[cache hit]', second.generate_report)
+
+    def test_monthly_supplier_sales_report(self):
+        report = self._create_supplier_report()
+        self._measure('supplier.generate_report', report.generate_report)
+        main_line = report.main_lines[0]
+        self._measure(
+            'supplier.open_supplier_month',
+            report.with_context(
+                default_supplier_id=main_line.supplier_id.id, default_month=main_line.month,
+            ).open_supplier_month,
+        )
+        self._measure(
+            'supplier.open_invoices',
+            report.with_context(default_invoice_id=report.supplier_month_lines[0].invoice_id.id).open_invoices,
+        )
+        selected = self._create_supplier_report(supplier_ids=[(6, 0, self.vendors[:2].ids)])
+        self._measure('supplier.generate_report[2 vendors]', selected.generate_report)
+
+    # ---------------------------- Fatura detayı ----------------------------
+    def test_invoice_membership(self):
+        """Aynı güne ait çok sayıda faturada eski liste üyeliği ile satır bazlı domain."""
+        invoice_date = self.date_to + timedelta(days=1)
+        invoices = self._generate_invoices(self._dataset_param('DAY_INVOICE_COUNT'), invoice_date=invoice_date)
+        report = self._create_sales_report(date_to=invoice_date)
+
+        def legacy_line_count():
+            products = self.env['product.product'].search([
+                ('categ_id', 'in', report._get_selected_categories().ids),
+                ('active', '=', True),
+            ])
+            line_count = 0
+            for invoice in self.env['account.move'].search(report._get_invoice_domain(invoice_date)):
+                line_count += len(invoice.invoice_line_ids.filtered(lambda l: l.product_id.id in products.ids))
+            return line_count
+
+        self._measure('invoice_data[legacy list membership]', legacy_line_count)
+        self._measure('invoice_data[line domain + set]', lambda: report._get_invoice_data(invoice_date))
+        self._measure(
+            'invoice_data[10 invoices]',
+            lambda: report._get_invoice_data(invoice_date, invoice_ids=invoices[:10].ids),
+        )
+        self._measure(
+            'invoice_data[all invoices]',
+            lambda: report._get_invoice_data(invoice_date, invoice_ids=invoices.ids),
+        )
+
+    # ---------------------------- Yardımcılar ----------------------------
+    def test_cost_history(self):
+        if 'stock.valuation.layer' not in self.env:
+            self.skipTest("stock_account kurulu değil")
+        days = (self.date_to - self.date_from).days + 1
+        company_id = self.env.company.id
+        vals_list, dates = [], []
+        for product in self.products:
+            for _layer in range(self._dataset_param('LAYERS_PER_PRODUCT')):
+                quantity = self.rng.choice([1.0, 1.0, -1.0]) * self.rng.randint(1, 20)
+                unit_cost = round(self.rng.uniform(1.0, 50.0), 2)
+                vals_list.append({
+                    'product_id': product.id,
+                    'company_id': company_id,
+                    'quantity': quantity,
+                    'unit_cost': unit_cost,
+                    'value': quantity * unit_cost,
+                })
+                dates.append(self.date_from + timedelta(days=self.rng.randrange(days)))
+        layers = self.env['stock.valuation.layer'].sudo().create(vals_list)
+        layers.flush_model()
+        self.env.cr.execute(
+            "UPDATE stock_valuation_layer l SET create_date = v.date"
+            "  FROM unnest(%s::int[], %s::date[]) AS v(id, date) WHERE l.id = v.id",
+            [layers.ids, dates],
+        )
+        layers.invalidate_model(['create_date'])
+
+        lookups = [
+            (self.rng.choice(self.products).id, company_id, self.date_from + timedelta(days=self.rng.randrange(days)))
+            for _lookup in range(self._dataset_param('LOOKUP_COUNT'))
+        ]
+        self._measure('cost_at[query per line]', lambda: [naive_cost(self.env, *key) for key in lookups])
+        self._measure('cost_at[bulk + bisect]', lambda: ProductCostHistory(
+            self.env, self.products.ids, self.env.company.ids, self.date_to,
+        ).costs_at(lookups))
+
+    def test_margins(self):
+        count = self._dataset_param('MARGIN_LINE_COUNT')
+        quantity = [float(self.rng.randint(-5, 50)) for _line in range(count)]
+        subtotal = [round(qty * self.rng.uniform(10.0, 100.0), 2) for qty in quantity]
+        unit_cost = [round(self.rng.uniform(0.0, 80.0), 2) for _line in range(count)]
+        factor = [round(self.rng.uniform(0.5, 2.0), 6) for _line in range(count)]
+        self._measure('margins[python loop]', lambda: loop_margins(quantity, subtotal, unit_cost, factor))
+        self._measure('margins[numpy]', lambda: compute_line_margins(
+            quantity, subtotal, unit_cost, sales_factor=factor, cost_factor=factor,
+            precision_digits=2, absolute=True,
+        ))
+
+    def test_report_columns_memory(self):
+        """Ürün kırılımlı rapor verisi: iç içe sözlük ile sütun bazlı `ReportColumns`."""
+        rows = []
+        for month in range(self._dataset_param('COLUMN_MONTHS')):
+            month_key = f'{2020 + month // 12}-{month % 12 + 1:02d}'
+            for category in range(self._dataset_param('COLUMN_CATEGORIES')):
+                for product in range(self._dataset_param('COLUMN_PRODUCTS_PER_CATEGORY')):
+                    rows.append((month_key, category + 1, category * 100000 + product + 1, self.rng.uniform(1.0, 1000.0)))
+        self._measure('report_data[nested dict]', lambda: build_nested_report_data(rows))
+        self._measure('report_data[columns]', lambda: build_report_columns(rows))
+
+    def test_bulk_report_lines(self):
+        Line = self.env['monthly.sales.detail.report.line']
+        report = self._create_sales_report()
+        for count in (int(value) for value in self._dataset_param('LINE_COUNTS').split(',')):
+            vals_list = [{
+                'report_id': report.id,
+                'month': f'2024-{index % 12 + 1:02d}',
+                'category_name': f'Kategori {index % 50}',
+                'product_name': f'Ürün {index}' if index % 10 else False,
+                'amount': round(self.rng.uniform(1.0, 1000.0), 2),
+                'is_category_total': not index % 10,
+            } for index in range(count)]
+            if count <= self._dataset_param('ORM_MAX_LINES'):
+                self._measure(f'report_lines[{count}].orm_create', lambda: Line.create(vals_list))
+                self._measure(f'report_lines[{count}].orm_unlink', lambda: report.report_lines.unlink())
+            self._measure(f'report_lines[{count}].bulk_create', lambda: Line._bulk_create(vals_list))
+            self._measure(f'report_lines[{count}].bulk_unlink', lambda: Line._bulk_unlink_reports(report.ids))
+
+    def test_category_resolver(self):
+        Category = self.env['product.category']
+        children = Category.create([
+            {'name': f'{parent.name} / Alt {index}', 'parent_id': parent.id}
+            for parent in self.categories for index in range(self._dataset_param('SUBCATEGORY_COUNT'))
+        ])
+        Category.create([{'name': f'{parent.name} / Son', 'parent_id': parent.id} for parent in children])
+        selected = self.categories | children[:3]
+        calls = self._dataset_param('DRILLDOWN_CALLS')
+        self._measure(f'categories[child_of x{calls}]', lambda: [
+            Category.search([('id', 'child_of', selected.ids)]) for _call in range(calls)
+        ])
+        self._measure('categories[parent_path]', lambda: CategoryResolver.load(self.env, selected.ids))
+
+        report = self._create_sales_report(rollup_subcategories=True, use_cache=False)
+        self._measure('generate_report[rollup_subcategories]', report.generate_report)
+        month = self.date_from.strftime('%Y-%m')
+        self._measure('drill_down_to_daily[stored category map]', lambda: report.with_context(
+            default_month=month, default_category_id=False,
+        ).drill_down_to_daily())
+
+    # ---------------------------- Sorgular ----------------------------
+    def test_query_plans(self):
+        """Rapor sorgularının planları: modülün indeksleri kaldırılmış (önce) ve
+        mevcutken (sonra). İndeksler savepoint içinde kaldırılıp geri alınır."""
+        report = self._create_sales_report()
+        supplier = self._create_supplier_report()
+        Aggregate = self.env['monthly.sales.aggregate']
+        queries = {
+            'plan.rollups': report._rollup_query(),
+            'plan.aggregate_raw_totals': (
+                Aggregate._RAW_TOTALS_QUERY.format(where='aml.date >= %s AND aml.date <= %s AND aml.product_id IN %s'),
+                [self.date_from, self.date_to, tuple(self.products.ids)],
+            ),
+            'plan.supplier_sales': supplier._supplier_sales_query(self.vendors.ids),
+        }
+        self.env.flush_all()
+        with self.env.cr.savepoint(flush=False) as savepoint:
+            for index in (SALES_LINE_INDEX, CUSTOMER_INVOICE_INDEX):
+                self.env.cr.execute(f'DROP INDEX IF EXISTS {index}')
+            for name, (query, params) in queries.items():
+                self._explain(f'{name}[before]', query, params)
+            savepoint.rollback()
+        for name, (query, params) in queries.items():
+            self._explain(f'{name}[after]', query, params)
+
+    def test_product_filter(self):
+        """Ürün havuzu: büyük IN listesi ile kategori sütunu + aktif ürün alt sorgusu."""
+        report = self._create_sales_report()
+        Aggregate = self.env['monthly.sales.aggregate']
+        product_ids = self._measure('product_ids[search]', lambda: self.env['product.product'].search([
+            ('categ_id', 'in', report._get_category_resolver().ids),
+            ('active', '=', True),
+        ]).ids)
+        categ_ids = report._get_product_scope()[1]
+
+        legacy_filter, legacy_params = Aggregate._product_scope_filter(product_ids, None, 'aml.product_id', 'pt.categ_id')
+        company_params = [self.date_from, self.date_to, tuple(self.env.companies.ids)]
+        self._explain('rollups[in_list]', report._ROLLUP_QUERY.format(product_filter=legacy_filter),
+                      company_params + legacy_params)
+        self._explain('rollups[subselect]', *report._rollup_query())
+
+        company_ids = self.env.companies.ids
+        self._explain('aggregate_totals[in_list]',
+                      *Aggregate._totals_query(self.date_from, self.date_to, company_ids, product_ids=product_ids))
+        self._explain('aggregate_totals[subselect]',
+                      *Aggregate._totals_query(self.date_from, self.date_to, company_ids, categ_ids=categ_ids))
+
+    def test_comparison(self):
+        """Karşılaştırma dönemini tek sorguda okuyan rapor ile iki ayrı rapor."""
+        date_from = self.date_from + relativedelta(years=1)
+        for mode, previous_from in (
+            ('previous_year', self.date_from),
+            ('previous_month', date_from - relativedelta(months=1)),
+        ):
+            previous = self._create_sales_report(
+                date_from=previous_from, date_to=date_from - relativedelta(days=1), use_cache=False,
+            )
+            current = self._create_sales_report(date_from=date_from, use_cache=False)
+            self._measure(f'{mode}[two reports]', lambda: (previous.generate_report(), current.generate_report()))
+            comparison = self._create_sales_report(date_from=date_from, comparison_mode=mode, use_cache=False)
+            self._measure(f'{mode}[one query]', comparison.generate_report)
+            parallel = self._create_sales_report(
+                date_from=date_from, comparison_mode=mode, use_cache=False, parallel_months=True,
+            )
+            self._measure(f'{mode}[parallel months]', parallel.generate_report)
+
+    def test_ranking(self):
+        """İlk N: tüm ürün matrisi + `heapq.nlargest` ile SQL pencere fonksiyonu."""
+        limit = self._dataset_param('RANKING_LIMIT')
+        full = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+
+        def heap_ranking():
+            full.generate_report()
+            groups = {}
+            for line in full.report_lines.filtered(lambda line: not line.is_category_total):
+                groups.setdefault((line.month, line.category_name), []).append(line.amount)
+            return {key: heapq.nlargest(limit, amounts) for key, amounts in groups.items()}
+
+        self._measure('ranking.product[full matrix + heap]', heap_ranking)
+        for mode in ('product', 'customer', 'salesperson'):
+            ranked = self._create_sales_report(ranking_mode=mode, ranking_limit=limit, use_cache=False)
+            self._measure(f'ranking.{mode}[sql window]', ranked.generate_report)
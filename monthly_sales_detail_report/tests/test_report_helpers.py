@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo.tests import tagged
+from odoo.tools import float_round
+
+from odoo.addons.monthly_sales_detail_report.models.category_tree import CategoryResolver
+from odoo.addons.monthly_sales_detail_report.models.cost_history import ProductCostHistory
+from odoo.addons.monthly_sales_detail_report.models.margin import compute_line_margins
+from odoo.addons.monthly_sales_detail_report.models.report_columns import ReportColumns
+from .common import SalesReportTestCommon
+
+
+def build_nested_report_data(rows):
+    """Önceki `_get_report_data` yapısı: {ay: {kategori: {toplam, ürünler}}}"""
+    report_data = {}
+    for month, category_id, product_id, amount in rows:
+        category_node = report_data.setdefault(month, {}).setdefault(category_id, {
+            'category_name': f'Kategori {category_id}',
+            'category_total': 0.0,
+            'products': {},
+        })
+        category_node['category_total'] += amount
+        product_node = category_node['products'].setdefault(product_id, {
+            'product_name': f'Ürün {product_id}',
+            'amount': 0.0,
+        })
+        product_node['amount'] += amount
+    return report_data
+
+
+def build_report_columns(rows):
+    columns = ReportColumns()
+    for month, category_id, product_id, amount in rows:
+        columns.add(month, category_id, f'Kategori {category_id}', amount, product_id, f'Ürün {product_id}')
+    return columns.finalize()
+
+
+def loop_margins(quantity, subtotal, unit_cost, factor):
+    """Önceki satır bazlı kâr hesabı (kur çevrimi + yuvarlama + mutlak değer)"""
+    results = []
+    for qty, amount, cost_price, rate in zip(quantity, subtotal, unit_cost, factor):
+        sales = abs(float_round(amount * rate, precision_digits=2))
+        cost = abs(float_round(cost_price * qty * rate, precision_digits=2))
+        margin = sales - cost
+        results.append((sales, cost, margin, (margin / sales * 100.0) if sales else 0.0))
+    return results
+
+
+def naive_cost(env, product_id, company_id, date):
+    """Satır başına sorgu: tarihe kadarki katmanların gün sonu ortalama maliyeti"""
+    env.cr.execute("""
+        SELECT create_date::date, SUM(value), SUM(quantity)
+          FROM stock_valuation_layer
+         WHERE product_id = %s AND company_id = %s AND create_date < %s
+      GROUP BY 1 ORDER BY 1
+    """, [product_id, company_id, date + timedelta(days=1)])
+    value = quantity = 0.0
+    cost = None
+    for _day, day_value, day_quantity in env.cr.fetchall():
+        value += float(day_value)
+        quantity += float(day_quantity)
+        if quantity > 0:
+            cost = value / quantity
+    if cost is None:
+        return env['product.product'].browse(product_id).standard_price
+    return cost
+
+
+@tagged('post_install', '-at_install')
+class TestReportHelpers(SalesReportTestCommon):
+    """Rapor yardımcı sınıflarının eski (satır satır / iç içe) hesaplarla aynı sonucu vermesi."""
+
+    INVOICE_COUNT = 0
+
+    def test_report_columns_match_nested(self):
+        rows = [
+            (f'2024-{month:02d}', category_id, category_id * 1000 + product, self.rng.uniform(1.0, 1000.0))
+            for month in range(1, 4) for category_id in range(1, 4) for product in range(5)
+        ]
+        nested = build_nested_report_data(rows)
+        columns = build_report_columns(rows)
+
+        self.assertEqual(len(columns), sum(
+            1 + len(category['products']) for categories in nested.values() for category in categories.values()
+        ))
+        self.assertEqual(
+            [amount for *_values, amount, is_total in columns.iter_rows() if is_total],
+            [category['category_total'] for month in sorted(nested) for category in nested[month].values()],
+        )
+        self.assertEqual(ReportColumns.from_dict(columns.to_dict()).to_dict(), columns.to_dict())
+
+    def test_vectorized_margins_match_loop(self):
+        quantity = [float(self.rng.randint(-5, 50)) for _line in range(200)] + [0.0]
+        subtotal = [round(qty * self.rng.uniform(10.0, 100.0), 2) for qty in quantity]
+        unit_cost = [round(self.rng.uniform(0.0, 80.0), 2) for _line in quantity]
+        factor = [round(self.rng.uniform(0.5, 2.0), 6) for _line in quantity]
+
+        expected = loop_margins(quantity, subtotal, unit_cost, factor)
+        margins = compute_line_margins(
+            quantity, subtotal, unit_cost, sales_factor=factor, cost_factor=factor,
+            precision_digits=2, absolute=True,
+        )
+        for expected_row, row in zip(expected, zip(*(values.tolist() for values in margins))):
+            for expected_value, value in zip(expected_row, row):
+                self.assertAlmostEqual(expected_value, value, places=6)
+
+    def test_cost_history_matches_layer_queries(self):
+        if 'stock.valuation.layer' not in self.env:
+            self.skipTest("stock_account kurulu değil")
+        products = self.products[:5]
+        company_id = self.env.company.id
+        days = (self.date_to - self.date_from).days + 1
+        vals_list, dates = [], []
+        for product in products:
+            for _layer in range(6):
+                quantity = self.rng.choice([1.0, 1.0, -1.0]) * self.rng.randint(1, 20)
+                unit_cost = round(self.rng.uniform(1.0, 50.0), 2)
+                vals_list.append({
+                    'product_id': product.id,
+                    'company_id': company_id,
+                    'quantity': quantity,
+                    'unit_cost': unit_cost,
+                    'value': quantity * unit_cost,
+                })
+                dates.append(self.date_from + timedelta(days=self.rng.randrange(days)))
+        layers = self.env['stock.valuation.layer'].sudo().create(vals_list)
+        layers.flush_model()
+        for layer, date in zip(layers, dates):
+            self.env.cr.execute("UPDATE stock_valuation_layer SET create_date = %s WHERE id = %s", [date, layer.id])
+        layers.invalidate_model(['create_date'])
+
+        lookups = [
+            (self.rng.choice(products).id, company_id, self.date_from + timedelta(days=self.rng.randrange(days)))
+            for _lookup in range(50)
+        ]
+        history = ProductCostHistory(self.env, products.ids, self.env.company.ids, self.date_to)
+        for key, cost in zip(lookups, history.costs_at(lookups)):
+            self.assertAlmostEqual(naive_cost(self.env, *key), cost, places=6)
+
+    def test_cost_history_fallback_to_standard_price(self):
+        product = self.env['product.product'].create({'name': 'Katmansız Ürün', 'standard_price': 12.5})
+        history = ProductCostHistory(self.env, product.ids, self.env.company.ids, self.date_to)
+        self.assertEqual(history.cost_at(product.id, self.env.company.id, self.date_to), 12.5)
+        self.assertEqual(history.fallbacks, 1)
+
+    def test_category_resolver_matches_child_of(self):
+        Category = self.env['product.category']
+        children = Category.create([
+            {'name': f'{parent.name} / Alt {index}', 'parent_id': parent.id}
+            for parent in self.categories for index in range(3)
+        ])
+        grandchildren = Category.create([{'name': f'{parent.name} / Son', 'parent_id': parent.id} for parent in children])
+        selected = self.categories | children[:2]
+
+        expected = Category.search([('id', 'child_of', selected.ids)])
+        resolver = CategoryResolver.load(self.env, selected.ids)
+        self.assertEqual(set(resolver.ids), set(expected.ids))
+
+        # Alt kategoriler seçili olsa da en üstteki seçili ataya bağlanır
+        for category in children | grandchildren:
+            path_ids = [int(path_id) for path_id in category.parent_path.rstrip('/').split('/')]
+            self.assertEqual(resolver.top(category.id), next(path_id for path_id in path_ids if path_id in selected.ids))
+        self.assertEqual(
+            sorted(resolver.members(self.categories[0].id)),
+            sorted(Category.search([('id', 'child_of', self.categories[0].id)]).ids),
+        )
+        self.assertEqual(CategoryResolver.from_json(resolver.to_json()).ancestors, resolver.ancestors)
+
+        flat = CategoryResolver.load(self.env, selected.ids, include_subcategories=False)
+        self.assertEqual(set(flat.ids), set(selected.ids))
+
+    def test_bulk_lines_match_orm(self):
+        Line = self.env['monthly.sales.detail.report.line']
+        report = self._create_sales_report()
+        vals_list = [{
+            'report_id': report.id,
+            'month': f'2024-{index % 12 + 1:02d}',
+            'category_name': f'Kategori {index % 5}',
+            'product_name': f'Ürün {index}' if index % 10 else False,
+            'amount': round(self.rng.uniform(1.0, 1000.0), 2),
+            'is_category_total': not index % 10,
+        } for index in range(50)]
+        fields_list = list(vals_list[0])
+
+        orm_lines = Line.create(vals_list)
+        expected = [dict(values, id=False) for values in orm_lines.read(fields_list, load=None)]
+        report.report_lines.unlink()
+
+        lines = Line._bulk_create(vals_list)
+        self.assertEqual(report.report_lines, lines)
+        self.assertEqual([dict(values, id=False) for values in lines.read(fields_list, load=None)], expected)
+
+        Line._bulk_unlink_reports(report.ids)
+        self.assertFalse(report.report_lines)
+
+        # Verilmeyen alanlar ORM gibi varsayılanlarla (bağlamdaki `default_*` dahil) doldurulur
+        partial_vals = [{'report_id': report.id, 'amount': 1.0}]
+        Line = Line.with_context(default_month='2024-01', default_category_name='Bağlam')
+        expected = [dict(values, id=False) for values in Line.create(partial_vals).read(fields_list, load=None)]
+        report.report_lines.unlink()
+        lines = Line._bulk_create(partial_vals)
+        self.assertEqual([dict(values, id=False) for values in lines.read(fields_list, load=None)], expected)
+        self.assertEqual(lines.category_name, 'Bağlam')
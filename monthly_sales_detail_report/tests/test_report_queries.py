@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import json
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.monthly_sales_detail_report.models.account_move import CUSTOMER_INVOICE_INDEX, SALES_LINE_INDEX
+from .common import SalesReportTestCommon
+
+
+@tagged('post_install', '-at_install')
+class TestReportQueries(SalesReportTestCommon):
+    """Rapor sorguları: ürün havuzu koşulu, indeks kullanımı, alt kategori toplama,
+    karşılaştırma ve sıralama modlarının referans hesaplarla aynı sonucu vermesi.
+    """
+
+    RANKING_LIMIT = 3
+
+    def _category_totals(self, report, field_name='amount', shift=None):
+        """{(ay, kategori): tutar}; `shift` verilirse ay o kadar ileri taşınır."""
+        totals = {}
+        for line in report.report_lines.filtered('is_category_total'):
+            month = line.month
+            if shift:
+                month = (fields.Date.to_date(f'{month}-01') + shift).strftime('%Y-%m')
+            totals[(month, line.category_name)] = line[field_name]
+        return totals
+
+    def _assert_totals_equal(self, expected, actual):
+        keys = {key for key, amount in expected.items() if amount} | {key for key, amount in actual.items() if amount}
+        self.assertTrue(keys)
+        for key in keys:
+            self.assertAlmostEqual(actual.get(key, 0.0), expected.get(key, 0.0), places=2, msg=key)
+
+    def _index_plan(self, query, params):
+        """Sıralı tarama kapalıyken plan: küçük veri setinde de indeksin kullanılabilirliği görülür."""
+        self.env.flush_all()
+        self.env.cr.execute('SET enable_seqscan = off')
+        try:
+            self.env.cr.execute('EXPLAIN (FORMAT JSON) ' + query, params)
+            return json.dumps(self.env.cr.fetchone()[0])
+        finally:
+            self.env.cr.execute('RESET enable_seqscan')
+
+    # ---------------------------- Ürün havuzu ----------------------------
+    def test_product_scope_matches_product_list(self):
+        """Kategori alt sorgusu, kategorideki aktif ürünlerin id listesiyle aynı satırları verir."""
+        report = self._create_sales_report()
+        product_ids = self.env['product.product'].search([
+            ('categ_id', 'in', report._get_category_resolver().ids),
+            ('active', '=', True),
+        ]).ids
+        categ_ids = report._get_product_scope()[1]
+
+        rows = report._query_sales_totals(self.date_from, self.date_to, None, categ_ids)
+        self.assertTrue(rows)
+        self.assertEqual(rows, report._query_sales_totals(self.date_from, self.date_to, product_ids, None))
+
+        legacy_filter, legacy_params = self.env['monthly.sales.aggregate']._product_scope_filter(
+            product_ids, None, 'aml.product_id', 'pt.categ_id',
+        )
+        self.env.flush_all()
+        self.env.cr.execute(
+            report._ROLLUP_QUERY.format(product_filter=legacy_filter),
+            [self.date_from, self.date_to, tuple(self.env.companies.ids)] + legacy_params,
+        )
+        legacy_rows = sorted(self.env.cr.fetchall())
+        self.env.cr.execute(*report._rollup_query())
+        self.assertEqual(sorted(self.env.cr.fetchall()), legacy_rows)
+
+    # ---------------------------- İndeksler ----------------------------
+    def test_report_queries_use_indexes(self):
+        report = self._create_sales_report()
+        self.assertIn(SALES_LINE_INDEX, self._index_plan(*report._rollup_query()))
+
+        Aggregate = self.env['monthly.sales.aggregate']
+        query = Aggregate._RAW_TOTALS_QUERY.format(where='aml.date >= %s AND aml.date <= %s AND aml.product_id IN %s')
+        self.assertIn(SALES_LINE_INDEX, self._index_plan(query, [self.date_from, self.date_to, tuple(self.products.ids)]))
+
+        supplier = self._create_supplier_report()
+        self.assertIn(CUSTOMER_INVOICE_INDEX, self._index_plan(*supplier._supplier_sales_query(self.vendors.ids)))
+
+    # ---------------------------- Alt kategori toplama ----------------------------
+    def test_rollup_subcategories(self):
+        subcategories = self.env['product.category'].create([
+            {'name': f'{parent.name} / Alt', 'parent_id': parent.id} for parent in self.categories
+        ])
+        self.products[::2].categ_id = subcategories[0]
+        self._generate_invoices(10)
+
+        def month_totals(report):
+            totals = {}
+            for line in report.report_lines.filtered('is_category_total'):
+                totals[line.month] = totals.get(line.month, 0.0) + line.amount
+            return totals
+
+        detailed = self._create_sales_report(use_cache=False)
+        detailed.generate_report()
+        rolled = self._create_sales_report(use_cache=False, rollup_subcategories=True)
+        rolled.generate_report()
+
+        self.assertIn(subcategories[0].name, detailed.report_lines.mapped('category_name'))
+        self.assertEqual(set(rolled.report_lines.mapped('category_name')), set(self.categories.mapped('name')))
+        detailed_totals, rolled_totals = month_totals(detailed), month_totals(rolled)
+        self.assertEqual(set(detailed_totals), set(rolled_totals))
+        for month, amount in detailed_totals.items():
+            self.assertAlmostEqual(rolled_totals[month], amount, places=2)
+
+        # Günlük detay da seçili üst kategoriler üzerinden açılır
+        rolled.with_context(default_month=min(rolled_totals), default_category_id=False).drill_down_to_daily()
+        self.assertLessEqual(set(rolled.daily_lines.category_id.ids), set(self.categories.ids))
+
+    # ---------------------------- Karşılaştırma ----------------------------
+    def test_year_over_year(self):
+        previous_from = self.date_from - relativedelta(years=1)
+        previous_to = self.date_to - relativedelta(years=1)
+        self._generate_invoices(20, date_from=previous_from, date_to=previous_to)
+
+        previous = self._create_sales_report(date_from=previous_from, date_to=previous_to, use_cache=False)
+        previous.generate_report()
+        current = self._create_sales_report(use_cache=False)
+        current.generate_report()
+        comparison = self._create_sales_report(comparison_mode='previous_year', use_cache=False)
+        comparison.generate_report()
+
+        self._assert_totals_equal(self._category_totals(current), self._category_totals(comparison))
+        self._assert_totals_equal(
+            self._category_totals(previous, shift=relativedelta(years=1)),
+            self._category_totals(comparison, 'comparison_amount'),
+        )
+        for line in comparison.report_lines:
+            self.assertAlmostEqual(line.delta_amount, line.amount - line.comparison_amount, places=2)
+            if line.comparison_amount:
+                self.assertAlmostEqual(
+                    line.delta_percent, line.delta_amount / abs(line.comparison_amount) * 100.0, places=2,
+                )
+
+    def test_month_over_month(self):
+        """Önceki ay modunda dönemler çakışır: her ayın karşılaştırması bir önceki ayın tutarıdır."""
+        date_from = self.date_from + relativedelta(months=1)
+        previous = self._create_sales_report(date_to=date_from - relativedelta(days=1), use_cache=False)
+        previous.generate_report()
+        current = self._create_sales_report(date_from=date_from, use_cache=False)
+        current.generate_report()
+        comparison = self._create_sales_report(date_from=date_from, comparison_mode='previous_month', use_cache=False)
+        comparison.generate_report()
+
+        expected = self._category_totals(previous, shift=relativedelta(months=1))
+        expected.update({
+            key: amount for key, amount in self._category_totals(current, shift=relativedelta(months=1)).items()
+            if key[0] <= self.date_to.strftime('%Y-%m')
+        })
+        self._assert_totals_equal(self._category_totals(current), self._category_totals(comparison))
+        self._assert_totals_equal(expected, self._category_totals(comparison, 'comparison_amount'))
+
+        # Aylara bölünmüş okuma her ay için kendi karşılaştırma penceresini okur
+        parallel = self._create_sales_report(
+            date_from=date_from, comparison_mode='previous_month', use_cache=False, parallel_months=True,
+        )
+        parallel.generate_report()
+        for field_name in ('amount', 'comparison_amount'):
+            self._assert_totals_equal(
+                self._category_totals(comparison, field_name), self._category_totals(parallel, field_name),
+            )
+
+    # ---------------------------- Sıralama ----------------------------
+    def _ranked_amounts(self, report):
+        """{(ay, kategori): [tutarlar]} (sıralama sırasıyla)"""
+        groups = {}
+        for line in report.report_lines.filtered(lambda line: not line.is_category_total):
+            groups.setdefault((line.month, line.category_name), []).append(line.amount)
+        return groups
+
+    def _assert_rankings(self, expected, report):
+        actual = self._ranked_amounts(report)
+        self.assertTrue(actual)
+        self.assertEqual(set(actual), set(expected))
+        for key, amounts in expected.items():
+            self.assertEqual(len(actual[key]), len(amounts), key)
+            for actual_amount, expected_amount in zip(actual[key], amounts):
+                self.assertAlmostEqual(actual_amount, expected_amount, places=2, msg=key)
+
+    def test_product_ranking(self):
+        full = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        full.generate_report()
+        expected = {
+            key: heapq.nlargest(self.RANKING_LIMIT, amounts) for key, amounts in self._ranked_amounts(full).items()
+        }
+        ranked = self._create_sales_report(ranking_mode='product', ranking_limit=self.RANKING_LIMIT, use_cache=False)
+        ranked.generate_report()
+        self._assert_rankings(expected, ranked)
+
+        # Kategori toplamları sıralama satırlarından etkilenmez
+        plain = self._create_sales_report(use_cache=False)
+        plain.generate_report()
+        totals = ranked.report_lines.filtered('is_category_total')
+        self.assertEqual(
+            plain.report_lines.mapped(lambda line: (line.month, line.category_name, line.amount)),
+            totals.mapped(lambda line: (line.month, line.category_name, line.amount)),
+        )
+        self.assertEqual(totals.mapped('rank'), [0] * len(plain.report_lines))
+
+    def test_customer_and_salesperson_ranking(self):
+        lines = self.env['account.move.line'].search([
+            ('move_id', 'in', self.invoices.ids),
+            ('display_type', '=', 'product'),
+            ('account_id.account_type', 'in', ['income', 'other_income']),
+        ])
+        report = self._create_sales_report()
+        rate_table = report._get_rate_table(set(lines.currency_id.ids), set(lines.company_id.ids))
+        for mode, key in (('customer', 'commercial_partner_id'), ('salesperson', 'invoice_user_id')):
+            # Diğer yollar gibi gün × para birimi × şirket grupları çevrilip yuvarlanır, sonra toplanır
+            day_groups = {}
+            for line in lines:
+                group_key = (
+                    line.date.strftime('%Y-%m'), line.product_id.categ_id.name, line.move_id[key].id,
+                    line.currency_id.id, line.company_id.id, line.date,
+                )
+                day_groups[group_key] = day_groups.get(group_key, 0.0) + abs(line.amount_currency)
+            totals = {}
+            for (month, category_name, key_id, *currency_key), amount in day_groups.items():
+                group = totals.setdefault((month, category_name), {})
+                group[key_id] = group.get(key_id, 0.0) + rate_table.convert(amount, *currency_key)
+            expected = {
+                group_key: heapq.nlargest(self.RANKING_LIMIT, group.values()) for group_key, group in totals.items()
+            }
+
+            ranked = self._create_sales_report(ranking_mode=mode, ranking_limit=self.RANKING_LIMIT, use_cache=False)
+            ranked.generate_report()
+            self._assert_rankings(expected, ranked)
+            ranks = ranked.report_lines.filtered(lambda line: not line.is_category_total).mapped('rank')
+            self.assertLessEqual(max(ranks), self.RANKING_LIMIT)
+
+    def test_ranking_keys_outside_aggregate(self):
+        """Müşteri sıralaması kurları fatura satırlarının kendi anahtarlarından alır; özet
+        tabloda olmayan (para birimi, şirket, gün) anahtarları sıralamadan düşmez."""
+        invoice = self.invoices.filtered(lambda move: move.currency_id != self.env.company.currency_id)[:1]
+        # Özet tablo satırları silinir: kategori toplamları bu faturayı görmez
+        self.env.flush_all()
+        self.env.cr.execute("DELETE FROM monthly_sales_aggregate WHERE date = %s", [invoice.date])
+        self.env['monthly.sales.aggregate'].invalidate_model()
+
+        report = self._create_sales_report(ranking_mode='customer', ranking_limit=self.RANKING_LIMIT, use_cache=False)
+        report.generate_report()
+        customers = report.report_lines.filtered(
+            lambda line: not line.is_category_total and line.month == invoice.date.strftime('%Y-%m')
+        )
+        self.assertIn(invoice.commercial_partner_id.name, customers.mapped('product_name'))
+
+    def test_ranking_cache_invalidated_on_partner_change(self):
+        Cache = self.env['monthly.sales.report.cache']
+        report = self._create_sales_report(ranking_mode='customer')
+        report.generate_report()
+        entry = Cache.search([('key', '=', Cache._make_key(report._get_cache_parameters()))])
+        plain = self._create_sales_report()
+        plain.generate_report()
+        plain_entry = Cache.search([('key', '=', Cache._make_key(plain._get_cache_parameters()))])
+        self.assertTrue(entry)
+
+        self.invoices[0].invoice_user_id = self.env['res.users'].create({
+            'name': 'Sıralama Temsilcisi', 'login': 'ranking_salesperson',
+        })
+        self.assertTrue(entry.exists())
+        self.invoices[0].partner_id = self.partner_a if self.invoices[0].partner_id == self.partner_b else self.partner_b
+        self.assertFalse(entry.exists())
+        # Sıralama kullanmayan girdiler müşteri değişikliğinden etkilenmez
+        self.assertTrue(plain_entry.exists())
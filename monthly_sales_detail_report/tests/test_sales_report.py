@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+import hashlib
+
+from dateutil.relativedelta import relativedelta
+
+from odoo.tests import tagged
+
+from .common import SalesReportTestCommon
+
+
+@tagged('post_install', '-at_install')
+class TestSalesReport(SalesReportTestCommon):
+    """Rapor sihirbazlarının giriş noktaları: drill-down akışları, önbellekler,
+    arka plan işi ve hızlı yolların eski yollarla aynı sonucu vermesi.
+    """
+
+    def _check_sales_wizard(self, model):
+        report = self._create_sales_report(model)
+        report.generate_report()
+        self.assertTrue(report.report_lines)
+
+        month = report.report_lines[0].month
+        report.with_context(default_month=month, default_category_id=False).drill_down_to_daily()
+        self.assertTrue(report.daily_lines)
+
+        daily_line = report.daily_lines[0]
+        report.with_context(
+            default_date=daily_line.date, default_category_id=daily_line.category_id.id,
+        ).drill_down_to_invoices()
+        self.assertTrue(report.invoice_lines)
+
+    def test_monthly_sales_detail_report(self):
+        self._check_sales_wizard('monthly.sales.detail.report')
+
+    def test_drilldown_reuses_rollups(self):
+        report = self._create_sales_report()
+        report.generate_report()
+        months = sorted(set(report.report_lines.mapped('month')))
+        report.with_context(default_month=months[0], default_category_id=False).drill_down_to_daily()
+        self.assertTrue(report.rollup_data)
+        self.assertTrue(report.category_map)
+
+        # Sonraki drill-down'lar fatura satırlarını ve kategori ağacını yeniden taramaz
+        rollup_data, category_map = report.rollup_data, report.category_map
+        for month in months[1:]:
+            report.back_to_monthly()
+            report.with_context(default_month=month, default_category_id=False).drill_down_to_daily()
+            self.assertEqual(report.rollup_data, rollup_data)
+            self.assertEqual(report.category_map, category_map)
+
+        daily_line = report.daily_lines[0]
+        report.with_context(
+            default_date=daily_line.date, default_category_id=daily_line.category_id.id,
+        ).drill_down_to_invoices()
+        self.assertEqual(len(report.invoice_lines), min(daily_line.invoice_count, report.page_size))
+
+    def test_invoice_data_matches_legacy_membership(self):
+        """Satır bazlı domain, her fatura için `invoice_line_ids` + liste üyeliğiyle aynı satırları verir."""
+        report = self._create_sales_report()
+        invoice_date = self.invoices[0].invoice_date
+        products = self.env['product.product'].search([
+            ('categ_id', 'in', report._get_selected_categories().ids),
+            ('active', '=', True),
+        ])
+        legacy_count = 0
+        for invoice in self.env['account.move'].search(report._get_invoice_domain(invoice_date)):
+            legacy_count += len(invoice.invoice_line_ids.filtered(lambda line: line.product_id.id in products.ids))
+
+        invoice_data = report._get_invoice_data(invoice_date)
+        self.assertTrue(invoice_data)
+        self.assertEqual(sum(len(info['lines']) for info in invoice_data), legacy_count)
+
+    def test_invoice_data_uses_accounting_date(self):
+        """Fatura detayı, özet tablo ve drill-down özeti gibi muhasebe tarihine göre süzülür."""
+        invoice_date = self.date_from + timedelta(days=10)
+        accounting_date = invoice_date + timedelta(days=1)
+        invoice = self.env['account.move'].create({
+            'move_type': 'out_invoice',
+            'partner_id': self.partner_a.id,
+            'invoice_date': invoice_date,
+            'date': accounting_date,
+            'invoice_line_ids': [(0, 0, {
+                'product_id': self.products[0].id,
+                'quantity': 1,
+                'price_unit': 100.0,
+                'tax_ids': [(6, 0, [])],
+            })],
+        })
+        invoice.action_post()
+        self.assertEqual(invoice.date, accounting_date)
+
+        report = self._create_sales_report()
+        self.assertIn(invoice.id, report._compute_invoice_keys(accounting_date, False))
+        self.assertIn(invoice.id, [info['invoice_id'] for info in report._get_invoice_data(accounting_date)])
+        self.assertNotIn(invoice.id, [info['invoice_id'] for info in report._get_invoice_data(invoice_date)])
+        self.assertIn(invoice, self.env['account.move'].search(report._get_invoice_domain(accounting_date)))
+
+    def test_products_breakdown(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        report.generate_report()
+        product_lines = report.report_lines.filtered(lambda line: not line.is_category_total)
+        self.assertTrue(product_lines)
+        for line in report.report_lines.filtered('is_category_total'):
+            products = product_lines.filtered(
+                lambda product_line: (product_line.month, product_line.category_name) == (line.month, line.category_name)
+            )
+            self.assertAlmostEqual(sum(products.mapped('amount')), line.amount, places=2)
+
+    def test_excel_export(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        report_data = report._get_report_data()
+        report._generate_excel_report(report_data)
+        self.assertTrue(report.excel_file)
+
+        report.excel_export_mode = 'attachment'
+        report._generate_excel_report(report_data)
+        self.assertTrue(report.excel_attachment_id)
+        self.assertTrue(report._get_excel_content())
+
+    def test_excel_attachment_in_filestore(self):
+        """Ek dosya modunda Excel filestore'a taşınır; önbellek isabeti aynı dosyayı paylaşır."""
+        if self.env['ir.attachment']._storage() != 'file':
+            self.skipTest("Ekler veritabanında saklanıyor")
+        first = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], excel_export_mode='attachment')
+        first.generate_report()
+        attachment = first.excel_attachment_id
+        raw = attachment.raw
+        self.assertTrue(attachment.store_fname)
+        self.assertEqual(raw[:2], b'PK')
+        self.assertEqual(attachment.file_size, len(raw))
+        self.assertEqual(attachment.checksum, hashlib.sha1(raw).hexdigest())
+
+        second = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], excel_export_mode='attachment')
+        second.generate_report()
+        self.assertNotEqual(second.excel_attachment_id, attachment)
+        self.assertEqual(second.excel_attachment_id.store_fname, attachment.store_fname)
+
+        # Eklerden birinin silinmesi paylaşılan dosyayı etkilemez
+        first._unlink_excel_attachment()
+        self.assertEqual(second._get_excel_content(), raw)
+
+    def test_parallel_months_match_serial(self):
+        serial = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        serial.generate_report()
+        parallel = self._create_sales_report(
+            product_ids=[(6, 0, self.products.ids)], use_cache=False, parallel_months=True,
+        )
+        parallel.generate_report()
+        self.assertTrue(serial.report_lines)
+        self.assertEqual(self._line_values(serial), self._line_values(parallel))
+
+        def supplier_values(report):
+            return report.main_lines.mapped(
+                lambda line: (line.supplier_id.id, line.month, line.total_sales, line.total_cost)
+            )
+
+        serial = self._create_supplier_report()
+        serial.generate_report()
+        parallel = self._create_supplier_report(parallel_months=True)
+        parallel.generate_report()
+        self.assertEqual(supplier_values(serial), supplier_values(parallel))
+
+    def test_background_job(self):
+        report = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        report.action_generate_report_async()
+        self.assertEqual(report.job_state, 'queued')
+        report.job_id._process()
+        self.assertEqual(report.job_state, 'done', report.job_error)
+        self.assertEqual(report.job_id.progress_done, report.job_id.progress_total)
+        self.assertTrue(report.job_id.attachment_id)
+        self.assertFalse(report.excel_attachment_id)
+        # İş, sihirbazın seçili export modunu değiştirmez
+        self.assertEqual(report.excel_export_mode, 'binary')
+
+        serial = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        serial.generate_report()
+        self.assertEqual(self._line_values(serial), self._line_values(report))
+
+        supplier = self._create_supplier_report()
+        supplier.action_generate_report_async()
+        supplier.job_id._process()
+        self.assertEqual(supplier.job_state, 'done', supplier.job_error)
+        self.assertTrue(supplier.main_lines)
+        self.assertEqual(supplier.job_id.attachment_id.res_model, 'monthly.sales.report.job')
+
+    def test_result_cache(self):
+        Cache = self.env['monthly.sales.report.cache']
+        first = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        first.generate_report()
+        second = self._create_sales_report(product_ids=[(6, 0, self.products.ids)])
+        second.generate_report()
+
+        entry = Cache.search([('key', '=', Cache._make_key(second._get_cache_parameters()))])
+        self.assertEqual(entry.hit_count, 1)
+        self.assertEqual(self._line_values(first), self._line_values(second))
+        self.assertEqual(second._get_excel_content(), first._get_excel_content())
+
+        # Kapsanan aralıkta onaylanan fatura girdiyi geçersiz kılar
+        self._generate_invoices(1, invoice_date=self.date_from)
+        self.assertFalse(entry.exists())
+
+    def test_result_cache_comparison_window(self):
+        """Karşılaştırmalı rapor girdisi, kaydırılmış dönemde onaylanan faturayla da geçersiz olur."""
+        Cache = self.env['monthly.sales.report.cache']
+        report = self._create_sales_report(comparison_mode='previous_year')
+        report.generate_report()
+        entry = Cache.search([('key', '=', Cache._make_key(report._get_cache_parameters()))])
+        self.assertEqual(entry.covered_from, self.date_from - relativedelta(years=1))
+        self.assertEqual(entry.covered_to, self.date_to)
+
+        plain = self._create_sales_report()
+        plain.generate_report()
+        plain_entry = Cache.search([('key', '=', Cache._make_key(plain._get_cache_parameters()))])
+
+        # Rapor penceresinin dışında, karşılaştırma döneminde bir fatura
+        self._generate_invoices(1, invoice_date=self.date_from - relativedelta(years=1))
+        self.assertFalse(entry.exists())
+        self.assertTrue(plain_entry.exists())
+
+    def test_medical_consumables_report(self):
+        self._skip_without_medical_module()
+        self._check_sales_wizard('medical.consumables.sales.report')
+        # Pencere başlığı modülün önceki başlığıdır (`_description` değil)
+        action = self._create_sales_report('medical.consumables.sales.report').generate_report()
+        self.assertEqual(action['name'], 'Medical Consumables Sales Report')
+
+    def test_engine_wizards_match(self):
+        """İki sihirbaz aynı motoru kullandığından aynı filtrelerle aynı satırları üretir."""
+        self._skip_without_medical_module()
+        monthly = self._create_sales_report(product_ids=[(6, 0, self.products.ids)], use_cache=False)
+        monthly.generate_report()
+        medical = self._create_sales_report(
+            'medical.consumables.sales.report', product_ids=[(6, 0, self.products.ids)], use_cache=False,
+        )
+        medical.generate_report()
+        self.assertTrue(monthly.report_lines)
+        self.assertEqual(self._line_values(monthly), self._line_values(medical))
+
+    def test_monthly_supplier_sales_report(self):
+        report = self._create_supplier_report()
+        report.generate_report()
+        self.assertTrue(report.main_lines)
+
+        main_line = report.main_lines[0]
+        report.with_context(
+            default_supplier_id=main_line.supplier_id.id, default_month=main_line.month,
+        ).open_supplier_month()
+        self.assertTrue(report.supplier_month_lines)
+
+        report.with_context(default_invoice_id=report.supplier_month_lines[0].invoice_id.id).open_invoices()
+        self.assertTrue(report.invoice_line_lines)
+
+    def test_monthly_supplier_sales_report_selected(self):
+        report = self._create_supplier_report(supplier_ids=[(6, 0, self.vendors[:2].ids)])
+        report.generate_report()
+        self.assertTrue(report.main_lines)
+        self.assertLessEqual(set(report.main_lines.supplier_id.ids), set(self.vendors[:2].ids))